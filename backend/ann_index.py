@@ -0,0 +1,212 @@
+import os
+import sys
+import time
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+
+from job_matching import top_k_indices
+
+# ============================================
+# APPROXIMATE NEAREST-NEIGHBOUR JOB INDEX
+# ============================================
+#
+# Offline: tfidf_matrix -> TruncatedSVD embedding (L2-normalized)
+#          -> k-means clusters (inverted file / IVF)
+# Query:   embed the user vector, score the cluster centroids and
+#          return the jobs of the n_probe closest clusters; the caller
+#          scores only those rows exactly (recommend_jobs).
+#
+# n_probe is the recall / latency knob: more probed clusters means
+# higher recall and more rows scanned.
+
+DEFAULT_COMPONENTS = 128
+DEFAULT_N_PROBE = 8
+
+
+def _normalize_rows(x):
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+class AnnIndex:
+    """
+    components: (n_components, n_features) SVD projection
+    centroids:  (n_clusters, n_components) normalized cluster centres
+    rows:       job rows (df / tfidf_matrix positions) grouped by cluster
+    offsets:    cluster c owns rows[offsets[c]:offsets[c + 1]]
+    """
+
+    def __init__(self, components, centroids, rows, offsets):
+        self.components = components
+        self.centroids = centroids
+        self.rows = rows
+        self.offsets = offsets
+
+    @property
+    def n_clusters(self):
+        return self.centroids.shape[0]
+
+    def __len__(self):
+        return self.rows.shape[0]
+
+    @property
+    def n_features(self):
+        return self.components.shape[1]
+
+    def mismatch(self, matrix):
+        """
+        Why the index doesn't belong to ``matrix`` (e.g. the models were
+        rebuilt but the index wasn't), or None if it fits
+        """
+        n_rows, n_features = matrix.shape
+        if self.n_features != n_features:
+            return f"built for {self.n_features} terms, the vocabulary has {n_features}"
+        if len(self) != n_rows or (len(self) and int(self.rows.max()) >= n_rows):
+            return f"built for {len(self)} jobs, the matrix has {n_rows}"
+        return None
+
+    def embed(self, vectors):
+        """Projects sparse TF-IDF rows into the normalized SVD space."""
+        dense = np.asarray(vectors.dot(self.components.T), dtype=np.float32)
+        return _normalize_rows(dense)
+
+    def candidates(self, user_vector, n_probe=None):
+        """
+        Job rows of the n_probe clusters closest to one TF-IDF vector.
+        """
+        n_probe = n_probe or DEFAULT_N_PROBE
+        query = self.embed(user_vector)[0]
+
+        probe = top_k_indices(self.centroids.dot(query), n_probe)
+        if probe.size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        return np.concatenate([
+            self.rows[self.offsets[c]:self.offsets[c + 1]] for c in probe
+        ])
+
+    def _regrouped(self, rows, labels):
+        order = np.argsort(labels, kind="stable")
+        offsets = np.zeros(self.n_clusters + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(labels, minlength=self.n_clusters))
+        return AnnIndex(self.components, self.centroids, rows[order], offsets)
+
+    def _labels(self):
+        return np.repeat(np.arange(self.n_clusters), np.diff(self.offsets))
+
+    def extended(self, vectors, first_row):
+        """
+        New index with the TF-IDF rows ``vectors`` (job rows first_row,
+        first_row + 1, ...) added to their closest cluster. Centroids
+        and the SVD projection stay as they are until a rebuild.
+        """
+        labels = np.argmax(self.embed(vectors).dot(self.centroids.T), axis=1)
+        rows = np.concatenate([self.rows, first_row + np.arange(len(labels), dtype=np.int64)])
+        return self._regrouped(rows, np.concatenate([self._labels(), labels]))
+
+    def compacted(self, deleted):
+        """
+        New index for the matrix with the ``deleted`` rows (bool mask)
+        removed: deleted rows are dropped, the others renumbered.
+        """
+        new_positions = np.cumsum(~deleted) - 1
+        keep = ~deleted[self.rows]
+        return self._regrouped(new_positions[self.rows[keep]], self._labels()[keep])
+
+    def save(self, path):
+        np.savez(
+            path,
+            components=self.components,
+            centroids=self.centroids,
+            rows=self.rows,
+            offsets=self.offsets,
+            # Shape of the matrix the index was built for (see mismatch())
+            n_rows=len(self),
+            n_features=self.n_features
+        )
+
+
+# ============================================
+# BUILD / LOAD
+# ============================================
+
+def build_ann_index(tfidf_matrix, n_components=DEFAULT_COMPONENTS, n_clusters=None, seed=0):
+    """
+    Builds an AnnIndex from the job TF-IDF matrix.
+    n_clusters defaults to ~sqrt(n_jobs).
+    """
+    n_jobs, n_features = tfidf_matrix.shape
+    n_components = max(1, min(n_components, n_features - 1))
+    if n_clusters is None:
+        n_clusters = int(np.sqrt(n_jobs))
+    n_clusters = max(1, min(n_clusters, n_jobs))
+
+    svd = TruncatedSVD(n_components=n_components, random_state=seed)
+    embeddings = _normalize_rows(svd.fit_transform(tfidf_matrix).astype(np.float32))
+    components = svd.components_.astype(np.float32)
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        random_state=seed,
+        batch_size=max(1024, 4 * n_clusters),
+        n_init=3
+    )
+    labels = kmeans.fit_predict(embeddings)
+    centroids = _normalize_rows(kmeans.cluster_centers_.astype(np.float32))
+
+    order = np.argsort(labels, kind="stable")
+    offsets = np.zeros(n_clusters + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(labels, minlength=n_clusters))
+
+    return AnnIndex(
+        components=components,
+        centroids=centroids,
+        rows=order.astype(np.int64),
+        offsets=offsets
+    )
+
+
+def load_ann_index(path):
+    """
+    Loads an index written by AnnIndex.save.
+    Returns None if the file does not exist (index mode is optional).
+    """
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path) as data:
+        index = AnnIndex(
+            components=data["components"],
+            centroids=data["centroids"],
+            rows=data["rows"],
+            offsets=data["offsets"]
+        )
+        # Files written before the shape was stored: rows / components tell
+        if "n_rows" in data.files and (
+            int(data["n_rows"]) != len(index) or int(data["n_features"]) != index.n_features
+        ):
+            raise ValueError(f"Corrupt ANN index {path}: stored shape doesn't match its arrays")
+    return index
+
+
+# ============================================
+# OFFLINE BUILD COMMAND
+# ============================================
+# Usage (from backend/):
+#   python ann_index.py [n_components] [n_clusters]
+
+if __name__ == "__main__":
+    from job_matching import ANN_INDEX_PATH, load_models_and_data
+
+    n_components = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COMPONENTS
+    n_clusters = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    _, _, tfidf_matrix = load_models_and_data()
+
+    start = time.perf_counter()
+    index = build_ann_index(tfidf_matrix, n_components=n_components, n_clusters=n_clusters)
+    index.save(ANN_INDEX_PATH)
+
+    print(f"✅ ANN index built in {time.perf_counter() - start:.1f}s")
+    print(f"   {len(index)} jobs, {index.n_clusters} clusters -> {ANN_INDEX_PATH}")
@@ -1,16 +1,33 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, g, render_template, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
+import hmac
+import json
+import zipfile
 from werkzeug.utils import secure_filename
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # ===============================
 # IMPORT PROJECT MODULES
 # ===============================
-from resume_parser import parse_resume
-from job_matching import load_models_and_data, recommend_jobs
-from ats_scoring import calculate_ats_score
-from interview_module import get_interview_questions
+from resume_parser import parser_version, recent_pdf_extractions
+from parse_worker import parse_and_score_resume
+from job_matching import ANN_INDEX_PATH, FILTER_COLUMNS, load_models_and_data, browse_jobs, json_value, recommend_jobs
+from job_corpus import JobCorpus, build_job_snapshot
+from ann_index import load_ann_index
+from sharded_search import ShardedSearch
+from model_registry import registry, process_info
+from metrics import metrics, start_profile, stop_profile, timer
+from cache import LRUCache, content_hash
+from database import DATABASE_PATH, Database
+from task_queue import TaskQueue, QueueFull
+from batch_screening import MAX_RESUMES, ArchiveTooLarge, format_rows, iter_resume_files, screen_resumes
+from ats_scoring import calculate_ats_scores
+from interview_module import get_interview_questions, get_interview_questions_batch
+from text_analysis import analyze_text
 
 # ===============================
 # FLASK APP CONFIGURATION
@@ -20,11 +37,22 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 FRONTEND_DIR = os.path.join(BASE_DIR, "frontend")
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
 
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """jsonify / app.json.dumps, timed as the json_serialization stage"""
+
+    def dumps(self, obj, **kwargs):
+        with timer("json_serialization"):
+            return super().dumps(obj, **kwargs)
+
+
 app = Flask(
     __name__,
     template_folder=FRONTEND_DIR,
     static_folder=FRONTEND_DIR
 )
+app.json = TimedJSONProvider(app)
 
 # Enable CORS for all routes
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -34,27 +62,389 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 # ===============================
 ALLOWED_EXTENSIONS = {"pdf", "docx", "txt"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+PDF_HEALTH_ENTRIES = 10            # recent / slowest PDF extractions in /api/health
 
 app.config["UPLOAD_FOLDER"] = UPLOAD_DIR
 app.config["MAX_CONTENT_LENGTH"] = MAX_FILE_SIZE
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Uploads are parsed from memory; keeping a copy on disk is optional and
+# happens in the background, off the request path
+SAVE_UPLOADS = True
+upload_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-writer")
+
+# ===============================
+# RESUME CACHE CONFIG
+# ===============================
+# Parsed resume + ATS breakdown, keyed by SHA-256 of the uploaded bytes
+RESUME_CACHE_SIZE = 1024
+RESUME_CACHE_TTL = 24 * 60 * 60  # seconds
+RESUME_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+resume_cache = LRUCache(
+    max_entries=RESUME_CACHE_SIZE, ttl_seconds=RESUME_CACHE_TTL, max_bytes=RESUME_CACHE_MAX_BYTES
+)
+
+# ===============================
+# RECOMMENDATION CACHE CONFIG
+# ===============================
+# /job_recommendations responses, keyed by a hash of the normalized
+# request + job corpus version; cleared when the corpus changes
+RECOMMENDATION_CACHE_SIZE = 4096
+RECOMMENDATION_CACHE_TTL = 60 * 60  # seconds
+RECOMMENDATION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+recommendation_cache = LRUCache(
+    max_entries=RECOMMENDATION_CACHE_SIZE, ttl_seconds=RECOMMENDATION_CACHE_TTL,
+    max_bytes=RECOMMENDATION_CACHE_MAX_BYTES
+)
+
+# ===============================
+# JOB BROWSING CONFIG
+# ===============================
+# /api/jobs/all pages, cached per (filters, fields, page) query
+JOBS_PAGE_SIZE = 50
+JOBS_MAX_PAGE_SIZE = 200
+JOBS_PAGE_CACHE_SIZE = 2048
+JOBS_PAGE_CACHE_TTL = 10 * 60  # seconds
+JOBS_PAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+jobs_page_cache = LRUCache(
+    max_entries=JOBS_PAGE_CACHE_SIZE, ttl_seconds=JOBS_PAGE_CACHE_TTL, max_bytes=JOBS_PAGE_CACHE_MAX_BYTES
+)
+
+# ===============================
+# ASYNC UPLOAD QUEUE CONFIG
+# ===============================
+# /upload_resume?async=1 runs parsing + scoring on these workers;
+# uploads beyond TASK_QUEUE_MAX_PENDING waiting tasks, or
+# TASK_QUEUE_MAX_PENDING_BYTES of waiting uploads, get a 503
+TASK_QUEUE_WORKERS = 2
+TASK_QUEUE_MAX_PENDING = 100
+TASK_QUEUE_MAX_PENDING_BYTES = 64 * 1024 * 1024
+
+task_queue = TaskQueue(
+    workers=TASK_QUEUE_WORKERS, max_pending=TASK_QUEUE_MAX_PENDING,
+    max_pending_bytes=TASK_QUEUE_MAX_PENDING_BYTES
+)
+
+# ===============================
+# DATABASE CONFIG
+# ===============================
+# SQLite (data/onlyjobs.db, or ONLYJOBS_DATABASE) keeps parsed resumes +
+# ATS results across restarts (see database.STORED_RESUME_TTL /
+# MAX_STORED_RESUMES for retention); `python database.py import-jobs`
+# copies the jobs into it for SQL access.
+USE_DATABASE = True
+
+# ===============================
+# ANN INDEX CONFIG
+# ===============================
+# Clusters scanned per query when models/ann_index.npz exists
+# (higher = better recall, slower)
+ANN_N_PROBE = 8
+
+# ===============================
+# SHARDED SEARCH CONFIG
+# ===============================
+# ONLYJOBS_SEARCH_SHARDS=N scores full scans of the job matrix on N
+# worker processes, over a copy of the matrix in shared memory
+# (0 = single-threaded scoring in the request)
+SEARCH_SHARDS = int(os.environ.get("ONLYJOBS_SEARCH_SHARDS", "0"))
+
+# ===============================
+# JOB CORPUS UPDATES CONFIG
+# ===============================
+# POST /api/jobs/ingest adds / expires jobs without a restart. The
+# admin endpoints are disabled (403) unless ONLYJOBS_ADMIN_TOKEN is set;
+# requests then need it in the X-Admin-Token header
+ADMIN_TOKEN = os.environ.get("ONLYJOBS_ADMIN_TOKEN", "")
+MAX_INGEST_JOBS = 10_000           # per request
+ADMIN_REQUIRED = "Admin token required (set ONLYJOBS_ADMIN_TOKEN to enable this endpoint)"
+JOB_COMPACTION_INTERVAL = 300      # seconds between background compaction checks
+# Updates are appended here and replayed by every worker and on restart
+# (ONLYJOBS_JOB_UPDATE_LOG="" keeps them in the receiving process only)
+JOB_UPDATE_LOG = os.environ.get(
+    "ONLYJOBS_JOB_UPDATE_LOG", os.path.join(BASE_DIR, "models", "job_updates.jsonl")
+)
+
 # ===============================
 # HELPER FUNCTIONS
 # ===============================
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
+
+def _write_upload(filepath, file_bytes):
+    try:
+        with timer("save_upload"), open(filepath, "wb") as f:
+            f.write(file_bytes)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save upload {filepath}: {e}")
+
+
+def save_upload_async(filename, file_bytes, digest):
+    """
+    Persists an upload in the background. The name is prefixed with the
+    content hash so concurrent uploads never overwrite each other.
+    """
+    filepath = os.path.join(app.config["UPLOAD_FOLDER"], f"{digest[:16]}_{filename}")
+    upload_writer.submit(_write_upload, filepath, file_bytes)
+
 # ===============================
-# LOAD JOB MODELS ONCE
+# JOB MODELS (LOADED LAZILY, ONCE)
 # ===============================
-try:
-    df_jobs, tfidf_vectorizer, tfidf_matrix = load_models_and_data()
+def load_job_models():
+    df, vectorizer, matrix = load_models_and_data()
+
+    # Optional ANN index (built offline with `python ann_index.py`)
+    try:
+        ann_index = load_ann_index(ANN_INDEX_PATH)
+        problem = ann_index.mismatch(matrix) if ann_index is not None else None
+        if problem:
+            # Stale index (models rebuilt): it would return wrong rows
+            print(f"⚠️ Warning: Ignoring ANN index, {problem}; rebuild it with `python ann_index.py`")
+            ann_index = None
+        elif ann_index is not None:
+            print(f"✅ ANN index loaded ({ann_index.n_clusters} clusters)")
+    except Exception as e:
+        print(f"⚠️ Warning: Could not load ANN index: {e}")
+        ann_index = None
+
+    sharded_search = None
+    if SEARCH_SHARDS > 0:
+        sharded_search = ShardedSearch(matrix, n_shards=SEARCH_SHARDS)
+        # Requests read the shared copy; the private one is freed
+        matrix = sharded_search.shared_matrix()
+        print(f"✅ Sharded search ready ({SEARCH_SHARDS} shards, {sharded_search.stats()['shared_mb']} MB shared)")
+
     print("✅ Job models loaded successfully")
-except Exception as e:
-    print(f"⚠️ Warning: Could not load job models: {e}")
-    df_jobs, tfidf_vectorizer, tfidf_matrix = None, None, None
+    snapshot = build_job_snapshot(df, vectorizer, matrix, ann_index=ann_index, sharded_search=sharded_search)
+    # Jobs ingested / expired since these models were built
+    return job_corpus.replayed(snapshot)
+
+
+registry.register("jobs", load_job_models)
+
+# Adds / expires jobs at runtime by swapping in a new "jobs" snapshot
+job_corpus = JobCorpus(registry, "jobs", interval=JOB_COMPACTION_INTERVAL, log_path=JOB_UPDATE_LOG or None)
+
+
+def _clear_job_caches(snapshot):
+    # Keys carry the corpus version, so old entries can never be served;
+    # clearing just frees them
+    recommendation_cache.clear()
+    jobs_page_cache.clear()
+
+
+job_corpus.on_update(_clear_job_caches)
+
+
+def get_job_models():
+    """Job models, or None if they could not be loaded"""
+    try:
+        # Picks up updates other workers received
+        job_corpus.sync()
+        return registry.get("jobs")
+    except Exception as e:
+        print(f"⚠️ Warning: Could not load job models: {e}")
+        return None
+
+
+def get_database():
+    """Database, or None if disabled / it could not be opened"""
+    if not USE_DATABASE:
+        return None
+    try:
+        return registry.get("database")
+    except Exception as e:
+        print(f"⚠️ Warning: Could not open database: {e}")
+        return None
+
+
+registry.register("database", lambda: Database(DATABASE_PATH))
+
+
+# Load models now (e.g. in the gunicorn master with --preload) so forked
+# workers share them copy-on-write.
+# ONLYJOBS_PRELOAD_MODELS="all" or a comma-separated list, e.g. "jobs"
+PRELOAD_MODELS = os.environ.get("ONLYJOBS_PRELOAD_MODELS", "").strip()
+# (Skipped in sharded search workers, which re-import this module as
+# __mp_main__ when the server runs as `python app.py`)
+if PRELOAD_MODELS and __name__ != "__mp_main__":
+    registry.preload(None if PRELOAD_MODELS == "all" else PRELOAD_MODELS.split(","))
+
+
+# ===============================
+# UPLOAD RESPONSE
+# ===============================
+def upload_response(parsed_data, ats_result):
+    """/upload_resume response body: parsed resume, ATS score, improvements"""
+    resume_experience = parsed_data.get("experience_level", "Mid")
+
+    # ===============================
+    # GENERATE IMPROVEMENTS
+    # ===============================
+    improvements = []
+
+    if ats_result["skill_match"] < 50:
+        improvements.append({
+            "title": "Missing Key Skills",
+            "description": f"Your resume matches only {ats_result['skill_match']}% of required skills. Add more relevant technical skills."
+        })
+    elif ats_result["skill_match"] < 70:
+        improvements.append({
+            "title": "Improve Skill Coverage",
+            "description": "Consider adding more in-demand skills like Docker, Kubernetes, or cloud platforms (AWS/Azure)."
+        })
+    else:
+        improvements.append({
+            "title": "Excellent Skill Match",
+            "description": f"Your resume shows {ats_result['skill_match']}% skill alignment. Great job!"
+        })
+
+    if ats_result["text_similarity"] < 40:
+        improvements.append({
+            "title": "Strengthen Job Relevance",
+            "description": "Your resume content doesn't align well with job descriptions. Use more industry-standard terminology."
+        })
+    elif ats_result["text_similarity"] < 60:
+        improvements.append({
+            "title": "Enhance Content Alignment",
+            "description": "Good start! Add more specific examples of projects and achievements that match typical job requirements."
+        })
+
+    if ats_result["experience_match"] < 70:
+        improvements.append({
+            "title": "Experience Level Mismatch",
+            "description": "Your experience level may not align with target roles. Consider highlighting relevant projects and responsibilities."
+        })
+
+    if len(parsed_data.get("skills", [])) < 5:
+        improvements.append({
+            "title": "Add More Skills",
+            "description": "Include at least 8-10 relevant technical and soft skills to improve ATS compatibility."
+        })
+
+    return {
+        "success": True,
+        "message": "Resume parsed successfully",
+        "skills": parsed_data.get("skills", []),
+        "resume_text": parsed_data.get("resume_text", ""),
+        "experience_level": resume_experience,
+        "ats_score": ats_result["ats_score"],
+        "ats_breakdown": {
+            "skill_match": ats_result["skill_match"],
+            "text_similarity": ats_result["text_similarity"],
+            "experience_match": ats_result["experience_match"]
+        },
+        "improvements": improvements[:4]
+    }
+
+
+def _resume_key(cache_key):
+    """
+    Database key of an upload: content hash + extension + parser version,
+    so parses made by an older parser or skills taxonomy are never served
+    """
+    digest, extension = cache_key
+    return f"{digest}{extension}:{parser_version()}"
+
+
+def load_stored_upload(cache_key):
+    """(parsed_data, ats_result) stored by an earlier upload, or None"""
+    db = get_database()
+    if db is None:
+        return None
+    try:
+        stored = db.get_resume(_resume_key(cache_key))
+    except Exception as e:
+        print(f"⚠️ Warning: Could not read stored resume: {e}")
+        return None
+    if stored is None or stored[1] is None:
+        return None
+    resume_cache.set(cache_key, stored)
+    return stored
+
+
+def recommendation_cache_key(resume_skills, resume_text, resume_experience, filters, version):
+    """
+    Hash of everything a recommendation depends on. resume_skills is
+    the list matching and scoring get (see normalize_request_skills).
+    """
+    canonical = json.dumps({
+        "skills": resume_skills,
+        "text": content_hash(resume_text.encode("utf-8")),
+        "experience": resume_experience,
+        "filters": {name: value for name, value in filters.items() if value},
+        "version": version
+    }, sort_keys=True)
+    return content_hash(canonical.encode("utf-8"))
+
+
+def process_upload(file_bytes, filename, cache_key):
+    """Parses + scores an upload, caches + stores it, returns the response body"""
+    parsed_data, ats_result = parse_and_score_resume(file_bytes, filename)
+    return store_upload(cache_key, filename, parsed_data, ats_result)
+
+
+def store_upload(cache_key, filename, parsed_data, ats_result):
+    """Caches + stores a parsed upload, returns the response body"""
+    resume_cache.set(cache_key, (parsed_data, ats_result))
+
+    db = get_database()
+    if db is not None:
+        try:
+            db.save_resume(_resume_key(cache_key), filename, parsed_data, ats_result)
+        except Exception as e:
+            print(f"⚠️ Warning: Could not store resume: {e}")
+
+    return upload_response(parsed_data, ats_result)
+
+# ===============================
+# REQUEST METRICS + PROFILING
+# ===============================
+# Every request is counted and timed per route (see /api/metrics).
+# Sending "X-Profile: 1" returns a Server-Timing header with the time
+# spent in each instrumented stage of that request (with
+# ONLYJOBS_ADMIN_TOKEN set, the X-Admin-Token header is needed too).
+PROFILE_HEADER = "X-Profile"
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.profile_token = None
+    if (request.headers.get(PROFILE_HEADER) in ("1", "true")
+            and profiling_allowed(request.headers.get("X-Admin-Token"))):
+        g.profile_token = start_profile()
+
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.get("request_start")
+    if start is None:
+        return response
+
+    elapsed = time.perf_counter() - start
+    route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    metrics.observe("http_request_seconds", elapsed, route=route, method=request.method)
+    metrics.increment(
+        "http_requests_total", route=route, method=request.method, status=response.status_code
+    )
+
+    if g.get("profile_token") is not None:
+        breakdown = stop_profile(g.profile_token)
+        g.profile_token = None
+        entries = [
+            f'{stage};dur={timing["seconds"] * 1000:.3f};desc="{timing["calls"]} calls"'
+            for stage, timing in breakdown.items()
+        ]
+        entries.append(f"total;dur={elapsed * 1000:.3f}")
+        response.headers["Server-Timing"] = ", ".join(entries)
+
+    return response
 
 # ===============================
 # FRONTEND ROUTES
@@ -106,204 +496,468 @@ def upload_resume():
         if not allowed_file(file.filename):
             return jsonify({"success": False, "error": "Only PDF, DOCX, or TXT files are allowed"}), 400
 
+        # ?async=1 (or form field async=1): queue the work, return a task id
+        async_mode = (request.args.get("async") or request.form.get("async")) in ("1", "true")
+
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-        file.save(filepath)
-
-        # ===============================
-        # PARSE RESUME
-        # ===============================
-        parsed_data = parse_resume(filepath)
-        resume_experience = parsed_data.get("experience_level", "Mid")
-
-        # ===============================
-        # SAMPLE ATS SCORE (for demonstration)
-        # ===============================
-        sample_job = {
-            "skills": "Python, Flask, SQL, Git, Docker, REST API, PostgreSQL",
-            "combined_text": "Backend developer working with Flask and APIs. Strong experience in Python, database management, and cloud deployment.",
-            "Experience Level": "Mid"
-        }
-
-        ats_result = calculate_ats_score(
-            parsed_data.get("resume_text", ""),
-            parsed_data.get("skills", []),
-            resume_experience,
-            sample_job
-        )
+        extension = os.path.splitext(filename)[1].lower()
+        file_bytes = file.read()
 
-        # ===============================
-        # GENERATE IMPROVEMENTS
-        # ===============================
-        improvements = []
-
-        if ats_result["skill_match"] < 50:
-            improvements.append({
-                "title": "Missing Key Skills",
-                "description": f"Your resume matches only {ats_result['skill_match']}% of required skills. Add more relevant technical skills."
-            })
-        elif ats_result["skill_match"] < 70:
-            improvements.append({
-                "title": "Improve Skill Coverage",
-                "description": "Consider adding more in-demand skills like Docker, Kubernetes, or cloud platforms (AWS/Azure)."
-            })
-        else:
-            improvements.append({
-                "title": "Excellent Skill Match",
-                "description": f"Your resume shows {ats_result['skill_match']}% skill alignment. Great job!"
-            })
-
-        if ats_result["text_similarity"] < 40:
-            improvements.append({
-                "title": "Strengthen Job Relevance",
-                "description": "Your resume content doesn't align well with job descriptions. Use more industry-standard terminology."
-            })
-        elif ats_result["text_similarity"] < 60:
-            improvements.append({
-                "title": "Enhance Content Alignment",
-                "description": "Good start! Add more specific examples of projects and achievements that match typical job requirements."
-            })
-
-        if ats_result["experience_match"] < 70:
-            improvements.append({
-                "title": "Experience Level Mismatch",
-                "description": "Your experience level may not align with target roles. Consider highlighting relevant projects and responsibilities."
-            })
-
-        if len(parsed_data.get("skills", [])) < 5:
-            improvements.append({
-                "title": "Add More Skills",
-                "description": "Include at least 8-10 relevant technical and soft skills to improve ATS compatibility."
-            })
+        # Same bytes uploaded before -> reuse the parsed resume + ATS result
+        digest = content_hash(file_bytes)
+        cache_key = (digest, extension)
+        cached = resume_cache.get(cache_key) or load_stored_upload(cache_key)
 
-        return jsonify({
-            "success": True,
-            "message": "Resume parsed successfully",
-            "skills": parsed_data.get("skills", []),
-            "resume_text": parsed_data.get("resume_text", ""),
-            "experience_level": resume_experience,
-            "ats_score": ats_result["ats_score"],
-            "ats_breakdown": {
-                "skill_match": ats_result["skill_match"],
-                "text_similarity": ats_result["text_similarity"],
-                "experience_match": ats_result["experience_match"]
-            },
-            "improvements": improvements[:4]
-        }), 200
+        if cached is not None:
+            return jsonify(upload_response(*cached)), 200
+
+        if SAVE_UPLOADS:
+            save_upload_async(filename, file_bytes, digest)
+
+        if async_mode:
+            try:
+                task_id = task_queue.submit(process_upload, file_bytes, filename, cache_key, size=len(file_bytes))
+            except QueueFull as e:
+                response = jsonify({"success": False, "error": str(e)})
+                response.headers["Retry-After"] = "5"
+                return response, 503
+            return jsonify({
+                "success": True,
+                "task_id": task_id,
+                "status": "queued",
+                "status_url": f"/api/tasks/{task_id}"
+            }), 202
+
+        return jsonify(process_upload(file_bytes, filename, cache_key)), 200
 
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route("/api/tasks/<task_id>", methods=["GET"])
+def task_status(task_id):
+    """Status of an async upload; includes the upload response once done"""
+    task = task_queue.get(task_id)
+    if task is None:
+        return jsonify({"success": False, "error": "Unknown or expired task"}), 404
+
+    body = {"success": True, "task_id": task_id, "status": task["status"]}
+    if task["status"] == "done":
+        body["result"] = task["result"]
+    elif task["status"] == "failed":
+        body["success"] = False
+        body["error"] = task["error"]
+    return jsonify(body), 200
+
 # ===============================
 # JOB RECOMMENDATIONS ROUTE
 # ===============================
 @app.route("/job_recommendations", methods=["POST"])
 def job_recommendations():
     try:
-        if df_jobs is None or tfidf_vectorizer is None or tfidf_matrix is None:
+        jobs = get_job_models()
+        if jobs is None:
             return jsonify({"success": False, "error": "Job matching models not loaded"}), 500
 
-        data = request.get_json()
+        query = recommendation_query(request.get_json())
+        if query is None:
+            return jsonify({"success": False, "error": "Skills required"}), 400
 
-        resume_skills = data.get("skills", [])
-        resume_text = data.get("resume_text", "")
-        resume_experience = data.get("experience_level", "Mid")
-        preferred_work_type = data.get("work_type", None)
+        # Same skills / text / level / filters on the same corpus version
+        # -> same response
+        cache_key = recommendation_cache_key(*query, jobs["version"])
+        cached = recommendation_cache.get(cache_key)
+        if cached is not None:
+            return Response(cached, mimetype="application/json", headers={"X-Cache": "HIT"}), 200
 
-        if not resume_skills:
-            return jsonify({"success": False, "error": "Skills required"}), 400
+        matched_jobs = match_recommendations(jobs, query)
+        payload = score_recommendations(jobs, query, matched_jobs, cache_key)
 
-        # Get top jobs from TF-IDF similarity
-        matched_jobs = recommend_jobs(
-            resume_skills,
-            tfidf_vectorizer,
-            tfidf_matrix,
-            df_jobs,
-            top_n=20
-        )
+        return Response(payload, mimetype="application/json", headers={"X-Cache": "MISS"}), 200
 
-        final_results = []
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
 
-        for job in matched_jobs:
-            # Filter by work type if specified
-            if preferred_work_type:
-                if job.get("Work Type", "").lower() != preferred_work_type.lower():
-                    continue
 
-            ats = calculate_ats_score(
-                resume_text,
-                resume_skills,
-                resume_experience,
-                job
-            )
+def recommendation_query(data):
+    """
+    (skills, resume text, experience level, filters) of a
+    /job_recommendations request, or None without skills
+    """
+    data = data or {}
+    resume_skills = normalize_request_skills(data.get("skills"))
+    if not resume_skills:
+        return None
 
-            similarity_score = job.get("similarity_score", 0)
-            combined_score = 0.7 * ats["ats_score"] + 0.3 * similarity_score
-
-            explanation = []
-            if ats["skill_match"] < 50:
-                explanation.append("Add more relevant skills.")
-            elif ats["skill_match"] < 70:
-                explanation.append("Good skill match, can improve coverage.")
-
-            if ats["text_similarity"] < 50:
-                explanation.append("Align resume text with job description.")
-
-            if ats["experience_match"] < 70:
-                explanation.append(f"Experience mismatch: resume ({resume_experience}) vs job ({job.get('Experience Level', 'Mid')})")
-
-            final_results.append({
-                "job_id": job.get("Job Id"),
-                "job_title": job.get("Job Title"),
-                "company": job.get("Company"),
-                "location": job.get("location"),
-                "work_type": job.get("Work Type"),
-                "salary": job.get("Salary Range"),
-                "ats_score": ats["ats_score"],
-                "skill_match": ats["skill_match"],
-                "text_similarity": ats["text_similarity"],
-                "experience_match": ats["experience_match"],
-                "similarity_score": similarity_score,
-                "combined_score": round(combined_score, 2),
-                "match_score": round(combined_score, 2),  # Add this for compatibility
-                "explanation": explanation
-            })
-
-        # Sort by combined score
-        final_results = sorted(final_results, key=lambda x: x["combined_score"], reverse=True)
-        final_results = final_results[:10]
+    # Filters are applied before top-k selection, so up to 20
+    # matching jobs come back however rare the work type is
+    filters = {
+        "work_type": data.get("work_type", None),
+        "experience_level": data.get("job_experience_level")
+    }
+    resume_text = data.get("resume_text") or ""
+    if not isinstance(resume_text, str):
+        resume_text = str(resume_text)
+    return resume_skills, resume_text, data.get("experience_level") or "Mid", filters
 
-        return jsonify({
-            "success": True,
-            "recommended_jobs": final_results,  # Changed from 'results' to 'recommended_jobs'
-            "count": len(final_results)
-        }), 200
 
+def normalize_request_skills(skills):
+    """
+    Request skills (list, or comma-separated str) as used for matching,
+    scoring and the cache key: lower-cased, whitespace collapsed,
+    duplicates and blanks dropped, sorted
+    """
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    if not isinstance(skills, list):
+        return []
+    return sorted({
+        " ".join(str(skill).lower().split())
+        for skill in skills
+        if skill is not None and str(skill).strip()
+    })
+
+
+def match_recommendations(jobs, query):
+    """Top jobs from TF-IDF similarity"""
+    resume_skills, _, _, filters = query
+    return recommend_jobs(
+        resume_skills,
+        jobs["vectorizer"],
+        jobs["matrix"],
+        jobs["df"],
+        top_n=20,
+        job_records=jobs["job_records"],
+        ann_index=jobs["ann_index"],
+        n_probe=ANN_N_PROBE,
+        filters=filters,
+        filter_index=jobs["filter_index"],
+        sharded_search=jobs["sharded_search"]
+    )
+
+
+def score_recommendations(jobs, query, matched_jobs, cache_key):
+    """ATS-scores + ranks the matched jobs; returns (and caches) the serialized response"""
+    resume_skills, resume_text, resume_experience, _ = query
+
+    # Score all candidates in one batch, reusing their TF-IDF rows
+    # and precomputed skill sets
+    rows = [job["row_index"] for job in matched_jobs]
+    ats_results = calculate_ats_scores(
+        analyze_text(resume_text),
+        resume_skills,
+        resume_experience,
+        matched_jobs,
+        vectorizer=jobs["vectorizer"],
+        job_vectors=jobs["matrix"][rows],
+        job_skill_sets=jobs["skill_index"].skill_sets(rows)
+    )
+
+    final_results = []
+
+    for job, ats in zip(matched_jobs, ats_results):
+        similarity_score = job.get("similarity_score", 0)
+        combined_score = 0.7 * ats["ats_score"] + 0.3 * similarity_score
+
+        explanation = []
+        if ats["skill_match"] < 50:
+            explanation.append("Add more relevant skills.")
+        elif ats["skill_match"] < 70:
+            explanation.append("Good skill match, can improve coverage.")
+
+        if ats["text_similarity"] < 50:
+            explanation.append("Align resume text with job description.")
+
+        if ats["experience_match"] < 70:
+            explanation.append(f"Experience mismatch: resume ({resume_experience}) vs job ({json_value(job.get('Experience Level')) or 'Mid'})")
+
+        final_results.append({
+            # Ingested jobs may lack columns (NaN cells -> null)
+            "job_id": json_value(job.get("Job Id")),
+            "job_title": json_value(job.get("Job Title")),
+            "company": json_value(job.get("Company")),
+            "location": json_value(job.get("location")),
+            "work_type": json_value(job.get("Work Type")),
+            "salary": json_value(job.get("Salary Range")),
+            "ats_score": ats["ats_score"],
+            "skill_match": ats["skill_match"],
+            "text_similarity": ats["text_similarity"],
+            "experience_match": ats["experience_match"],
+            "similarity_score": similarity_score,
+            "combined_score": round(combined_score, 2),
+            "match_score": round(combined_score, 2),  # Add this for compatibility
+            "explanation": explanation
+        })
+
+    # Sort by combined score
+    final_results = sorted(final_results, key=lambda x: x["combined_score"], reverse=True)
+    final_results = final_results[:10]
+
+    body = {
+        "success": True,
+        "recommended_jobs": final_results,  # Changed from 'results' to 'recommended_jobs'
+        "count": len(final_results)
+    }
+    # Cached serialized, so a hit skips JSON encoding too
+    payload = app.json.dumps(body)
+    recommendation_cache.set(cache_key, payload)
+
+    return payload
+
+# ===============================
+# BULK SCREENING ROUTE
+# ===============================
+def _json_form_list(name, item_types):
+    """Form field holding a JSON list whose items are all item_types, else None"""
+    try:
+        value = json.loads(request.form[name])
+    except ValueError:
+        return None
+    if not isinstance(value, list):
+        return None
+    if not all(isinstance(item, item_types) and not isinstance(item, bool) for item in value):
+        return None
+    return value
+
+
+@app.route("/api/batch_screen", methods=["POST"])
+def batch_screen():
+    """
+    Scores every resume in a zip against a job list.
+
+    Form fields:
+        resumes: zip of PDF / DOCX / TXT resumes
+        jobs: JSON list of job dicts, or
+        job_ids: JSON list of "Job Id" values from the loaded job data
+        format: "csv" or "jsonl" (default)
+
+    Streams one row per (resume, job) pair.
+    """
+    try:
+        if "resumes" not in request.files:
+            return jsonify({"success": False, "error": "Zip of resumes required"}), 400
+
+        if request.form.get("jobs"):
+            jobs = _json_form_list("jobs", dict)
+            if jobs is None:
+                return jsonify({"success": False, "error": "jobs must be a JSON list of job objects"}), 400
+        elif request.form.get("job_ids"):
+            job_ids = _json_form_list("job_ids", (str, int, float))
+            if job_ids is None:
+                return jsonify({"success": False, "error": "job_ids must be a JSON list of ids"}), 400
+            job_models = get_job_models()
+            if job_models is None:
+                return jsonify({"success": False, "error": "Job data not loaded"}), 500
+            df = job_models["df"]
+            deleted = job_models["filter_index"].deleted
+            if deleted is not None:
+                df = df[~deleted]
+            wanted = set(job_ids)
+            jobs = df[df["Job Id"].isin(wanted)].to_dict("records")
+        else:
+            return jsonify({"success": False, "error": "jobs or job_ids required"}), 400
+
+        if not jobs:
+            return jsonify({"success": False, "error": "No matching jobs"}), 400
+
+        items = list(iter_resume_files(request.files["resumes"].stream))
+        if not items:
+            return jsonify({"success": False, "error": "No PDF, DOCX or TXT resumes in zip"}), 400
+        if len(items) > MAX_RESUMES:
+            return jsonify({"success": False, "error": f"At most {MAX_RESUMES} resumes per request"}), 400
+
+        fmt = "csv" if request.form.get("format") == "csv" else "jsonl"
+        stats = {}
+        lines = format_rows(screen_resumes(items, jobs, stats=stats), fmt, stats=stats)
+
+        return Response(
+            lines,
+            mimetype="text/csv" if fmt == "csv" else "application/x-ndjson"
+        )
+
+    except zipfile.BadZipFile:
+        return jsonify({"success": False, "error": "resumes must be a zip archive"}), 400
+    except ArchiveTooLarge as e:
+        return jsonify({"success": False, "error": str(e)}), 413
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"success": False, "error": str(e)}), 500
-    
+
+def _float_arg(name):
+    value = request.args.get(name, "").strip()
+    return float(value) if value else None
+
+
+def _int_arg(name, default, minimum=0, maximum=None):
+    value = request.args.get(name, "").strip()
+    if not value:
+        return default
+    value = int(value)
+    if value < minimum or (maximum is not None and value > maximum):
+        if maximum is None:
+            raise ValueError(f"{name} must be at least {minimum}")
+        raise ValueError(f"{name} must be between {minimum} and {maximum}")
+    return value
+
+
 @app.route("/api/jobs/all", methods=["GET"])
 def get_all_jobs():
-    """Fetch all jobs for the dedicated 'Jobs' tab."""
+    """
+    Fetch jobs for the dedicated 'Jobs' tab, one page at a time.
+
+    Query parameters:
+        work_type, location, experience_level: filter (repeat for any of)
+        salary_min, salary_max: salary range overlap, in dollars
+        fields: comma-separated columns to return (default: all)
+        limit: page size (default 50, max 200)
+        cursor: next_cursor of the previous page, or
+        offset: rows to skip
+    """
     try:
-        if df_jobs is None:
+        job_models = get_job_models()
+        if job_models is None:
             return jsonify({"success": False, "error": "Job data not loaded"}), 500
-            
-        # Limiting to 50 jobs for demo purposes
-        jobs = df_jobs.head(50).to_dict("records")
-        return jsonify({"success": True, "jobs": jobs}), 200
+
+        try:
+            filters = {
+                name: sorted(v.strip() for v in request.args.getlist(name) if v.strip())
+                for name in FILTER_COLUMNS
+            }
+            salary_min = _float_arg("salary_min")
+            salary_max = _float_arg("salary_max")
+            limit = _int_arg("limit", JOBS_PAGE_SIZE, minimum=1, maximum=JOBS_MAX_PAGE_SIZE)
+            offset = _int_arg("offset", 0)
+            after = _int_arg("cursor", None)
+        except ValueError as e:
+            return jsonify({"success": False, "error": f"Invalid query parameter: {e}"}), 400
+
+        fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+        unknown = [f for f in fields if f not in job_models["job_records"]]
+        if unknown:
+            return jsonify({"success": False, "error": f"Unknown fields: {', '.join(unknown)}"}), 400
+
+        cache_key = (
+            job_models["version"],
+            tuple((name, tuple(values)) for name, values in filters.items()),
+            salary_min, salary_max, tuple(fields), limit, offset, after
+        )
+        body = jobs_page_cache.get(cache_key)
+
+        if body is None:
+            jobs, total, next_cursor = browse_jobs(
+                job_models["job_records"],
+                job_models["filter_index"],
+                limit=limit,
+                offset=offset,
+                after=after,
+                fields=fields or None,
+                salary_min=salary_min,
+                salary_max=salary_max,
+                **filters
+            )
+            body = {
+                "success": True,
+                "jobs": jobs,
+                "count": len(jobs),
+                "total": total,
+                "limit": limit,
+                "next_cursor": str(next_cursor) if next_cursor is not None else None
+            }
+            jobs_page_cache.set(cache_key, body)
+
+        return jsonify(body), 200
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def is_admin_token(token):
+    """True for the configured admin token; always False when none is configured"""
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def profiling_allowed(token):
+    """X-Profile is open while no admin token is configured"""
+    return not ADMIN_TOKEN or is_admin_token(token)
+
+
+def _is_admin():
+    return is_admin_token(request.headers.get("X-Admin-Token"))
+
+
+@app.route("/api/jobs/ingest", methods=["POST"])
+def ingest_jobs():
+    """
+    Adds and / or expires jobs in the running server.
+
+    JSON body:
+        jobs: list of job dicts (jobs_cleaned.csv columns; combined_text
+            is built from Job Title / skills / Job Description if missing).
+            A live job with the same Job Id is replaced.
+        expire: list of Job Id values to remove
+    """
+    if not _is_admin():
+        return jsonify({"success": False, "error": ADMIN_REQUIRED}), 403
+
+    try:
+        if get_job_models() is None:
+            return jsonify({"success": False, "error": "Job data not loaded"}), 500
+
+        data = request.get_json(silent=True) or {}
+        new_jobs = data.get("jobs") or []
+        expire = data.get("expire") or []
+
+        if not isinstance(new_jobs, list) or not isinstance(expire, list):
+            return jsonify({"success": False, "error": "jobs and expire must be lists"}), 400
+        if not new_jobs and not expire:
+            return jsonify({"success": False, "error": "jobs or expire required"}), 400
+        if len(new_jobs) > MAX_INGEST_JOBS:
+            return jsonify({"success": False, "error": f"At most {MAX_INGEST_JOBS} jobs per request"}), 400
+
+        stats = job_corpus.update(jobs=new_jobs, expire=expire)
+        return jsonify(dict(stats, success=True)), 200
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route("/api/jobs/compact", methods=["POST"])
+def compact_jobs():
+    """Drops expired jobs now; {"refit": true} also re-fits the TF-IDF vocabulary"""
+    if not _is_admin():
+        return jsonify({"success": False, "error": ADMIN_REQUIRED}), 403
+
+    try:
+        if get_job_models() is None:
+            return jsonify({"success": False, "error": "Job data not loaded"}), 500
+
+        data = request.get_json(silent=True) or {}
+        stats = job_corpus.compact(refit=bool(data.get("refit")))
+        return jsonify(dict(stats, success=True)), 200
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route("/api/interview_questions", methods=["POST"])
 def fetch_questions():
-    """Fetches questions based on the job title using interview_module.py."""
+    """
+    Fetches questions based on the job title using interview_module.py.
+    {"job_titles": [...]} (e.g. the titles of a /job_recommendations
+    result) returns {"questions": {job title: questions}} in one call.
+    """
     try:
         data = request.json
+        job_titles = data.get("job_titles")
+        if isinstance(job_titles, list):
+            questions = get_interview_questions_batch([str(title) for title in job_titles])
+            return jsonify({"success": True, "questions": questions}), 200
+
         job_title = data.get("job_title", "Web Developer")
         questions = get_interview_questions(job_title)
         return jsonify({"success": True, "questions": questions}), 200
@@ -340,12 +994,71 @@ def interview_questions():
 # ===============================
 @app.route("/api/health", methods=["GET"])
 def health_check():
+    # Models load on first use: "ready" unless the last attempt failed
+    models_ready = registry.is_ready("jobs")
     return jsonify({
-        "status": "healthy",
+        "status": "healthy" if models_ready else "degraded",
         "message": "ONLYJOBS backend is running",
-        "models_loaded": df_jobs is not None
+        "models_loaded": models_ready,
+        "models": registry.stats(),
+        "caches": {
+            "resume": resume_cache.stats(),
+            "recommendations": recommendation_cache.stats(),
+            "jobs_page": jobs_page_cache.stats()
+        },
+        "task_queue": task_queue.stats(),
+        "job_corpus": job_corpus.stats(),
+        "pdf_extractions": {
+            "recent": recent_pdf_extractions()[:PDF_HEALTH_ENTRIES],
+            "slowest": recent_pdf_extractions(slowest=PDF_HEALTH_ENTRIES)
+        },
+        "process": process_info()
     }), 200
 
+# ===============================
+# METRICS (PROMETHEUS)
+# ===============================
+for name, metric_type, help_text in [
+    ("cache_hits_total", "counter", "Cache hits"),
+    ("cache_misses_total", "counter", "Cache misses"),
+    ("cache_entries", "gauge", "Entries in cache"),
+    ("task_queue_depth", "gauge", "Async uploads waiting"),
+    ("task_queue_running", "gauge", "Async uploads running"),
+    ("task_queue_rejected_total", "counter", "Async uploads rejected (queue full)"),
+    ("job_corpus_live_jobs", "gauge", "Live jobs in the corpus"),
+    ("job_corpus_deleted_jobs", "gauge", "Expired jobs not compacted yet"),
+    ("job_corpus_version", "gauge", "Job corpus snapshot version")
+]:
+    metrics.describe(name, metric_type, help_text)
+
+
+@app.route("/api/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Latency histograms, request counters, cache + queue stats (Prometheus text format)"""
+    caches = {
+        "resume": resume_cache,
+        "recommendations": recommendation_cache,
+        "jobs_page": jobs_page_cache
+    }
+    for name, cache in caches.items():
+        stats = cache.stats()
+        metrics.set("cache_hits_total", stats["hits"], cache=name)
+        metrics.set("cache_misses_total", stats["misses"], cache=name)
+        metrics.set("cache_entries", stats["entries"], cache=name)
+
+    queue_stats = task_queue.stats()
+    metrics.set("task_queue_depth", queue_stats["depth"])
+    metrics.set("task_queue_running", queue_stats["running"])
+    metrics.set("task_queue_rejected_total", queue_stats["rejected"])
+
+    corpus = job_corpus.stats()
+    if "live" in corpus:
+        metrics.set("job_corpus_live_jobs", corpus["live"])
+        metrics.set("job_corpus_deleted_jobs", corpus["deleted"])
+        metrics.set("job_corpus_version", corpus["version"])
+
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
 # ===============================
 # ERROR HANDLERS
 # ===============================
@@ -379,7 +1092,12 @@ if __name__ == "__main__":
     print("POST /job_recommendations")
     print("POST /interview_questions")
     print("POST /api/interview_questions")
+    print("GET  /api/tasks/<task_id>")
+    print("POST /api/batch_screen")
     print("GET  /api/jobs/all")
+    print("POST /api/jobs/ingest")
+    print("POST /api/jobs/compact")
+    print("GET  /api/metrics")
     print("GET  /api/health\n")
 
     app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
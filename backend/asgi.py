@@ -0,0 +1,550 @@
+import asyncio
+import contextvars
+import io
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+from werkzeug.utils import secure_filename
+
+import app as server
+import parse_worker
+from cache import content_hash
+from metrics import metrics, start_profile, stop_profile
+from task_queue import QueueFull
+
+# ============================================
+# ASGI ENTRY POINT
+# ============================================
+#
+# Serves the same routes as app.py on an ASGI server, e.g.
+#
+#     cd backend
+#     uvicorn asgi:application --workers 4
+#
+# POST /upload_resume and POST /job_recommendations are handled here:
+# the request body is read and the response written without holding a
+# thread, and the CPU-heavy stages run on bounded pools (StagePool):
+#
+#     parse   parse_resume + sample ATS score of an upload
+#     match   recommend_jobs
+#     score   ATS scoring + ranking of the matched jobs
+#     io      cache / database lookups and writes
+#
+# A slow PDF only holds a "parse" worker; recommendations keep being
+# served by the "match" / "score" pools. Every other route is passed to
+# the Flask app (WSGI) on the "wsgi" pool.
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+# ===============================
+# STAGE POOLS CONFIG
+# ===============================
+# Concurrent calls per stage (ONLYJOBS_<STAGE>_WORKERS); beyond that up
+# to STAGE_MAX_PENDING calls wait, the rest get a 503.
+# ONLYJOBS_PARSE_POOL=process parses uploads in worker processes
+# (no GIL contention; stage timings of the children are not collected).
+# The children run parse_worker, which doesn't import app, and read PDFs
+# in-process rather than starting nested PDF pools.
+CPU_COUNT = os.cpu_count() or 1
+
+STAGE_WORKERS = {
+    "parse": _env_int("ONLYJOBS_PARSE_WORKERS", CPU_COUNT),
+    "match": _env_int("ONLYJOBS_MATCH_WORKERS", CPU_COUNT),
+    "score": _env_int("ONLYJOBS_SCORE_WORKERS", CPU_COUNT),
+    "io": _env_int("ONLYJOBS_IO_WORKERS", 4),
+    "wsgi": _env_int("ONLYJOBS_WSGI_WORKERS", 16)
+}
+STAGE_MAX_PENDING = _env_int("ONLYJOBS_STAGE_MAX_PENDING", 200)
+PARSE_POOL = os.environ.get("ONLYJOBS_PARSE_POOL", "thread")
+
+# Form fields (not files) of an upload
+MAX_FORM_MEMORY = 500 * 1024
+
+for name, metric_type, help_text in [
+    ("stage_pool_running", "gauge", "Calls running on an ASGI stage pool"),
+    ("stage_pool_waiting", "gauge", "Calls waiting for an ASGI stage pool"),
+    ("stage_pool_rejected_total", "counter", "Calls refused by an ASGI stage pool (too many waiting)")
+]:
+    metrics.describe(name, metric_type, help_text)
+
+
+# ============================================
+# STAGE POOLS
+# ============================================
+
+class StagePool:
+    """
+    Bounded executor for one request stage.
+
+    workers: calls running at once (threads or processes)
+    max_pending: calls waiting for a worker (on the event loop, not in a
+        thread) before run() raises QueueFull
+    """
+
+    def __init__(self, name, workers, max_pending=STAGE_MAX_PENDING, processes=False, initializer=None):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.processes = processes
+        self.initializer = initializer
+        self._executor = None
+        self._slots = asyncio.Semaphore(workers)
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        # Created on first use. spawn: forking a process that runs an event
+        # loop and thread pools is unsafe; workers import the module of the
+        # function they run (not app) and load the models it needs on first use
+        if self._executor is None:
+            if self.processes:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix=f"asgi-{self.name}"
+                )
+        return self._executor
+
+    def _update_metrics(self):
+        metrics.set("stage_pool_running", self.running, stage=self.name)
+        metrics.set("stage_pool_waiting", self.waiting, stage=self.name)
+        metrics.set("stage_pool_rejected_total", self.rejected, stage=self.name)
+
+    async def run(self, fn, *args, bounded=True):
+        """
+        Result of fn(*args) on a worker. bounded=False never refuses the
+        call (e.g. the next chunk of a response already being sent).
+        """
+        if bounded and self._slots.locked() and self.waiting >= self.max_pending:
+            self.rejected += 1
+            self._update_metrics()
+            raise QueueFull(f"Too many requests waiting for {self.name}, try again later")
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        self._update_metrics()
+        try:
+            loop = asyncio.get_running_loop()
+            if self.processes:
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+            # Threads run in the request's context, so stage timings reach
+            # its X-Profile breakdown
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self._get_executor(), context.run, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+            self._update_metrics()
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "kind": "process" if self.processes else "thread",
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_pending": self.max_pending
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+pools = {
+    name: StagePool(name, workers, processes=(name == "parse" and PARSE_POOL == "process"),
+                    initializer=parse_worker.init_worker if name == "parse" else None)
+    for name, workers in STAGE_WORKERS.items()
+}
+
+
+# ============================================
+# REQUESTS + RESPONSES
+# ============================================
+
+class RequestTooLarge(Exception):
+    pass
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+class Request:
+    """The parts of an ASGI HTTP scope the handlers use"""
+
+    def __init__(self, scope, receive):
+        self.scope = scope
+        self.receive = receive
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope.get("headers", [])
+        }
+        self.args = {
+            key: values[0]
+            for key, values in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()
+        }
+
+    async def chunks(self, limit):
+        """Body chunks as they arrive; RequestTooLarge beyond limit bytes"""
+        if int(self.headers.get("content-length") or 0) > limit:
+            raise RequestTooLarge()
+
+        size = 0
+        while True:
+            message = await self.receive()
+            if message["type"] == "http.disconnect":
+                raise ClientDisconnected()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > limit:
+                raise RequestTooLarge()
+            if chunk:
+                yield chunk
+            if not message.get("more_body"):
+                return
+
+    async def body(self, limit):
+        return b"".join([chunk async for chunk in self.chunks(limit)])
+
+    async def form(self, limit):
+        """
+        (fields, files) of a multipart/form-data body, decoded as it
+        arrives: {name: str}, {name: (filename, bytes)}. First part wins
+        for repeated names, as in Flask.
+        """
+        mimetype, options = parse_options_header(self.headers.get("content-type", ""))
+        fields, files = {}, {}
+        if mimetype != "multipart/form-data" or not options.get("boundary"):
+            await self.body(limit)
+            return fields, files
+
+        decoder = MultipartDecoder(options["boundary"].encode("latin-1"), max_form_memory_size=MAX_FORM_MEMORY)
+        part, data = None, []
+
+        def drain():
+            nonlocal part, data
+            event = decoder.next_event()
+            while not isinstance(event, (NeedData, Epilogue)):
+                if isinstance(event, (Field, File)):
+                    part, data = event, []
+                elif isinstance(event, Data):
+                    data.append(event.data)
+                    if not event.more_data:
+                        value = b"".join(data)
+                        if isinstance(part, File):
+                            files.setdefault(part.name, (part.filename or "", value))
+                        else:
+                            fields.setdefault(part.name, value.decode("utf-8", "replace"))
+                event = decoder.next_event()
+
+        async for chunk in self.chunks(limit):
+            decoder.receive_data(chunk)
+            drain()
+        decoder.receive_data(None)
+        drain()
+        return fields, files
+
+
+def json_response(body, status=200, headers=None):
+    """(status, JSON bytes, headers); body may already be serialized"""
+    payload = body if isinstance(body, (str, bytes)) else server.app.json.dumps(body)
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return status, payload, dict(headers or {}, **{"Content-Type": "application/json"})
+
+
+def error_response(error, status):
+    return json_response({"success": False, "error": error}, status)
+
+
+async def send_response(send, request, status, payload, headers):
+    headers = dict(headers, **{"Content-Length": str(len(payload))})
+    # Same as flask_cors with origins "*"
+    if "origin" in request.headers:
+        headers["Access-Control-Allow-Origin"] = request.headers["origin"]
+        headers["Vary"] = "Origin"
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()]
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+# ============================================
+# ROUTES SERVED HERE
+# ============================================
+
+def _lookup_upload(file_bytes, extension):
+    """(cache key, cached upload response or None)"""
+    cache_key = (content_hash(file_bytes), extension)
+    cached = server.resume_cache.get(cache_key) or server.load_stored_upload(cache_key)
+    body = server.app.json.dumps(server.upload_response(*cached)) if cached is not None else None
+    return cache_key, body
+
+
+def _store_upload(cache_key, filename, parsed_data, ats_result):
+    return server.app.json.dumps(server.store_upload(cache_key, filename, parsed_data, ats_result))
+
+
+async def upload_resume(request):
+    fields, files = await request.form(server.MAX_FILE_SIZE)
+
+    if "resume" not in files:
+        return error_response("No resume uploaded", 400)
+
+    original_name, file_bytes = files["resume"]
+
+    if original_name == "":
+        return error_response("No file selected", 400)
+
+    if not server.allowed_file(original_name):
+        return error_response("Only PDF, DOCX, or TXT files are allowed", 400)
+
+    # ?async=1 (or form field async=1): queue the work, return a task id
+    async_mode = (request.args.get("async") or fields.get("async")) in ("1", "true")
+
+    filename = secure_filename(original_name)
+    extension = os.path.splitext(filename)[1].lower()
+
+    # Same bytes uploaded before -> reuse the parsed resume + ATS result
+    cache_key, cached = await pools["io"].run(_lookup_upload, file_bytes, extension)
+    if cached is not None:
+        return json_response(cached)
+
+    if server.SAVE_UPLOADS:
+        server.save_upload_async(filename, file_bytes, cache_key[0])
+
+    if async_mode:
+        task_id = server.task_queue.submit(
+            server.process_upload, file_bytes, filename, cache_key, size=len(file_bytes)
+        )
+        return json_response({
+            "success": True,
+            "task_id": task_id,
+            "status": "queued",
+            "status_url": f"/api/tasks/{task_id}"
+        }, 202)
+
+    parsed_data, ats_result = await pools["parse"].run(parse_worker.parse_and_score_resume, file_bytes, filename)
+    return json_response(await pools["io"].run(_store_upload, cache_key, filename, parsed_data, ats_result))
+
+
+async def job_recommendations(request):
+    try:
+        data = server.app.json.loads(await request.body(server.MAX_FILE_SIZE) or b"null")
+    except ValueError:
+        return error_response("Invalid JSON body", 400)
+
+    jobs = await pools["io"].run(server.get_job_models)
+    if jobs is None:
+        return error_response("Job matching models not loaded", 500)
+
+    query = server.recommendation_query(data if isinstance(data, dict) else None)
+    if query is None:
+        return error_response("Skills required", 400)
+
+    # Same skills / text / level / filters on the same corpus version
+    # -> same response
+    cache_key = server.recommendation_cache_key(*query, jobs["version"])
+    cached = server.recommendation_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached, headers={"X-Cache": "HIT"})
+
+    matched_jobs = await pools["match"].run(server.match_recommendations, jobs, query)
+    payload = await pools["score"].run(server.score_recommendations, jobs, query, matched_jobs, cache_key)
+    return json_response(payload, headers={"X-Cache": "MISS"})
+
+
+ROUTES = {
+    ("POST", "/upload_resume"): upload_resume,
+    ("POST", "/job_recommendations"): job_recommendations
+}
+
+
+async def handle(request, send, handler):
+    """Runs a route handler with the request metrics / profiling of app.py"""
+    start = time.perf_counter()
+    profile_token = None
+    if (request.headers.get(server.PROFILE_HEADER.lower()) in ("1", "true")
+            and server.profiling_allowed(request.headers.get("x-admin-token"))):
+        profile_token = start_profile()
+
+    try:
+        status, payload, headers = await handler(request)
+    except RequestTooLarge:
+        status, payload, headers = error_response("File too large (Max 10MB)", 413)
+    except QueueFull as e:
+        status, payload, headers = error_response(str(e), 503)
+        headers["Retry-After"] = "5"
+    except ClientDisconnected:
+        return
+    except Exception as e:
+        traceback.print_exc()
+        status, payload, headers = error_response(str(e), 500)
+
+    elapsed = time.perf_counter() - start
+    metrics.observe("http_request_seconds", elapsed, route=request.path, method=request.method)
+    metrics.increment("http_requests_total", route=request.path, method=request.method, status=status)
+
+    if profile_token is not None:
+        breakdown = stop_profile(profile_token)
+        entries = [
+            f'{stage};dur={timing["seconds"] * 1000:.3f};desc="{timing["calls"]} calls"'
+            for stage, timing in breakdown.items()
+        ]
+        entries.append(f"total;dur={elapsed * 1000:.3f}")
+        headers["Server-Timing"] = ", ".join(entries)
+
+    await send_response(send, request, status, payload, headers)
+
+
+# ============================================
+# EVERY OTHER ROUTE: FLASK (WSGI)
+# ============================================
+
+def wsgi_environ(request, body):
+    """PEP 3333 environ for an ASGI HTTP request"""
+    scope = request.scope
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    path = scope["path"].encode("utf-8").decode("latin-1")
+    root_path = scope.get("root_path", "").encode("utf-8").decode("latin-1")
+
+    environ = {
+        "REQUEST_METHOD": request.method,
+        "SCRIPT_NAME": root_path,
+        "PATH_INFO": path[len(root_path):] if path.startswith(root_path) else path,
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False
+    }
+    for name, value in request.headers.items():
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+        elif name == "content-length":
+            environ["CONTENT_LENGTH"] = value
+        else:
+            key = "HTTP_" + name.upper().replace("-", "_")
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _start_wsgi(environ):
+    """Calls the Flask app; returns (status, headers, body iterator, first chunk)"""
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = headers
+
+    result = server.app(environ, start_response)
+    chunks = iter(result)
+    first = next(chunks, None)
+    return started["status"], started["headers"], result, chunks, first
+
+
+async def call_flask(request, send):
+    try:
+        body = await request.body(server.app.config["MAX_CONTENT_LENGTH"])
+    except RequestTooLarge:
+        await send_response(send, request, *error_response("File too large (Max 10MB)", 413))
+        return
+    except ClientDisconnected:
+        return
+
+    wsgi = pools["wsgi"]
+    try:
+        status, headers, result, chunks, chunk = await wsgi.run(_start_wsgi, wsgi_environ(request, body))
+    except QueueFull as e:
+        status, payload, headers = error_response(str(e), 503)
+        headers["Retry-After"] = "5"
+        await send_response(send, request, status, payload, headers)
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in headers]
+    })
+    try:
+        # Streamed responses (e.g. /api/batch_screen) are produced chunk
+        # by chunk on the pool and sent as they come
+        while chunk is not None:
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            chunk = await wsgi.run(next, chunks, None, bounded=False)
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        if hasattr(result, "close"):
+            await wsgi.run(result.close, bounded=False)
+
+
+# ============================================
+# APPLICATION
+# ============================================
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            print("🚀 ONLYJOBS ASGI server started")
+            for name, pool in pools.items():
+                print(f"   {name}: {pool.workers} {'processes' if pool.processes else 'threads'}")
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            for pool in pools.values():
+                pool.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    request = Request(scope, receive)
+    handler = ROUTES.get((request.method, request.path))
+    if handler is not None:
+        await handle(request, send, handler)
+    else:
+        await call_flask(request, send)
@@ -1,47 +1,108 @@
-import re
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from metrics import timed, timer
+from text_analysis import as_document, clean_text, pair_similarity, pair_similarity_matrix
 
 # ============================================
-# TEXT CLEANING
+# ATS WEIGHTS
 # ============================================
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    return text
+SKILL_WEIGHT = 0.5
+TEXT_WEIGHT = 0.3
+EXPERIENCE_WEIGHT = 0.2
+
+# Experience levels and the score for each level gap (0, 1, 2+)
+EXPERIENCE_LEVELS = {
+    "entry": 1,
+    "mid": 2,
+    "senior": 3
+}
+EXPERIENCE_GAP_SCORES = (100, 70, 40)
 
 # ============================================
 # SKILL MATCH SCORE (50%)
 # ============================================
+def normalize_skills(skills):
+    """
+    Normalized (stripped, lower-cased) skill set
+    skills: str (comma-separated) or iterable of str
+    """
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    return frozenset(s.strip().lower() for s in skills)
+
+
 def skill_match_score(resume_skills, job_skills):
     """
     Computes percentage of job skills matched by resume skills
-    resume_skills: list[str]
-    job_skills: str, comma-separated
+    resume_skills: list[str] or normalized frozenset
+    job_skills: str, comma-separated, or normalized frozenset
+        (see normalize_skills / job_matching.SkillIndex)
     """
-    if not isinstance(job_skills, str) or not job_skills.strip():
+    if isinstance(job_skills, str):
+        if not job_skills.strip():
+            return 0
+        job_skills = normalize_skills(job_skills)
+    elif not isinstance(job_skills, frozenset) or not job_skills:
         return 0
 
-    resume_set = set(s.lower() for s in resume_skills)
-    job_set = set(s.strip().lower() for s in job_skills.split(","))
+    if not isinstance(resume_skills, frozenset):
+        resume_skills = normalize_skills(resume_skills)
 
-    matched = resume_set.intersection(job_set)
-    return (len(matched) / len(job_set)) * 100
+    matched = resume_skills & job_skills
+    return (len(matched) / len(job_skills)) * 100
 
 # ============================================
 # TEXT SIMILARITY SCORE (30%)
 # ============================================
+@timed("ats_text_similarity")
 def text_similarity_score(resume_text, job_text):
     """
     Computes TF-IDF cosine similarity between resume text and job description
+    (str or text_analysis.AnalyzedDocument each)
+    """
+    return pair_similarity(as_document(resume_text), as_document(job_text)) * 100
+
+
+@timed("ats_text_similarity")
+def text_similarity_scores(resume_text, job_texts, vectorizer=None, job_vectors=None):
     """
-    resume_text = clean_text(resume_text)
-    job_text = clean_text(job_text)
+    Batched version of text_similarity_score.
 
-    vectorizer = TfidfVectorizer(stop_words="english")
-    vectors = vectorizer.fit_transform([resume_text, job_text])
-    similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-    return similarity * 100
+    resume_text: str or text_analysis.AnalyzedDocument
+    The resume is vectorized once and compared against every job in a
+    single sparse matrix-vector product.
+
+    vectorizer: fitted TfidfVectorizer (e.g. the job corpus vectorizer).
+        When omitted, one vectorizer is fitted on the resume + all job texts.
+    job_vectors: optional precomputed job rows (e.g. tfidf_matrix[rows])
+        produced by ``vectorizer``, aligned with ``job_texts``.
+    """
+    if not job_texts:
+        return np.zeros(0)
+
+    resume = as_document(resume_text)
+
+    if vectorizer is None:
+        vectorizer = TfidfVectorizer(stop_words="english")
+        try:
+            vectors = vectorizer.fit_transform(
+                [resume.clean_text] + [clean_text(t) for t in job_texts]
+            )
+        except ValueError:
+            # Empty vocabulary (only stop words / blank input)
+            return np.zeros(len(job_texts))
+        resume_vector, job_vectors = vectors[0], vectors[1:]
+    else:
+        # Built from the resume tokens once per vectorizer
+        resume_vector = resume.vector(vectorizer)
+        if job_vectors is None:
+            job_vectors = vectorizer.transform([clean_text(t) for t in job_texts])
+
+    # TF-IDF rows are L2-normalized, so the dot product is the cosine
+    similarities = np.asarray(job_vectors.dot(resume_vector.T).todense()).ravel()
+    return similarities * 100
 
 # ============================================
 # EXPERIENCE MATCH SCORE (20%)
@@ -51,40 +112,178 @@ def experience_score(resume_experience, job_experience):
     Scores experience alignment between resume and job
     Both must be one of: Entry, Mid, Senior
     """
-    mapping = {
-        "entry": 1,
-        "mid": 2,
-        "senior": 3
-    }
+    diff = abs(experience_level_code(resume_experience) - experience_level_code(job_experience))
+    return EXPERIENCE_GAP_SCORES[min(diff, 2)]
 
-    r = mapping.get(str(resume_experience).lower(), 2)
-    j = mapping.get(str(job_experience).lower(), 2)
 
-    diff = abs(r - j)
-
-    if diff == 0:
-        return 100
-    elif diff == 1:
-        return 70
-    else:
-        return 40
+def experience_level_code(level):
+    """Entry=1, Mid=2, Senior=3 (unknown -> Mid)"""
+    return EXPERIENCE_LEVELS.get(str(level).lower(), 2)
 
 # ============================================
 # FINAL ATS SCORE
 # ============================================
+@timed("ats_score")
 def calculate_ats_score(resume_text, resume_skills, resume_experience, job):
     """
     Calculates weighted ATS score
+    resume_text: str or text_analysis.AnalyzedDocument (tokenized once,
+        e.g. by resume_parser.analyze_resume)
     """
     skill_score = skill_match_score(resume_skills, job.get("skills", ""))
     text_score = text_similarity_score(resume_text, job.get("combined_text", ""))
     exp_score = experience_score(resume_experience, job.get("Experience Level", "Mid"))
 
-    final_score = 0.5 * skill_score + 0.3 * text_score + 0.2 * exp_score
+    return ats_breakdown(skill_score, text_score, exp_score)
+
+
+def ats_breakdown(skill_score, text_score, exp_score):
+    """
+    Combines the component scores into the ATS breakdown dict
+    """
+    final_score = SKILL_WEIGHT * skill_score + TEXT_WEIGHT * text_score + EXPERIENCE_WEIGHT * exp_score
 
     return {
-        "ats_score": round(final_score, 2),
+        "ats_score": round(float(final_score), 2),
         "skill_match": round(skill_score, 2),
-        "text_similarity": round(text_score, 2),
+        "text_similarity": round(float(text_score), 2),
         "experience_match": round(exp_score, 2)
     }
+
+
+# ============================================
+# BATCH ATS SCORES
+# ============================================
+@timed("ats_scores")
+def calculate_ats_scores(resume_text, resume_skills, resume_experience, jobs,
+                         vectorizer=None, job_vectors=None, job_skill_sets=None):
+    """
+    Calculates weighted ATS scores for many jobs at once.
+
+    Same breakdown dict as calculate_ats_score, one per job (in order),
+    but the resume text is vectorized only once for all jobs.
+    See text_similarity_scores for ``vectorizer`` / ``job_vectors``.
+    job_skill_sets: optional precomputed normalized skill sets aligned
+        with ``jobs`` (e.g. from job_matching.SkillIndex).
+    """
+    text_scores = text_similarity_scores(
+        resume_text,
+        [job.get("combined_text", "") for job in jobs],
+        vectorizer=vectorizer,
+        job_vectors=job_vectors
+    )
+
+    if job_skill_sets is None:
+        job_skill_sets = [job.get("skills", "") for job in jobs]
+
+    # Component timings once per batch, not per job
+    with timer("ats_skill_match"):
+        resume_set = normalize_skills(resume_skills)
+        skill_scores = [skill_match_score(resume_set, job_skills) for job_skills in job_skill_sets]
+
+    with timer("ats_experience"):
+        exp_scores = [
+            experience_score(resume_experience, job.get("Experience Level", "Mid")) for job in jobs
+        ]
+
+    return [
+        ats_breakdown(skill_score, text_score, exp_score)
+        for skill_score, text_score, exp_score in zip(skill_scores, text_scores, exp_scores)
+    ]
+
+
+# ============================================
+# RESUME x JOB ATS MATRIX
+# ============================================
+@timed("ats_matrix")
+def calculate_ats_matrix(resume_texts, resume_skills, resume_experiences, jobs, vectorizer=None):
+    """
+    ATS scores of every resume against every job, computed as matrix
+    products. Same weights and components, and the same numbers, as
+    calculate_ats_score for each pair: text similarity uses the TF-IDF
+    of just that resume and job (pair_similarity).
+
+    resume_texts / resume_skills / resume_experiences: one entry per resume
+    jobs: list of job dicts (skills, combined_text, Experience Level)
+    vectorizer: fitted CountVectorizer(stop_words="english") whose
+        vocabulary covers all resume + job texts (only its term counts
+        are used); when omitted one is fitted on them
+
+    Returns: dict of (n_resumes, n_jobs) arrays, keys as in the
+    calculate_ats_score breakdown
+    """
+    n_resumes, n_jobs = len(resume_texts), len(jobs)
+
+    # Skill match: binary resume x skill and job x skill matrices
+    job_sets = [
+        normalize_skills(s) if isinstance(s, str) and s.strip() else frozenset()
+        for s in (job.get("skills", "") for job in jobs)
+    ]
+    columns = {}
+    for skills in job_sets:
+        for skill in skills:
+            columns.setdefault(skill, len(columns))
+
+    job_skill_matrix = _binary_matrix(job_sets, columns)
+    resume_skill_matrix = _binary_matrix(
+        [normalize_skills(skills) for skills in resume_skills], columns
+    )
+    overlap = np.asarray(resume_skill_matrix.dot(job_skill_matrix.T).todense(), dtype=np.float64)
+    job_sizes = np.array([len(skills) for skills in job_sets], dtype=np.float64)
+    skill_scores = np.divide(
+        overlap * 100, job_sizes, out=np.zeros((n_resumes, n_jobs)), where=job_sizes > 0
+    )
+
+    # Text similarity: pair_similarity of every resume x job pair, from
+    # sparse products of the term-count matrices
+    resume_texts = [clean_text(text) for text in resume_texts]
+    job_texts = [
+        clean_text(text) if isinstance(text, str) else ""
+        for text in (job.get("combined_text", "") for job in jobs)
+    ]
+    if vectorizer is None:
+        vectorizer = CountVectorizer(stop_words="english")
+        try:
+            vectorizer.fit(resume_texts + job_texts)
+        except ValueError:
+            # Empty vocabulary (only stop words / blank input)
+            vectorizer = None
+
+    if vectorizer is None:
+        text_scores = np.zeros((n_resumes, n_jobs))
+    else:
+        text_scores = pair_similarity_matrix(
+            vectorizer.transform(resume_texts), vectorizer.transform(job_texts)
+        ) * 100
+
+    # Experience match: level gap -> score lookup
+    resume_levels = np.array([experience_level_code(e) for e in resume_experiences])
+    job_levels = np.array([experience_level_code(job.get("Experience Level", "Mid")) for job in jobs])
+    gaps = np.minimum(np.abs(resume_levels[:, None] - job_levels[None, :]), 2)
+    exp_scores = np.asarray(EXPERIENCE_GAP_SCORES, dtype=np.float64)[gaps]
+
+    final_scores = (
+        SKILL_WEIGHT * skill_scores + TEXT_WEIGHT * text_scores + EXPERIENCE_WEIGHT * exp_scores
+    )
+
+    return {
+        "ats_score": np.round(final_scores, 2),
+        "skill_match": np.round(skill_scores, 2),
+        "text_similarity": np.round(text_scores, 2),
+        "experience_match": np.round(exp_scores, 2)
+    }
+
+
+def _binary_matrix(skill_sets, columns):
+    rows, cols = [], []
+    for row, skills in enumerate(skill_sets):
+        for skill in skills:
+            col = columns.get(skill)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+
+    return csr_matrix(
+        (np.ones(len(rows)), (rows, cols)),
+        shape=(len(skill_sets), max(1, len(columns)))
+    )
@@ -0,0 +1,331 @@
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+from ats_scoring import calculate_ats_matrix, clean_text
+from job_matching import json_value
+from resume_parser import disable_pdf_pool, parse_resume
+
+# ============================================
+# BULK RESUME SCREENING
+# ============================================
+#
+# Scores many resumes against many jobs:
+#   1. resumes (zip or directory) are parsed on a process pool
+#   2. the resume x job ATS matrix is computed chunk by chunk with
+#      calculate_ats_matrix (sparse matrix products)
+#   3. one row per (resume, job) pair is streamed out as CSV or JSONL
+
+RESUME_EXTENSIONS = {".pdf", ".docx", ".txt"}
+SCREENING_WORKERS = min(4, os.cpu_count() or 1)
+RESUME_CHUNK_SIZE = 256       # resumes scored per matrix product
+MAX_RESUMES = 10_000          # per request / run
+
+# Uncompressed size limits for zip archives (checked before reading)
+MAX_RESUME_FILE_SIZE = 10 * 1024 * 1024       # per resume
+MAX_ARCHIVE_SIZE = 512 * 1024 * 1024          # all resumes of one archive
+
+OUTPUT_FIELDS = [
+    "resume", "job_id", "job_title",
+    "ats_score", "skill_match", "text_similarity", "experience_match"
+]
+
+
+# ============================================
+# INPUTS
+# ============================================
+
+class ArchiveTooLarge(ValueError):
+    pass
+
+
+def _read_member(archive, info, limit):
+    """Bytes of a zip member, never more than limit (the header size may lie)"""
+    with archive.open(info) as f:
+        data = f.read(limit + 1)
+    if len(data) > limit:
+        raise ArchiveTooLarge(f"{info.filename} is larger than {limit // (1024 * 1024)} MB uncompressed")
+    return data
+
+
+def iter_resume_files(source, max_file_size=MAX_RESUME_FILE_SIZE, max_total_size=MAX_ARCHIVE_SIZE):
+    """
+    Yields (name, bytes) for every resume in a zip archive (path, bytes
+    or stream) or a directory, skipping unsupported file types.
+
+    Raises ArchiveTooLarge when a zip member is above max_file_size or
+    all resumes together are above max_total_size (uncompressed).
+    """
+    if isinstance(source, str) and os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for filename in sorted(files):
+                if os.path.splitext(filename)[1].lower() in RESUME_EXTENSIONS:
+                    path = os.path.join(root, filename)
+                    with open(path, "rb") as f:
+                        yield os.path.relpath(path, source), f.read()
+        return
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    total = 0
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            if os.path.splitext(info.filename)[1].lower() not in RESUME_EXTENSIONS:
+                continue
+            if info.file_size > max_file_size:
+                raise ArchiveTooLarge(
+                    f"{info.filename} is larger than {max_file_size // (1024 * 1024)} MB uncompressed"
+                )
+            data = _read_member(archive, info, max_file_size)
+            total += len(data)
+            if total > max_total_size:
+                raise ArchiveTooLarge(f"Resumes are larger than {max_total_size // (1024 * 1024)} MB uncompressed")
+            yield info.filename, data
+
+
+def load_jobs_file(path):
+    """Jobs from a CSV (jobs_cleaned.csv columns) or a JSON list of job dicts"""
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    return pd.read_csv(path).to_dict("records")
+
+
+# ============================================
+# PARSING (PROCESS POOL)
+# ============================================
+
+def _parse_one(item):
+    name, data = item
+    try:
+        return name, parse_resume(data, name), None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+
+# One pool per worker count, shared by every request / run
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # spawn: safe to use from inside a threaded web server. The
+            # workers read PDFs in-process, no nested PDF pools
+            pool = _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=disable_pdf_pool
+            )
+        return pool
+
+
+def _reset_pool(workers):
+    with _pools_lock:
+        pool = _pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_resumes(items, workers=SCREENING_WORKERS):
+    """
+    Parses (name, bytes) items; yields (name, parsed | None, error | None)
+    in input order.
+    """
+    items = list(items)
+    if workers <= 1:
+        yield from map(_parse_one, items)
+        return
+
+    pool = _get_pool(workers)
+    futures = [pool.submit(_parse_one, item) for item in items]
+    done = 0
+    try:
+        for future in futures:
+            yield future.result()
+            done += 1
+    except BrokenProcessPool:
+        # A worker died: drop the pool, parse the rest in-process
+        _reset_pool(workers)
+        yield from map(_parse_one, items[done:])
+    finally:
+        # Stream abandoned (e.g. client disconnected): don't parse the rest
+        for future in futures[done:]:
+            future.cancel()
+
+
+# ============================================
+# SCORING + OUTPUT
+# ============================================
+
+def _fit_vectorizer(parsed, jobs):
+    """One vocabulary shared by every chunk (term counts of resumes + job texts)"""
+    vectorizer = CountVectorizer(stop_words="english")
+    texts = [clean_text(p["resume_text"]) for p in parsed] + [
+        clean_text(text) if isinstance(text, str) else ""
+        for text in (job.get("combined_text", "") for job in jobs)
+    ]
+    try:
+        vectorizer.fit(texts)
+    except ValueError:
+        return None
+    return vectorizer
+
+
+def screen_resumes(items, jobs, workers=SCREENING_WORKERS, vectorizer=None, stats=None):
+    """
+    Yields one result dict per (resume, job) pair (OUTPUT_FIELDS), or a
+    {"resume", "error"} dict for resumes that could not be parsed.
+
+    stats: optional dict, filled with resumes / pairs / seconds /
+        resumes_per_second once the generator is exhausted
+    """
+    start = time.perf_counter()
+
+    names, parsed = [], []
+    n_errors = 0
+    for name, result, error in parse_resumes(items, workers):
+        if error is not None:
+            n_errors += 1
+            yield {"resume": name, "error": error}
+            continue
+        names.append(name)
+        parsed.append(result)
+
+    if vectorizer is None and parsed and jobs:
+        vectorizer = _fit_vectorizer(parsed, jobs)
+
+    n_pairs = 0
+    for first in range(0, len(parsed) if jobs else 0, RESUME_CHUNK_SIZE):
+        chunk = parsed[first:first + RESUME_CHUNK_SIZE]
+        scores = calculate_ats_matrix(
+            [p["resume_text"] for p in chunk],
+            [p["skills"] for p in chunk],
+            [p["experience_level"] for p in chunk],
+            jobs,
+            vectorizer=vectorizer
+        )
+
+        for i in range(len(chunk)):
+            for j, job in enumerate(jobs):
+                n_pairs += 1
+                yield {
+                    "resume": names[first + i],
+                    "job_id": job.get("Job Id"),
+                    "job_title": job.get("Job Title"),
+                    "ats_score": float(scores["ats_score"][i, j]),
+                    "skill_match": float(scores["skill_match"][i, j]),
+                    "text_similarity": float(scores["text_similarity"][i, j]),
+                    "experience_match": float(scores["experience_match"][i, j])
+                }
+
+    seconds = time.perf_counter() - start
+    n_resumes = len(parsed) + n_errors
+    if stats is not None:
+        stats.update({
+            "resumes": n_resumes,
+            "failed": n_errors,
+            "jobs": len(jobs),
+            "pairs": n_pairs,
+            "seconds": round(seconds, 3),
+            "resumes_per_second": round(n_resumes / seconds, 2) if seconds > 0 else None
+        })
+
+
+def format_rows(rows, fmt="jsonl", stats=None):
+    """
+    Serializes result dicts as CSV or JSONL lines (a generator, so the
+    output can be streamed). JSONL ends with a {"summary": stats} line.
+
+    If producing the rows fails part way, a last row with
+    resume="*" and the error is written, so a streamed response is
+    never cut short silently.
+    """
+    rows = _with_failure_row(rows)
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=OUTPUT_FIELDS + ["error"], extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        return
+
+    for row in rows:
+        # Job cells may be NaN / numpy scalars: JSON null / plain values
+        yield json.dumps({key: json_value(value) for key, value in row.items()}) + "\n"
+    if stats is not None:
+        yield json.dumps({"summary": stats}) + "\n"
+
+
+def _with_failure_row(rows):
+    try:
+        yield from rows
+    except Exception as e:
+        traceback.print_exc()
+        yield {"resume": "*", "error": f"Screening failed: {type(e).__name__}: {e}"}
+
+
+# ============================================
+# COMMAND LINE
+# ============================================
+# Usage (from backend/):
+#   python batch_screening.py resumes.zip jobs.csv -o results.csv
+#   python batch_screening.py resumes_dir/ jobs.json --format jsonl
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score many resumes against many jobs")
+    parser.add_argument("resumes", help="zip archive or directory of PDF / DOCX / TXT resumes")
+    parser.add_argument("jobs", help="jobs CSV (jobs_cleaned.csv columns) or JSON list")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=SCREENING_WORKERS)
+    args = parser.parse_args(argv)
+
+    jobs = load_jobs_file(args.jobs)
+    items = list(iter_resume_files(args.resumes))
+    stats = {}
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        for line in format_rows(
+            screen_resumes(items, jobs, workers=args.workers, stats=stats),
+            args.format
+        ):
+            out.write(line)
+    finally:
+        if args.output:
+            out.close()
+
+    if not stats:
+        print("❌ Screening failed (see the last output row)", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"✅ {stats['resumes']} resumes x {stats['jobs']} jobs in {stats['seconds']}s "
+        f"({stats['resumes_per_second']} resumes/s, {stats['failed']} failed)",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
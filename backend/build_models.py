@@ -0,0 +1,400 @@
+import argparse
+import json
+import os
+import shutil
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from job_corpus import job_texts
+from job_matching import BUNDLE_DIR, DATA_PATH
+from model_bundle import (
+    BUNDLE_VERSION, CATEGORICAL_RATIO, bundle_path, replace_bundle, vectorizer_params, write_lines
+)
+from model_registry import peak_memory_mb
+
+# ============================================
+# STREAMING MODEL BUILD
+# ============================================
+#
+# Builds the job models (a models/bundle/ directory, see model_bundle.py)
+# straight from a jobs CSV of any size. Only one chunk of rows is in
+# memory at a time:
+#
+#   pass 1: per chunk, the document frequency (and count) of every term
+#           and what each column holds (numeric dtype / few categories /
+#           free text)
+#   fit:    vocabulary + idf from the counts, as TfidfVectorizer.fit
+#   pass 2: per chunk, the TF-IDF rows and the job columns are appended
+#           to files in the bundle
+#
+# The matrix is the same as TfidfVectorizer.fit_transform over the whole
+# CSV. What stays in memory is the term counts (one entry per distinct
+# term), indptr-sized counters and one chunk.
+
+CHUNK_ROWS = 50_000
+
+# The vectorizer the models are built with (job_corpus refits a clone of it)
+VECTORIZER_PARAMS = {"stop_words": "english"}
+
+# Distinct values of a text column kept while scanning; beyond either
+# limit it is stored as free text (long descriptions are dropped early)
+MAX_STREAMED_CATEGORIES = 65_536
+MAX_STREAMED_CATEGORY_CHARS = 8_000_000
+
+# Elements per block when raw parts are copied into .npy files
+COPY_BLOCK = 1 << 22
+
+
+def read_chunks(csv_path, chunk_rows=CHUNK_ROWS, dtype=None):
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=dtype):
+        if "combined_text" not in chunk.columns:
+            raise ValueError("combined_text column missing in dataset")
+        yield chunk
+
+
+# ============================================
+# APPEND-ONLY ARRAY FILES
+# ============================================
+
+class ArrayWriter:
+    """
+    1-D array written chunk by chunk to a raw part file, then turned
+    into a .npy file (optionally as another dtype) by finish().
+    """
+
+    def __init__(self, path, dtype):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self._file = open(path + ".part", "wb")
+
+    def append(self, values):
+        values = np.asarray(values, dtype=self.dtype)
+        self._file.write(values.tobytes())
+        self.size += values.size
+
+    def finish(self, dtype=None):
+        dtype = np.dtype(dtype or self.dtype)
+        self._file.close()
+
+        with open(self.path + ".part", "rb") as source, open(self.path, "wb") as out:
+            np.lib.format.write_array_header_1_0(out, {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": (self.size,)
+            })
+            block_bytes = COPY_BLOCK * self.dtype.itemsize
+            while True:
+                block = source.read(block_bytes)
+                if not block:
+                    break
+                out.write(np.frombuffer(block, dtype=self.dtype).astype(dtype, copy=False).tobytes())
+        os.remove(self.path + ".part")
+
+
+# ============================================
+# PASS 1: TERM AND COLUMN STATISTICS
+# ============================================
+
+class ColumnStats:
+    """What one CSV column holds, gathered chunk by chunk"""
+
+    def __init__(self, name):
+        self.name = name
+        self.dtype = None          # numeric dtype, while no chunk had text
+        self.missing = False       # any empty cell, in any chunk
+        self.text = False
+        self.categories = set()    # None once there are too many to keep
+        self.category_chars = 0
+
+    def update(self, series):
+        values = series.dropna()
+        if len(values) < len(series):
+            self.missing = True
+        if values.empty:
+            return
+
+        if not self.text and (pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype)):
+            self.dtype = values.dtype if self.dtype is None else np.result_type(self.dtype, values.dtype)
+            return
+
+        if not self.text and self.dtype is not None:
+            # Values of earlier (numeric) chunks weren't collected
+            self.categories = None
+        self.text = True
+        if self.categories is not None:
+            new = set(values.astype(str).unique()) - self.categories
+            self.categories.update(new)
+            self.category_chars += sum(map(len, new))
+            if len(self.categories) > MAX_STREAMED_CATEGORIES or self.category_chars > MAX_STREAMED_CATEGORY_CHARS:
+                self.categories = None
+
+    def kind(self, n_jobs):
+        if not self.text:
+            return "numeric"
+        if self.categories is not None and len(self.categories) < CATEGORICAL_RATIO * max(1, n_jobs):
+            return "categorical"
+        return "text"
+
+    def numeric_dtype(self):
+        # A column that is always empty, or an int / bool one with empty
+        # cells (even if only in other chunks), is float (NaN), like in read_csv
+        dtype = np.dtype(self.dtype if self.dtype is not None else np.float64)
+        if self.missing and dtype.kind in "biu":
+            return np.dtype(np.float64)
+        return dtype
+
+
+def _term_counter(vectorizer):
+    """CountVectorizer with the tokenization of ``vectorizer`` and no vocabulary limits"""
+    params = CountVectorizer().get_params()
+    params.update({name: value for name, value in vectorizer.get_params().items() if name in params})
+    params.update(min_df=1, max_df=1.0, max_features=None, vocabulary=None, binary=False, dtype=np.int64)
+    return CountVectorizer(**params)
+
+
+def scan_csv(csv_path, vectorizer, chunk_rows=CHUNK_ROWS):
+    """
+    Pass 1. Returns (n_jobs, document frequencies, term counts or None,
+    [ColumnStats]); term counts are only kept when max_features is set.
+    """
+    counter = _term_counter(vectorizer)
+    keep_counts = vectorizer.max_features is not None
+
+    doc_freq = Counter()
+    term_counts = Counter() if keep_counts else None
+    columns = None
+    n_jobs = 0
+
+    for chunk in read_chunks(csv_path, chunk_rows):
+        if columns is None:
+            columns = [ColumnStats(name) for name in chunk.columns]
+        n_jobs += len(chunk)
+        for stats in columns:
+            stats.update(chunk[stats.name])
+
+        try:
+            counts = counter.fit_transform(job_texts(chunk)).tocsr()
+        except ValueError:
+            continue  # no terms in this chunk (e.g. only stop words)
+        terms = counter.get_feature_names_out().tolist()
+        doc_freq.update(dict(zip(terms, np.bincount(counts.indices, minlength=len(terms)).tolist())))
+        if keep_counts:
+            term_counts.update(dict(zip(terms, np.asarray(counts.sum(axis=0)).ravel().tolist())))
+
+    if columns is None:
+        raise ValueError(f"No jobs in {csv_path}")
+    return n_jobs, doc_freq, term_counts, columns
+
+
+# ============================================
+# FIT
+# ============================================
+
+def fit_vectorizer(vectorizer, n_jobs, doc_freq, term_counts=None):
+    """
+    Sets vocabulary_ / idf_ of ``vectorizer`` from pass 1 counts,
+    with the min_df / max_df / max_features / idf rules of
+    TfidfVectorizer.fit
+    """
+    max_doc = vectorizer.max_df if isinstance(vectorizer.max_df, int) else vectorizer.max_df * n_jobs
+    min_doc = vectorizer.min_df if isinstance(vectorizer.min_df, int) else vectorizer.min_df * n_jobs
+
+    terms = sorted(term for term, count in doc_freq.items() if min_doc <= count <= max_doc)
+    if vectorizer.max_features is not None and len(terms) > vectorizer.max_features:
+        # argsort as in CountVectorizer._limit_features, so ties pick the same terms
+        counts = np.array([term_counts[term] for term in terms], dtype=np.int64)
+        frequent = (-counts).argsort()[:vectorizer.max_features]
+        terms = [terms[i] for i in sorted(frequent)]
+    if not terms:
+        raise ValueError("No terms left to build a vocabulary")
+
+    df = np.array([doc_freq[term] for term in terms], dtype=np.float64)
+    n = float(n_jobs)
+    if vectorizer.smooth_idf:
+        df, n = df + 1, n + 1
+    vectorizer.vocabulary_ = {term: column for column, term in enumerate(terms)}
+    vectorizer.idf_ = np.log(n / df) + 1.0
+    return vectorizer
+
+
+# ============================================
+# PASS 2: WRITE THE BUNDLE
+# ============================================
+
+def _column_writers(bundle_dir, columns, n_jobs):
+    """(kind, writer state) per column; see model_bundle._save_column for the files"""
+    writers = []
+    for i, stats in enumerate(columns):
+        kind = stats.kind(n_jobs)
+        if kind == "numeric":
+            state = ArrayWriter(bundle_path(bundle_dir, f"col_{i}.npy"), stats.numeric_dtype())
+        elif kind == "categorical":
+            categories = pd.Index(sorted(stats.categories))
+            codes_dtype = pd.Categorical([], categories=categories).codes.dtype
+            write_lines(bundle_path(bundle_dir, f"col_{i}_categories.txt"), [json.dumps(str(c)) for c in categories])
+            state = (categories, ArrayWriter(bundle_path(bundle_dir, f"col_{i}_codes.npy"), codes_dtype))
+        else:
+            offsets = ArrayWriter(bundle_path(bundle_dir, f"col_{i}_offsets.npy"), np.int64)
+            offsets.append([0])
+            state = {
+                "blob": open(bundle_path(bundle_dir, f"col_{i}.bin"), "wb"),
+                "position": 0,
+                "offsets": offsets,
+                "missing": ArrayWriter(bundle_path(bundle_dir, f"col_{i}_missing.npy"), bool)
+            }
+        writers.append((kind, state))
+    return writers
+
+
+def _append_column(kind, state, series):
+    if kind == "numeric":
+        state.append(series.to_numpy(dtype=state.dtype))
+    elif kind == "categorical":
+        categories, codes = state
+        codes.append(pd.Categorical(series, categories=categories).codes)
+    else:
+        missing = series.isna().to_numpy()
+        ends = np.empty(len(series), dtype=np.int64)
+        for j, value in enumerate(series.tolist()):
+            if not missing[j]:
+                data = str(value).encode("utf-8")
+                state["blob"].write(data)
+                state["position"] += len(data)
+            ends[j] = state["position"]
+        state["offsets"].append(ends)
+        state["missing"].append(missing)
+
+
+def _finish_column(kind, state):
+    if kind == "numeric":
+        state.finish()
+    elif kind == "categorical":
+        state[1].finish()
+    else:
+        state["blob"].close()
+        state["offsets"].finish()
+        state["missing"].finish()
+
+
+def write_bundle(csv_path, vectorizer, n_jobs, columns, bundle_dir, chunk_rows=CHUNK_ROWS):
+    """Pass 2: streams the TF-IDF rows and job columns of csv_path into bundle_dir"""
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    # Column indices always fit int32; indptr / indices become int64 only
+    # if nnz needs it (same dtype for both, as in build_bundle)
+    data = ArrayWriter(bundle_path(bundle_dir, "matrix_data.npy"), vectorizer.dtype)
+    indices = ArrayWriter(bundle_path(bundle_dir, "matrix_indices.npy"), np.int32)
+    indptr = ArrayWriter(bundle_path(bundle_dir, "matrix_indptr.npy"), np.int64)
+    indptr.append([0])
+
+    writers = _column_writers(bundle_dir, columns, n_jobs)
+    # Free text columns are read as str, so values are written as in the CSV
+    text_columns = {stats.name: str for stats, (kind, _) in zip(columns, writers) if kind != "numeric"}
+
+    for chunk in read_chunks(csv_path, chunk_rows, dtype=text_columns):
+        matrix = vectorizer.transform(job_texts(chunk))
+        matrix.sort_indices()
+        indptr.append(matrix.indptr[1:].astype(np.int64) + data.size)
+        data.append(matrix.data)
+        indices.append(matrix.indices)
+
+        for stats, (kind, state) in zip(columns, writers):
+            _append_column(kind, state, chunk[stats.name])
+
+    index_dtype = np.int64 if data.size > np.iinfo(np.int32).max else np.int32
+    data.finish()
+    indices.finish(index_dtype)
+    indptr.finish(index_dtype)
+    for kind, state in writers:
+        _finish_column(kind, state)
+
+    meta = {
+        "version": BUNDLE_VERSION,
+        "n_jobs": n_jobs,
+        "matrix_shape": [n_jobs, len(vectorizer.vocabulary_)],
+        "vectorizer_params": vectorizer_params(vectorizer),
+        "columns": [{"kind": kind, "name": stats.name} for stats, (kind, _) in zip(columns, writers)]
+    }
+    write_lines(bundle_path(bundle_dir, "vocab.txt"), list(vectorizer.vocabulary_))
+    np.save(bundle_path(bundle_dir, "idf.npy"), vectorizer.idf_)
+    # meta.json last: a bundle without it is incomplete and never loaded
+    with open(bundle_path(bundle_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def build_models(csv_path=DATA_PATH, bundle_dir=BUNDLE_DIR, chunk_rows=CHUNK_ROWS, **vectorizer_params):
+    """
+    Builds a model bundle from csv_path in two streaming passes.
+    Returns build stats (rows, terms, nnz, seconds and peak memory per step).
+    """
+    vectorizer = TfidfVectorizer(**dict(VECTORIZER_PARAMS, **vectorizer_params))
+    stats = {}
+
+    start = time.perf_counter()
+    n_jobs, doc_freq, term_counts, columns = scan_csv(csv_path, vectorizer, chunk_rows)
+    stats["scan"] = {"seconds": round(time.perf_counter() - start, 2), "peak_mb": peak_memory_mb()}
+
+    start = time.perf_counter()
+    fit_vectorizer(vectorizer, n_jobs, doc_freq, term_counts)
+    stats["fit"] = {"seconds": round(time.perf_counter() - start, 2), "peak_mb": peak_memory_mb()}
+    del doc_freq, term_counts
+
+    # Written next to the target and swapped in when complete
+    new_dir = bundle_dir + ".new"
+    shutil.rmtree(new_dir, ignore_errors=True)
+    start = time.perf_counter()
+    write_bundle(csv_path, vectorizer, n_jobs, columns, new_dir, chunk_rows)
+    replace_bundle(new_dir, bundle_dir)
+    stats["write"] = {"seconds": round(time.perf_counter() - start, 2), "peak_mb": peak_memory_mb()}
+
+    nnz_path = bundle_path(bundle_dir, "matrix_data.npy")
+    stats.update(
+        jobs=n_jobs,
+        terms=len(vectorizer.vocabulary_),
+        nnz=int(np.load(nnz_path, mmap_mode="r").shape[0]),
+        seconds=round(sum(stats[step]["seconds"] for step in ("scan", "fit", "write")), 2),
+        peak_mb=peak_memory_mb()
+    )
+    return stats
+
+
+# ============================================
+# BUILD COMMAND
+# ============================================
+# Usage (from backend/):
+#   python build_models.py                           # data/jobs_cleaned.csv -> models/bundle/
+#   python build_models.py feed.csv --chunk-rows 20000 --min-df 2 --max-features 500000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the TF-IDF job models from a jobs CSV, streaming")
+    parser.add_argument("csv", nargs="?", default=DATA_PATH, help="jobs CSV (jobs_cleaned.csv columns)")
+    parser.add_argument("-o", "--output", default=BUNDLE_DIR, help="bundle directory")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--min-df", type=int, help="drop terms found in fewer jobs")
+    parser.add_argument("--max-features", type=int, help="keep only the most frequent terms")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    if args.min_df is not None:
+        overrides["min_df"] = args.min_df
+    if args.max_features is not None:
+        overrides["max_features"] = args.max_features
+
+    stats = build_models(args.csv, args.output, args.chunk_rows, **overrides)
+
+    for step in ("scan", "fit", "write"):
+        print(f"⏱️ {step:<6} {stats[step]['seconds']:>8.2f}s   peak memory {stats[step]['peak_mb']} MB")
+    print(
+        f"✅ {stats['jobs']} jobs, {stats['terms']} terms, {stats['nnz']} non-zeros -> {args.output} "
+        f"in {stats['seconds']}s (peak memory {stats['peak_mb']} MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# ============================================
+# BOUNDED LRU + TTL CACHE
+# ============================================
+
+_MISSING = object()
+
+
+class _Pickled:
+    """A cached mutable value, stored pickled"""
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+
+def _freeze(value):
+    """(stored form, size in bytes; characters for str) of a value to cache"""
+    if isinstance(value, (bytes, str)):
+        return value, len(value)
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return _Pickled(data), len(data)
+
+
+def _thaw(stored):
+    return pickle.loads(stored.data) if isinstance(stored, _Pickled) else stored
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory cache.
+
+    Values other than bytes / str are stored pickled, so every get()
+    returns a fresh copy: callers may modify it without changing the
+    cached value (or what other requests get).
+
+    max_entries: least recently used entries are evicted beyond this
+    ttl_seconds: entries older than this are treated as missing
+        (None = never expire)
+    max_bytes: least recently used entries are evicted while the stored
+        values take more than this (None = no limit); a larger value
+        isn't cached
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+
+            if entry is not _MISSING:
+                stored_at, stored, size = entry
+                if self.ttl_seconds is None or time.monotonic() - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                else:
+                    del self._entries[key]
+                    self.bytes -= size
+                    entry = _MISSING
+
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+        # Unpickled outside the lock
+        return _thaw(stored)
+
+    def set(self, key, value):
+        stored, size = _freeze(value)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[2]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._entries[key] = (time.monotonic(), stored, size)
+            self.bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def content_hash(data):
+    """SHA-256 hex digest of bytes (cache key for uploaded files)"""
+    return hashlib.sha256(data).hexdigest()
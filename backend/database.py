@@ -0,0 +1,368 @@
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# ============================================
+# CONFIG
+# ============================================
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATABASE_PATH = os.environ.get(
+    "ONLYJOBS_DATABASE", os.path.join(BASE_DIR, "data", "onlyjobs.db")
+)
+POOL_SIZE = 4
+
+# Stored resumes older than this are not served and get deleted, as are
+# the oldest ones beyond MAX_STORED_RESUMES (checked every
+# RESUME_PRUNE_INTERVAL saves)
+STORED_RESUME_TTL = 30 * 24 * 60 * 60  # seconds
+MAX_STORED_RESUMES = 100_000
+RESUME_PRUNE_INTERVAL = 100
+
+# jobs_cleaned.csv column -> jobs table column
+JOB_COLUMNS = {
+    "Job Id": "job_id",
+    "Job Title": "job_title",
+    "Company": "company",
+    "location": "location",
+    "Work Type": "work_type",
+    "Experience Level": "experience_level",
+    "Salary Range": "salary_range",
+    "skills": "skills",
+    "combined_text": "combined_text"
+}
+
+# ============================================
+# SCHEMA
+# ============================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    row_index        INTEGER PRIMARY KEY,  -- position in df / tfidf_matrix
+    job_id           TEXT,
+    job_title        TEXT,
+    company          TEXT,
+    location         TEXT,
+    work_type        TEXT,
+    experience_level TEXT,
+    salary_range     TEXT,
+    skills           TEXT,
+    combined_text    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs (job_title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_work_type ON jobs (work_type COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_experience ON jobs (experience_level COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_job_id ON jobs (job_id);
+
+CREATE TABLE IF NOT EXISTS resumes (
+    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash     TEXT NOT NULL UNIQUE,  -- SHA-256 of the uploaded bytes (+ extension, parser version)
+    filename         TEXT,
+    resume_text      TEXT,
+    skills           TEXT,                  -- JSON list
+    experience_level TEXT,
+    created_at       REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ats_results (
+    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id        INTEGER NOT NULL REFERENCES resumes (id) ON DELETE CASCADE,
+    job_id           TEXT,                  -- NULL = sample job score
+    ats_score        REAL,
+    skill_match      REAL,
+    text_similarity  REAL,
+    experience_match REAL,
+    created_at       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ats_resume ON ats_results (resume_id);
+CREATE INDEX IF NOT EXISTS idx_resumes_created ON resumes (created_at);
+"""
+
+# ============================================
+# QUERIES
+# ============================================
+# Constant SQL text: sqlite3 keeps compiled statements per connection
+# (cached_statements), so each query is prepared once per connection.
+
+SQL_INSERT_JOB = """
+INSERT OR REPLACE INTO jobs (
+    row_index, job_id, job_title, company, location, work_type,
+    experience_level, salary_range, skills, combined_text
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_COUNT_JOBS = "SELECT COUNT(*) FROM jobs"
+SQL_INSERT_RESUME = """
+INSERT INTO resumes (content_hash, filename, resume_text, skills, experience_level, created_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (content_hash) DO UPDATE SET
+    filename = excluded.filename,
+    resume_text = excluded.resume_text,
+    skills = excluded.skills,
+    experience_level = excluded.experience_level,
+    created_at = excluded.created_at
+"""
+SQL_RESUME_ID = "SELECT id FROM resumes WHERE content_hash = ?"
+SQL_INSERT_ATS = """
+INSERT INTO ats_results (
+    resume_id, job_id, ats_score, skill_match, text_similarity, experience_match, created_at
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_RESUME = """
+SELECT id, filename, resume_text, skills, experience_level FROM resumes
+WHERE content_hash = ? AND created_at >= ?
+"""
+SQL_DELETE_EXPIRED_RESUMES = "DELETE FROM resumes WHERE created_at < ?"
+SQL_DELETE_OLDEST_RESUMES = """
+DELETE FROM resumes WHERE id IN (
+    SELECT id FROM resumes ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?
+)
+"""
+SQL_LATEST_ATS = """
+SELECT ats_score, skill_match, text_similarity, experience_match FROM ats_results
+WHERE resume_id = ? AND job_id IS ? ORDER BY id DESC LIMIT 1
+"""
+
+# jobs table column -> jobs_cleaned.csv column (API responses keep the CSV names)
+JOB_FIELDS = {column: name for name, column in JOB_COLUMNS.items()}
+
+# Filter name -> indexed column (case-insensitive equality)
+JOB_FILTERS = {
+    "job_title": "job_title",
+    "work_type": "work_type",
+    "experience_level": "experience_level"
+}
+
+
+def _sql_value(value):
+    """pandas / numpy cell -> SQLite value (NaN -> NULL)"""
+    if hasattr(value, "item"):
+        value = value.item()
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+# ============================================
+# DATABASE (CONNECTION POOL)
+# ============================================
+
+class Database:
+    def __init__(self, path=DATABASE_PATH, pool_size=POOL_SIZE,
+                 resume_ttl=STORED_RESUME_TTL, max_resumes=MAX_STORED_RESUMES):
+        """
+        resume_ttl: seconds a stored resume is served (None = forever)
+        max_resumes: stored resumes kept, newest first (None = no limit)
+        """
+        self.path = path
+        self.resume_ttl = resume_ttl
+        self.max_resumes = max_resumes
+        self._saves = 0
+        self._pool = queue.Queue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._job_count = None
+        self.pool_size = pool_size
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Pooled connection; commits on success, rolls back on error.
+        Up to pool_size connections are opened, then callers wait.
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._pool.get()
+
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.put(conn)
+
+    # ---------- jobs ----------
+
+    def import_jobs(self, df, batch_size=10_000):
+        """
+        Bulk inserts the jobs DataFrame (jobs_cleaned.csv columns).
+        row_index is the DataFrame position, i.e. the tfidf_matrix row.
+        """
+        columns = [c for c in JOB_COLUMNS if c in df.columns]
+        values = df[columns].astype(object).to_numpy()
+
+        def rows():
+            for row_index, row in enumerate(values):
+                record = dict(zip(columns, row))
+                yield (row_index,) + tuple(_sql_value(record.get(col)) for col in JOB_COLUMNS)
+
+        count = 0
+        with self.connection() as conn:
+            batch = []
+            for row in rows():
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    conn.executemany(SQL_INSERT_JOB, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                conn.executemany(SQL_INSERT_JOB, batch)
+                count += len(batch)
+
+        self._job_count = None
+        return count
+
+    def count_jobs(self, refresh=False):
+        """Rows in the jobs table (cached; refresh=True re-counts)"""
+        if self._job_count is None or refresh:
+            with self.connection() as conn:
+                self._job_count = conn.execute(SQL_COUNT_JOBS).fetchone()[0]
+        return self._job_count
+
+    def _job_where(self, filters):
+        clauses, params = [], []
+        for name, value in filters.items():
+            if value is None or value == "":
+                continue
+            column = JOB_FILTERS[name]
+            clauses.append(f"{column} = ? COLLATE NOCASE")
+            params.append(value)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, params
+
+    def query_jobs(self, limit=50, offset=0, fields=None, **filters):
+        """
+        Jobs matching the (indexed) filters job_title / work_type /
+        experience_level, ordered by row_index, as dicts keyed by the
+        jobs_cleaned.csv column names.
+        fields: CSV column names to return (default: all)
+        """
+        columns = [JOB_COLUMNS[f] for f in (fields or JOB_COLUMNS) if f in JOB_COLUMNS]
+        select = ", ".join(f'{column} AS "{JOB_FIELDS[column]}"' for column in columns)
+        where, params = self._job_where(filters)
+        sql = f"SELECT {select} FROM jobs{where} ORDER BY row_index LIMIT ? OFFSET ?"
+
+        with self.connection() as conn:
+            return [dict(row) for row in conn.execute(sql, params + [limit, offset])]
+
+    def job_rows(self, **filters):
+        """tfidf_matrix row indexes of the jobs matching the filters"""
+        where, params = self._job_where(filters)
+        with self.connection() as conn:
+            return [
+                row[0] for row in
+                conn.execute(f"SELECT row_index FROM jobs{where} ORDER BY row_index", params)
+            ]
+
+    # ---------- resumes + ATS results ----------
+
+    def save_resume(self, content_hash, filename, parsed_data, ats_result=None, job_id=None):
+        """Stores a parsed resume (once per content hash) + an ATS breakdown"""
+        now = time.time()
+        with self.connection() as conn:
+            conn.execute(SQL_INSERT_RESUME, (
+                content_hash,
+                filename,
+                parsed_data.get("resume_text", ""),
+                json.dumps(parsed_data.get("skills", [])),
+                parsed_data.get("experience_level"),
+                now
+            ))
+            resume_id = conn.execute(SQL_RESUME_ID, (content_hash,)).fetchone()[0]
+
+            if ats_result is not None:
+                conn.execute(SQL_INSERT_ATS, (
+                    resume_id,
+                    job_id,
+                    ats_result["ats_score"],
+                    ats_result["skill_match"],
+                    ats_result["text_similarity"],
+                    ats_result["experience_match"],
+                    now
+                ))
+
+        with self._lock:
+            self._saves += 1
+            prune = self._saves % RESUME_PRUNE_INTERVAL == 1
+        if prune:
+            self.prune_resumes()
+        return resume_id
+
+    def prune_resumes(self):
+        """Deletes expired resumes and the oldest beyond max_resumes (with their ATS results)"""
+        with self.connection() as conn:
+            deleted = 0
+            if self.resume_ttl is not None:
+                deleted += conn.execute(SQL_DELETE_EXPIRED_RESUMES, (time.time() - self.resume_ttl,)).rowcount
+            if self.max_resumes is not None:
+                deleted += conn.execute(SQL_DELETE_OLDEST_RESUMES, (self.max_resumes,)).rowcount
+        return deleted
+
+    def get_resume(self, content_hash, job_id=None):
+        """
+        (parsed_data, ats_result | None) for a stored resume, or None
+        """
+        with self.connection() as conn:
+            oldest = time.time() - self.resume_ttl if self.resume_ttl is not None else 0
+            row = conn.execute(SQL_GET_RESUME, (content_hash, oldest)).fetchone()
+            if row is None:
+                return None
+            ats = conn.execute(SQL_LATEST_ATS, (row["id"], job_id)).fetchone()
+
+        parsed_data = {
+            "resume_text": row["resume_text"],
+            "cleaned_text": row["resume_text"],
+            "skills": json.loads(row["skills"] or "[]"),
+            "experience_level": row["experience_level"]
+        }
+        return parsed_data, (dict(ats) if ats is not None else None)
+
+
+# ============================================
+# IMPORT COMMAND
+# ============================================
+# Usage (from backend/):
+#   python database.py import-jobs
+# Loads the jobs (bundle or CSV, as the app does) into the jobs table.
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["import-jobs"]:
+        print("Usage: python database.py import-jobs")
+        sys.exit(1)
+
+    from job_matching import load_models_and_data
+
+    df, _, _ = load_models_and_data()
+    db = Database()
+
+    start = time.perf_counter()
+    count = db.import_jobs(df)
+    print(f"✅ Imported {count} jobs into {db.path} in {time.perf_counter() - start:.2f}s")
@@ -1,141 +1,301 @@
 # interview_module.py
 
+import json
+import os
 import random
+import re
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from cache import LRUCache
+from metrics import timed
+from model_registry import registry
 
 # -------------------------------
-# INTERVIEW QUESTION BANK
+# CONFIG
 # -------------------------------
 
-INTERVIEW_QUESTIONS = {
-    "Frontend Web Developer": {
-        "technical": [
-            "Explain the difference between HTML, CSS, and JavaScript.",
-            "How does React improve performance using Virtual DOM?",
-            "What are responsive design principles?",
-            "Explain CSS Flexbox and Grid.",
-            "How do you optimize frontend performance?"
-        ],
-        "behavioral": [
-            "Describe a time you worked with a designer.",
-            "How do you handle tight deadlines?",
-            "How do you receive and implement feedback?"
-        ],
-        "situational": [
-            "How would you fix a website that loads slowly?",
-            "What would you do if a feature works on Chrome but not Firefox?"
-        ]
-    },
-
-    "Web Developer": {
-        "technical": [
-            "What is REST API?",
-            "Explain client-server architecture.",
-            "What is the difference between frontend and backend?"
-        ],
-        "behavioral": [
-            "Describe a challenging project you worked on.",
-            "How do you manage multiple tasks?"
-        ],
-        "situational": [
-            "How would you debug a broken web page?"
-        ]
-    },
-
-    "Social Media Manager": {
-        "technical": [
-            "How do you measure social media engagement?",
-            "What tools do you use for social media analytics?",
-            "Explain organic vs paid social media."
-        ],
-        "behavioral": [
-            "How do you handle negative comments?",
-            "How do you manage brand voice?"
-        ],
-        "situational": [
-            "How would you increase engagement for a declining page?"
-        ]
-    },
-
-    "Network Engineer": {
-        "technical": [
-            "Explain TCP/IP model.",
-            "What is the difference between LAN and WAN?",
-            "What are common wireless security protocols?",
-            "Explain subnetting."
-        ],
-        "behavioral": [
-            "Describe a major network failure you handled.",
-            "How do you prioritize issues?"
-        ],
-        "situational": [
-            "How would you troubleshoot slow network speed?"
-        ]
-    },
-
-    "Quality Control Manager": {
-        "technical": [
-            "What is ISO 9001?",
-            "Explain statistical process control.",
-            "How do you handle quality audits?"
-        ],
-        "behavioral": [
-            "How do you deal with production pressure?",
-            "Describe a quality issue you resolved."
-        ],
-        "situational": [
-            "What would you do if quality standards are not met?"
-        ]
-    }
-}
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INTERVIEW_QUESTIONS_PATH = os.path.join(BASE_DIR, "data", "interview_questions.json")
+
+CATEGORIES = ("technical", "behavioral", "situational")
+
+# Best role below this cosine similarity -> generic questions
+MIN_TITLE_SIMILARITY = 0.6
+
+# Resolved roles, per normalized title
+TITLE_CACHE_SIZE = 4096
 
 # -------------------------------
-# GENERIC FALLBACK QUESTIONS
+# TITLE NORMALIZATION
 # -------------------------------
+#
+# "Sr. Front-End Web Dev (Remote)" -> "frontend web developer": seniority
+# and employment words don't pick the question set, so they are dropped,
+# and common abbreviations are spelled out.
+
+_TOKEN = re.compile(r"[a-z0-9]+")
 
-GENERIC_QUESTIONS = {
-    "technical": [
-        "Explain your technical skill set.",
-        "What tools and technologies do you use?",
-        "How do you stay updated with industry trends?"
-    ],
-    "behavioral": [
-        "Tell me about yourself.",
-        "What are your strengths and weaknesses?",
-        "Describe a challenge you faced."
-    ],
-    "situational": [
-        "How do you handle pressure at work?",
-        "What would you do if you miss a deadline?"
-    ]
+IGNORED_WORDS = frozenset({
+    "senior", "sr", "junior", "jr", "principal", "staff", "associate",
+    "level", "mid", "intern", "trainee", "remote", "hybrid",
+    "contract", "temporary", "fulltime", "parttime", "i", "ii", "iii", "iv"
+})
+
+# Employment phrases dropped as a whole: "time", "part" and "full" alone
+# are kept ("Time Series Analyst", "Full Stack")
+IGNORED_PHRASES = frozenset({("full", "time"), ("part", "time")})
+
+ABBREVIATIONS = {
+    "dev": "developer", "devs": "developer", "developers": "developer",
+    "eng": "engineer", "engr": "engineer", "engineers": "engineer",
+    "mgr": "manager", "mngr": "manager", "mgmt": "management",
+    "admin": "administrator", "sysadmin": "system administrator",
+    "dba": "database administrator", "hr": "human resources",
+    "swe": "software engineer", "sde": "software development engineer",
+    "qa": "quality assurance", "qc": "quality control",
+    "ml": "machine learning", "sre": "site reliability engineer",
+    "js": "javascript", "fe": "frontend", "spec": "specialist",
+    "coord": "coordinator", "rep": "representative", "exec": "executive",
+    "asst": "assistant"
+}
+
+# Job-type words that don't pick a role on their own ("Manager" is not
+# closer to *Event Planner* than to any other role). A title made only
+# of these resolves to a role by exact name / alias only.
+GENERIC_TITLE_WORDS = frozenset({
+    "manager", "management", "engineer", "developer", "analyst", "specialist",
+    "coordinator", "administrator", "consultant", "designer", "director",
+    "lead", "head", "architect", "technician", "assistant", "officer",
+    "executive", "representative", "programmer", "supervisor", "agent",
+    "clerk", "expert", "professional", "worker", "operator", "tester"
+})
+
+# Two-word spellings of one word ("front end" / "front-end")
+COMPOUNDS = {
+    ("front", "end"): "frontend",
+    ("back", "end"): "backend",
+    ("full", "stack"): "fullstack"
 }
 
+
+def normalize_title(title):
+    """Lower-cased title words, seniority dropped and abbreviations spelled out"""
+    tokens = _TOKEN.findall((title or "").lower())
+
+    words = []
+    i = 0
+    while i < len(tokens):
+        pair = tuple(tokens[i:i + 2])
+        if pair in IGNORED_PHRASES:
+            i += 2
+            continue
+        if pair in COMPOUNDS:
+            words.append(COMPOUNDS[pair])
+            i += 2
+            continue
+        token = tokens[i]
+        i += 1
+        if token in IGNORED_WORDS:
+            continue
+        words.extend(ABBREVIATIONS.get(token, token).split())
+
+    return " ".join(words)
+
+
+def is_generic_title(normalized):
+    """True when every word of a normalized title is in GENERIC_TITLE_WORDS"""
+    return all(word in GENERIC_TITLE_WORDS for word in normalized.split())
+
+
+def title_features(normalized):
+    """Features of a normalized title: its words + character trigrams of each word"""
+    features = []
+    for word in normalized.split():
+        features.append("w:" + word)
+        padded = f"#{word}#"
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return features
+
+
 # -------------------------------
-# MAIN FUNCTION
+# TITLE INDEX
 # -------------------------------
 
-def get_interview_questions(job_title, role=None, max_per_category=3):
+class TitleIndex:
     """
-    Returns interview questions based on job title or role.
+    Inverted index of role titles (names + aliases) for fuzzy lookup.
+
+    Every title is a TF-IDF vector over title_features (L2-normalized).
+    The postings are the rows of a features x titles CSR matrix, so a
+    query only touches the titles that share one of its features.
+
+    titles: [(title text, role), ...]
+    """
+
+    def __init__(self, titles):
+        self.exact = {}
+        self.roles = []
+        documents = []
+        for text, role in titles:
+            normalized = normalize_title(text)
+            if not normalized:
+                continue
+            self.exact.setdefault(normalized, role)
+            self.roles.append(role)
+            documents.append(title_features(normalized))
+
+        self.features = {}
+        for features in documents:
+            for feature in features:
+                self.features.setdefault(feature, len(self.features))
+
+        # Document frequencies -> smoothed idf, like TfidfVectorizer
+        df = np.zeros(len(self.features))
+        for features in documents:
+            df[[self.features[feature] for feature in set(features)]] += 1
+        self.idf = np.log((1 + len(documents)) / (1 + df)) + 1.0
+
+        rows, columns, values = [], [], []
+        for title_id, features in enumerate(documents):
+            feature_rows, weights = self._weights(features)
+            rows.append(feature_rows)
+            columns.append(np.full(feature_rows.size, title_id, dtype=np.int32))
+            values.append(weights)
+        self.postings = csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(len(self.features), len(documents)), dtype=np.float32
+        )
+
+    def __len__(self):
+        return len(self.roles)
+
+    def _weights(self, features):
+        """(feature rows, L2-normalized tf-idf weights); unknown features are skipped"""
+        counts = Counter(self.features[feature] for feature in features if feature in self.features)
+        feature_rows = np.fromiter(counts, dtype=np.int32, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * self.idf[feature_rows]
+        norm = np.sqrt(np.dot(weights, weights))
+        return feature_rows, (weights / norm if norm else weights)
+
+    def lookup(self, normalized):
+        """(role, similarity) of the closest title, or (None, 0.0)"""
+        role = self.exact.get(normalized)
+        if role is not None:
+            return role, 1.0
+
+        feature_rows, weights = self._weights(title_features(normalized))
+        if not feature_rows.size:
+            return None, 0.0
+
+        scores = self.postings[feature_rows].T @ weights
+        best = int(scores.argmax())
+        return self.roles[best], float(scores[best])
+
+
+# -------------------------------
+# INTERVIEW QUESTION BANK
+# -------------------------------
+
+class InterviewBank:
+    """
+    Question sets per role, plus the generic fallback set.
+
+    roles: {role: {"aliases": [...], "technical": [...], "behavioral": [...], "situational": [...]}}
+    generic: {"technical": [...], "behavioral": [...], "situational": [...]}
+    """
+
+    def __init__(self, roles, generic, min_similarity=MIN_TITLE_SIMILARITY, cache_size=TITLE_CACHE_SIZE):
+        self.roles = roles
+        self.generic = generic
+        self.min_similarity = min_similarity
+        self.index = TitleIndex(
+            (title, role)
+            for role, entry in roles.items()
+            for title in [role] + list(entry.get("aliases", []))
+        )
+        self.cache = LRUCache(max_entries=cache_size)
+
+    def __len__(self):
+        return len(self.roles)
+
+    def resolve(self, job_title):
+        """Role of the bank that best matches a free-text job title, or None"""
+        normalized = normalize_title(job_title)
+        if not normalized:
+            return None
+
+        # "" marks a title already known to have no role
+        role = self.cache.get(normalized)
+        if role is None:
+            role, similarity = self.index.lookup(normalized)
+            # Fuzzy matches need a distinctive word ("Data Enginer", not "Engineer")
+            if similarity < self.min_similarity or (
+                    normalized not in self.index.exact and is_generic_title(normalized)):
+                role = ""
+            self.cache.set(normalized, role)
+        return role or None
+
+    def questions(self, role):
+        return self.roles[role] if role in self.roles else self.generic
+
+
+def load_interview_bank(path=INTERVIEW_QUESTIONS_PATH):
+    """
+    Builds an InterviewBank from a JSON file:
+    {"generic": {...}, "roles": {"Web Developer": {"aliases": [...], "technical": [...], ...}, ...}}
     """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
 
-    key = role if role in INTERVIEW_QUESTIONS else job_title
+    bank = InterviewBank(data["roles"], data["generic"])
+    print(f"✅ Interview bank loaded: {len(bank)} roles, {len(bank.index)} titles")
+    return bank
 
-    if key in INTERVIEW_QUESTIONS:
-        questions = INTERVIEW_QUESTIONS[key]
-    else:
-        questions = GENERIC_QUESTIONS
 
+registry.register("interview_bank", load_interview_bank)
+
+
+# -------------------------------
+# MAIN FUNCTIONS
+# -------------------------------
+
+def _sample(questions, max_per_category):
     return {
-        "technical": random.sample(
-            questions["technical"], 
-            min(max_per_category, len(questions["technical"]))
-        ),
-        "behavioral": random.sample(
-            questions["behavioral"], 
-            min(max_per_category, len(questions["behavioral"]))
-        ),
-        "situational": random.sample(
-            questions["situational"], 
-            min(max_per_category, len(questions["situational"]))
+        category: random.sample(
+            questions[category],
+            min(max_per_category, len(questions[category]))
         )
+        for category in CATEGORIES
+    }
+
+
+@timed("resolve_job_title")
+def resolve_job_title(job_title):
+    """Best matching role of the question bank for a job title (None -> generic questions)"""
+    return registry.get("interview_bank").resolve(job_title)
+
+
+def get_interview_questions(job_title, role=None, max_per_category=3):
+    """
+    Returns interview questions based on job title or role.
+    """
+    bank = registry.get("interview_bank")
+    matched = (bank.resolve(role) if role else None) or resolve_job_title(job_title)
+    return _sample(bank.questions(matched), max_per_category)
+
+
+def get_interview_questions_batch(job_titles, max_per_category=3):
+    """
+    Questions for many job titles in one call (e.g. every title of a
+    /job_recommendations result): {job title: questions}. Each distinct
+    title is resolved once.
+    """
+    bank = registry.get("interview_bank")
+    return {
+        title: _sample(bank.questions(resolve_job_title(title)), max_per_category)
+        for title in dict.fromkeys(job_titles)
     }
@@ -0,0 +1,535 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process servers, no cross-process lock
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import clone
+
+from ann_index import build_ann_index
+from job_matching import (
+    build_job_filter_index, build_job_records, build_skill_index, concat_job_frames,
+    job_skill_sets
+)
+from metrics import timed
+from text_analysis import clean_text
+
+# ============================================
+# INCREMENTAL JOB CORPUS UPDATES
+# ============================================
+#
+# The job models are one snapshot dict (build_job_snapshot) held by the
+# model registry. Updates never modify a snapshot: they build a new one
+# and swap it in with registry.replace(), so a request that already got
+# the old snapshot keeps a consistent view until it finishes.
+#
+#   add:     new jobs are transformed with the existing vocabulary and
+#            appended to the matrix and indexes (no re-fit)
+#   expire:  jobs are tombstoned (hidden everywhere, still stored)
+#   compact: tombstoned rows are dropped; with refit the TF-IDF
+#            vocabulary is fitted again on the whole corpus
+#
+# Every update (and compaction) is also appended to an update log
+# (UpdateLog). All worker processes replay it, so they serve the same
+# corpus, and a restart replays it on top of the job models on disk.
+
+COMPACT_DELETED_RATIO = 0.10   # compact once 10% of rows are tombstoned
+REFIT_ADDED_RATIO = 0.25       # refit once added rows reach 25% of the fitted ones
+COMPACTION_INTERVAL = 300      # seconds between background checks
+
+# Used to build combined_text for new jobs that don't have one
+TEXT_COLUMNS = ["Job Title", "skills", "Job Description"]
+
+
+# ============================================
+# SNAPSHOTS
+# ============================================
+
+def build_job_snapshot(df, vectorizer, matrix, ann_index=None, version=1, added_since_fit=0,
+                       sharded_search=None):
+    """
+    Job models + every index derived from them:
+    df, vectorizer, matrix, skill_index, job_records, filter_index,
+    ann_index, sharded_search, version (bumped on every change),
+    added_since_fit
+    """
+    return {
+        "df": df,
+        "vectorizer": vectorizer,
+        "matrix": matrix,
+        "skill_index": build_skill_index(df),
+        "job_records": build_job_records(df),
+        "filter_index": build_job_filter_index(df),
+        "ann_index": ann_index,
+        "sharded_search": sharded_search,
+        "version": version,
+        "added_since_fit": added_since_fit
+    }
+
+
+def corpus_stats(snapshot):
+    deleted = snapshot["filter_index"].deleted
+    n_deleted = int(deleted.sum()) if deleted is not None else 0
+    n_rows = snapshot["filter_index"].n_rows
+    return {
+        "version": snapshot["version"],
+        "rows": n_rows,
+        "live": n_rows - n_deleted,
+        "deleted": n_deleted,
+        "added_since_fit": snapshot["added_since_fit"]
+    }
+
+
+@timed("job_texts")
+def job_texts(df):
+    """Cleaned combined_text per job (the text the TF-IDF matrix is built from)"""
+    return [clean_text(text) if isinstance(text, str) else "" for text in df["combined_text"]]
+
+
+def _prepare_jobs(jobs, columns):
+    """New jobs (list of dicts or DataFrame) as a DataFrame with the corpus columns"""
+    df = jobs.copy() if isinstance(jobs, pd.DataFrame) else pd.DataFrame(list(jobs))
+
+    if "combined_text" not in df.columns:
+        parts = [df[col].fillna("").astype(str) for col in TEXT_COLUMNS if col in df.columns]
+        if not parts:
+            raise ValueError(f"New jobs need combined_text or one of: {', '.join(TEXT_COLUMNS)}")
+        df["combined_text"] = parts[0].str.cat(parts[1:], sep=" ") if len(parts) > 1 else parts[0]
+
+    return df.reindex(columns=columns)
+
+
+def _live_rows_with_ids(snapshot, job_ids):
+    """Live rows whose Job Id is in job_ids (compared as strings)"""
+    if "Job Id" not in snapshot["df"].columns:
+        return np.zeros(0, dtype=np.int64)
+
+    wanted = {str(job_id) for job_id in job_ids}
+    hit = np.array(snapshot["df"]["Job Id"].astype(str).isin(wanted), dtype=bool)
+    deleted = snapshot["filter_index"].deleted
+    if deleted is not None:
+        hit &= ~deleted
+    return np.flatnonzero(hit)
+
+
+def _tombstoned(snapshot, rows):
+    """New snapshot with ``rows`` marked deleted"""
+    filter_index = snapshot["filter_index"]
+    deleted = (
+        filter_index.deleted.copy() if filter_index.deleted is not None
+        else np.zeros(filter_index.n_rows, dtype=bool)
+    )
+    deleted[rows] = True
+    return dict(
+        snapshot,
+        filter_index=filter_index.with_deleted(deleted),
+        version=snapshot["version"] + 1
+    )
+
+
+def append_jobs(snapshot, jobs):
+    """
+    New snapshot with ``jobs`` appended. A live job with the same Job Id
+    as a new one is tombstoned (the new posting replaces it).
+
+    Returns: (snapshot, added, replaced)
+    """
+    if len(jobs) == 0:
+        return snapshot, 0, 0
+
+    df = snapshot["df"]
+    new_df = _prepare_jobs(jobs, df.columns)
+
+    replaced = np.zeros(0, dtype=np.int64)
+    if "Job Id" in new_df.columns:
+        replaced = _live_rows_with_ids(snapshot, new_df["Job Id"].dropna())
+
+    matrix = snapshot["matrix"]
+    first = matrix.shape[0]
+    vectors = snapshot["vectorizer"].transform(job_texts(new_df)).astype(matrix.dtype)
+
+    ann_index = snapshot["ann_index"]
+    if ann_index is not None:
+        ann_index = ann_index.extended(vectors, first)
+
+    sharded_search = snapshot["sharded_search"]
+    if sharded_search is not None:
+        # Views of the shared base + appended parts, no private copy
+        sharded_search = sharded_search.extended(vectors)
+        matrix = sharded_search.shared_matrix()
+    else:
+        matrix = sparse.vstack([matrix, vectors], format="csr")
+
+    df = concat_job_frames(df, new_df)
+    updated = dict(
+        snapshot,
+        df=df,
+        matrix=matrix,
+        skill_index=snapshot["skill_index"].extended(job_skill_sets(new_df)),
+        # Views of the new df's columns (no strings copied)
+        job_records=build_job_records(df),
+        filter_index=snapshot["filter_index"].extended(new_df),
+        ann_index=ann_index,
+        sharded_search=sharded_search,
+        version=snapshot["version"] + 1,
+        added_since_fit=snapshot["added_since_fit"] + len(new_df)
+    )
+    if replaced.size:
+        updated = _tombstoned(updated, replaced)
+        updated["version"] = snapshot["version"] + 1
+
+    return updated, len(new_df), int(replaced.size)
+
+
+def expire_jobs(snapshot, job_ids):
+    """
+    New snapshot with the live jobs whose Job Id is in job_ids tombstoned.
+
+    Returns: (snapshot, expired)
+    """
+    rows = _live_rows_with_ids(snapshot, job_ids)
+    if rows.size == 0:
+        return snapshot, 0
+    return _tombstoned(snapshot, rows), int(rows.size)
+
+
+def compact_snapshot(snapshot, refit=False):
+    """
+    New snapshot without the tombstoned rows. refit=True also fits the
+    vectorizer again on the whole corpus (new vocabulary + idf) and
+    rebuilds the ANN index.
+    """
+    deleted = snapshot["filter_index"].deleted
+    df, matrix = snapshot["df"], snapshot["matrix"]
+    if deleted is not None:
+        live = ~deleted
+        df = df[live].reset_index(drop=True)
+        matrix = matrix[np.flatnonzero(live)]
+
+    vectorizer = snapshot["vectorizer"]
+    ann_index = snapshot["ann_index"]
+
+    if refit:
+        vectorizer = clone(vectorizer)
+        matrix = vectorizer.fit_transform(job_texts(df))
+        if ann_index is not None:
+            ann_index = build_ann_index(
+                matrix, n_components=ann_index.components.shape[0], n_clusters=ann_index.n_clusters
+            )
+    elif ann_index is not None and deleted is not None:
+        ann_index = ann_index.compacted(deleted)
+
+    sharded_search = snapshot["sharded_search"]
+    if sharded_search is not None:
+        sharded_search = sharded_search.rebuilt(matrix)
+        matrix = sharded_search.shared_matrix()
+
+    return build_job_snapshot(
+        df,
+        vectorizer,
+        matrix,
+        ann_index=ann_index,
+        version=snapshot["version"] + 1,
+        added_since_fit=0 if refit else snapshot["added_since_fit"],
+        sharded_search=sharded_search
+    )
+
+
+def needs_compaction(snapshot):
+    """(compact, refit) according to COMPACT_DELETED_RATIO / REFIT_ADDED_RATIO"""
+    stats = corpus_stats(snapshot)
+    fitted = stats["rows"] - stats["added_since_fit"]
+    compact = stats["deleted"] > 0 and stats["deleted"] >= COMPACT_DELETED_RATIO * stats["rows"]
+    refit = stats["added_since_fit"] > 0 and stats["added_since_fit"] >= REFIT_ADDED_RATIO * max(fitted, 1)
+    return compact or refit, refit
+
+
+def apply_update(snapshot, entry):
+    """
+    New snapshot with one update log entry applied:
+        {"op": "update", "jobs": [...], "expire": [...]}
+        {"op": "compact", "refit": bool}
+    Returns: (snapshot, counts)
+    """
+    if entry["op"] == "update":
+        snapshot, expired = expire_jobs(snapshot, entry.get("expire") or [])
+        snapshot, added, replaced = append_jobs(snapshot, entry.get("jobs") or [])
+        return snapshot, {"expired": expired, "added": added, "replaced": replaced}
+    if entry["op"] == "compact":
+        return compact_snapshot(snapshot, refit=bool(entry.get("refit"))), {}
+    raise ValueError(f"Unknown job update: {entry['op']}")
+
+
+def base_fingerprint(snapshot):
+    """Identifies the job models an update log was written against"""
+    idf = getattr(snapshot["vectorizer"], "idf_", np.zeros(0))
+    return {
+        "rows": int(snapshot["matrix"].shape[0]),
+        "features": int(snapshot["matrix"].shape[1]),
+        "idf": hashlib.sha256(np.ascontiguousarray(idf).tobytes()).hexdigest()[:16]
+    }
+
+
+def _job_records_json(jobs):
+    """New jobs (list of dicts or DataFrame) as JSON-serializable dicts"""
+    if isinstance(jobs, pd.DataFrame):
+        return jobs.astype(object).where(jobs.notna(), None).to_dict("records")
+    return list(jobs or [])
+
+
+# ============================================
+# UPDATE LOG (SHARED BY WORKERS, KEPT ACROSS RESTARTS)
+# ============================================
+
+class UpdateLog:
+    """
+    Append-only JSON lines file of corpus updates (see apply_update).
+    The first line is {"op": "base", ...base_fingerprint()}: the job
+    models the updates apply to. Writers hold an exclusive file lock, so
+    the processes sharing the file agree on one order.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    @contextmanager
+    def locked(self):
+        """The log file, opened for appending and locked (not re-entrant)"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def read(self, offset):
+        """(entries after byte ``offset``, new offset); a partly written last line is left for later"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+        end = data.rfind(b"\n") + 1
+        entries = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        return entries, offset + end
+
+    @staticmethod
+    def append(f, entry):
+        f.write((json.dumps(entry, default=str) + "\n").encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+    def set_aside(self):
+        """Renames the log (e.g. it belongs to other job models); returns the new path"""
+        stale = f"{self.path}.stale-{int(time.time())}"
+        os.replace(self.path, stale)
+        return stale
+
+
+# ============================================
+# UPDATER (ONE WRITER, BACKGROUND COMPACTION)
+# ============================================
+
+class JobCorpus:
+    """
+    Applies updates to the registry entry ``name`` one at a time and
+    compacts it in the background. Readers keep using registry.get().
+
+    log_path: update log shared by every worker process (None = updates
+        stay in this process). Call replayed() on freshly loaded job
+        models and sync() before serving from them.
+    """
+
+    def __init__(self, registry, name="jobs", interval=COMPACTION_INTERVAL, log_path=None):
+        self.registry = registry
+        self.name = name
+        self.interval = interval
+        self.log = UpdateLog(log_path) if log_path else None
+        self._offset = 0            # bytes of the log applied to the registry entry
+        # Re-entrant: the first registry.get() in _commit runs the loader,
+        # which replays the log
+        self._lock = threading.RLock()
+        self._compactor = None
+        self._listeners = []
+        self.compactions = 0
+        self.last_compaction = None
+        self.replayed_updates = 0
+
+    def _log_locked(self):
+        return self.log.locked() if self.log is not None else nullcontext()
+
+    def _catch_up(self, snapshot):
+        """snapshot with the log entries written by other processes applied"""
+        if self.log is None:
+            return snapshot
+        entries, self._offset = self.log.read(self._offset)
+        for entry in entries:
+            if entry["op"] == "base":
+                continue
+            try:
+                snapshot, _ = apply_update(snapshot, entry)
+            except Exception as e:
+                # Skipped the same way by every process
+                print(f"⚠️ Warning: Could not replay job update ({entry['op']}): {e}")
+            self.replayed_updates += 1
+        return snapshot
+
+    def _publish(self, snapshot):
+        self.registry.replace(self.name, snapshot)
+        for listener in self._listeners:
+            listener(snapshot)
+
+    def replayed(self, snapshot):
+        """
+        Freshly loaded job models with the update log applied. A log
+        written for other job models (e.g. rebuilt since) is set aside.
+        """
+        if self.log is None:
+            return snapshot
+        base = dict(base_fingerprint(snapshot), op="base")
+        with self._lock:
+            with self.log.locked():
+                entries, _ = self.log.read(0)
+                if entries and entries[0] != base:
+                    stale = self.log.set_aside()
+                    print(f"⚠️ Warning: Job update log doesn't match the job models, moved to {stale}")
+
+            with self.log.locked() as f:
+                entries, _ = self.log.read(0)
+                if not entries:
+                    self.log.append(f, base)
+                self._offset = 0
+                start = time.perf_counter()
+                snapshot = self._catch_up(snapshot)
+            if self.replayed_updates:
+                print(f"✅ Replayed {self.replayed_updates} job updates in {time.perf_counter() - start:.2f}s")
+        return snapshot
+
+    def sync(self):
+        """Applies updates other processes logged since the last call (cheap if none)"""
+        if self.log is None or not self.registry.is_loaded(self.name) or self.log.size() == self._offset:
+            return
+        with self._lock:
+            snapshot = self.registry.get(self.name)
+            with self.log.locked():
+                updated = self._catch_up(snapshot)
+            if updated is not snapshot:
+                self._publish(updated)
+
+    def _commit(self, make_entry):
+        """
+        Catches up with the log, then applies + logs make_entry(snapshot)
+        (skipped if it returns None). Returns (snapshot, entry, counts).
+        """
+        with self._lock:
+            snapshot = self.registry.get(self.name)
+            with self._log_locked() as f:
+                current = self._catch_up(snapshot)
+                entry = make_entry(current)
+                counts = {}
+                if entry is not None:
+                    # Applied before it is logged: a rejected update is never replayed
+                    current, counts = apply_update(current, entry)
+                    if f is not None:
+                        self.log.append(f, entry)
+                        self._offset = self.log.size()
+            if current is not snapshot:
+                self._publish(current)
+        self._start_compactor()
+        return current, entry, counts
+
+    def on_update(self, listener):
+        """Calls listener(snapshot) after every swap (e.g. to clear caches)"""
+        self._listeners.append(listener)
+
+    def update(self, jobs=None, expire=None):
+        """
+        Expires the ``expire`` Job Ids and appends ``jobs`` in one swap
+        (readers see both changes or neither).
+        """
+        entry = {"op": "update", "jobs": _job_records_json(jobs), "expire": list(expire or [])}
+        snapshot, _, counts = self._commit(lambda snapshot: entry)
+        return dict(corpus_stats(snapshot), **counts)
+
+    def add(self, jobs):
+        return self.update(jobs=jobs)
+
+    def expire(self, job_ids):
+        return self.update(expire=job_ids)
+
+    def compact(self, refit=False, only_if_needed=False):
+        """
+        Compacts now (see compact_snapshot). only_if_needed: skip unless
+        needs_compaction() says so, judged after catching up with the log
+        (another worker may have compacted already)
+        """
+        def make_entry(snapshot):
+            if not only_if_needed:
+                return {"op": "compact", "refit": bool(refit)}
+            needed, needs_refit = needs_compaction(snapshot)
+            return {"op": "compact", "refit": needs_refit} if needed else None
+
+        start = time.perf_counter()
+        snapshot, entry, _ = self._commit(make_entry)
+        if entry is not None:
+            self.compactions += 1
+            self.last_compaction = {
+                "at": time.time(),
+                "refit": entry["refit"],
+                "seconds": round(time.perf_counter() - start, 3)
+            }
+            print(f"✅ Job corpus compacted (refit={entry['refit']}) in {self.last_compaction['seconds']}s")
+        return corpus_stats(snapshot)
+
+    def maybe_compact(self):
+        if needs_compaction(self.registry.get(self.name))[0]:
+            self.compact(only_if_needed=True)
+
+    def _start_compactor(self):
+        # Started on the first update, so idle servers run no extra thread
+        if self._compactor is not None:
+            return
+        with self._lock:
+            if self._compactor is None:
+                self._compactor = threading.Thread(
+                    target=self._compact_loop, name="job-compactor", daemon=True
+                )
+                self._compactor.start()
+
+    def _compact_loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.maybe_compact()
+            except Exception as e:
+                print(f"⚠️ Warning: Job corpus compaction failed: {e}")
+
+    def stats(self):
+        stats = {
+            "compactions": self.compactions,
+            "last_compaction": self.last_compaction,
+            "update_log": self.log.path if self.log is not None else None,
+            "replayed_updates": self.replayed_updates
+        }
+        if self.registry.is_loaded(self.name):
+            stats.update(corpus_stats(self.registry.get(self.name)))
+        return stats
@@ -2,7 +2,15 @@ import os
 import pandas as pd
 import pickle
 import re
-from sklearn.metrics.pairwise import cosine_similarity
+from collections import defaultdict
+import numpy as np
+from pandas.api.types import union_categoricals
+from scipy import sparse
+
+from ats_scoring import normalize_skills
+from metrics import timed
+from model_bundle import CATEGORICAL_RATIO, bundle_exists, load_bundle
+from text_analysis import analyze_text, as_document
 
 # ============================================
 # CONFIG
@@ -13,16 +21,37 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, "data", "jobs_cleaned.csv")
 VECTORIZER_PATH = os.path.join(BASE_DIR, "models", "tfidf_vectorizer.pkl")
 MATRIX_PATH = os.path.join(BASE_DIR, "models", "tfidf_matrix.pkl")
+ANN_INDEX_PATH = os.path.join(BASE_DIR, "models", "ann_index.npz")
+BUNDLE_DIR = os.path.join(BASE_DIR, "models", "bundle")
+
+# recommend_jobs_batch: queries scored per dense (jobs x queries) block
+BATCH_QUERY_BLOCK = 32
 
 # ============================================
 # LOAD DATA + MODELS (ONCE)
 # ============================================
 
 def load_models_and_data():
-    df = pd.read_csv(DATA_PATH)
+    """
+    Loads (df, tfidf_vectorizer, tfidf_matrix).
+    Uses the memory-mapped bundle (python model_bundle.py) when present,
+    otherwise the CSV + pickles.
+    """
+    if bundle_exists(BUNDLE_DIR):
+        df, tfidf_vectorizer, tfidf_matrix = load_bundle(BUNDLE_DIR)
+        return compact_job_frame(df), tfidf_vectorizer, tfidf_matrix
+
+    return load_pickled_models_and_data()
+
+
+def load_pickled_models_and_data():
+    # Categorical columns are built while parsing, so the CSV's
+    # per-cell strings never all exist at once
+    df = pd.read_csv(DATA_PATH, dtype={col: "category" for col in CATEGORY_COLUMNS})
 
     if "combined_text" not in df.columns:
         raise ValueError("combined_text column missing in dataset")
+    df = compact_job_frame(df)
 
     with open(VECTORIZER_PATH, "rb") as f:
         tfidf_vectorizer = pickle.load(f)
@@ -34,40 +63,695 @@ def load_models_and_data():
 
 
 # ============================================
-# CLEAN USER INPUT
+# COMPACT JOB TABLE
+# ============================================
+
+# Always stored as categoricals (few distinct values, on every row)
+CATEGORY_COLUMNS = ["Work Type", "Experience Level", "location", "Company"]
+
+# Long text, only needed to (re)build the TF-IDF matrix and for ATS
+# text similarity without precomputed vectors. Never copied into
+# recommend_jobs results, and left out of job pages unless requested.
+LONG_TEXT_COLUMNS = ["combined_text", "Job Description"]
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def compact_job_frame(df):
+    """
+    The jobs DataFrame with less memory per row: CATEGORY_COLUMNS and
+    other short text columns with few distinct values (see
+    CATEGORICAL_RATIO) become categoricals, and equal strings in the
+    remaining text columns share one object (read_csv creates one per
+    cell). Values are unchanged.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or not _is_text(series):
+            columns[col] = series
+            continue
+
+        codes, uniques = pd.factorize(series)
+        categorical = col in CATEGORY_COLUMNS or (
+            col not in LONG_TEXT_COLUMNS and len(uniques) < CATEGORICAL_RATIO * max(1, len(series))
+        )
+        if categorical:
+            values = pd.Categorical.from_codes(codes, categories=uniques)
+            columns[col] = pd.Series(values, index=series.index)
+        else:
+            # code -1 (missing) picks the trailing NaN
+            values = np.append(np.asarray(uniques, dtype=object), np.nan)[codes]
+            columns[col] = pd.Series(values, index=series.index, dtype=series.dtype)
+
+    return pd.DataFrame(columns, copy=False)
+
+
+def concat_job_frames(df, new_df):
+    """df with the rows of new_df (same columns) appended, still compact"""
+    new_df = compact_job_frame(new_df)
+    columns = {}
+    for col in df.columns:
+        old, new = df[col], new_df[col]
+        if isinstance(old.dtype, pd.CategoricalDtype) and isinstance(new.dtype, pd.CategoricalDtype):
+            columns[col] = pd.Series(
+                union_categoricals([old, new], ignore_order=True), copy=False
+            )
+        else:
+            columns[col] = pd.concat([old, new], ignore_index=True)
+    return pd.DataFrame(columns, copy=False)
+
+
+# ============================================
+# SKILL INDEX (BUILT ONCE AT LOAD TIME)
+# ============================================
+
+class SkillIndex:
+    """
+    Normalized skill set per job + inverted skill -> job rows index.
+
+    job_skills[row]: frozenset of the job's skills
+    postings[skill]: sorted int32 array of job rows requiring that skill
+    """
+
+    def __init__(self, job_skills):
+        self.job_skills = job_skills
+
+        postings = defaultdict(list)
+        for row, skills in enumerate(job_skills):
+            for skill in skills:
+                if skill:
+                    postings[skill].append(row)
+
+        self.postings = {
+            skill: np.asarray(rows, dtype=np.int32)
+            for skill, rows in postings.items()
+        }
+
+    def skill_sets(self, rows):
+        return [self.job_skills[row] for row in rows]
+
+    def extended(self, job_skills):
+        """
+        New SkillIndex with job_skills appended as the next rows.
+        Only the postings of the added skills are copied; self is unchanged.
+        """
+        first = len(self.job_skills)
+        added = defaultdict(list)
+        for row, skills in enumerate(job_skills, start=first):
+            for skill in skills:
+                if skill:
+                    added[skill].append(row)
+
+        index = SkillIndex.__new__(SkillIndex)
+        index.job_skills = self.job_skills + list(job_skills)
+        index.postings = dict(self.postings)
+        for skill, rows in added.items():
+            rows = np.asarray(rows, dtype=np.int32)
+            if skill in self.postings:
+                rows = np.concatenate([self.postings[skill], rows])
+            index.postings[skill] = rows
+        return index
+
+    def shared_skills(self, resume_skills, row):
+        return normalize_skills(resume_skills) & self.job_skills[row]
+
+    def candidates(self, skills, k=1, deleted=None):
+        """
+        Jobs (over the whole corpus) sharing >= k skills with ``skills``,
+        most shared first (ties in row order).
+
+        skills: str (comma-separated) or iterable of str
+        deleted: optional bool mask of tombstoned rows, never returned
+        Returns: (rows, shared_counts) int arrays
+        """
+        lists = [
+            self.postings[skill]
+            for skill in normalize_skills(skills)
+            if skill in self.postings
+        ]
+        if not lists:
+            empty = np.zeros(0, dtype=np.int32)
+            return empty, empty
+
+        rows, counts = np.unique(np.concatenate(lists), return_counts=True)
+        keep = counts >= k
+        if deleted is not None:
+            keep &= ~deleted[rows]
+        rows, counts = rows[keep], counts[keep]
+
+        order = np.argsort(-counts, kind="stable")
+        return rows[order], counts[order]
+
+
+def job_skill_sets(df):
+    """
+    Normalized skill set per row of the comma-separated ``skills`` column.
+    Rows with the same skills string share one frozenset, and every
+    skill name is stored once (interned) across all sets.
+    """
+    if "skills" not in df.columns:
+        return [frozenset()] * len(df)
+
+    codes, uniques = pd.factorize(df["skills"])
+    names = {}
+    sets = [
+        frozenset(names.setdefault(skill, skill) for skill in normalize_skills(skills))
+        if isinstance(skills, str) and skills.strip() else frozenset()
+        for skills in uniques
+    ]
+    sets.append(frozenset())  # code -1 (missing)
+    return [sets[code] for code in codes.tolist()]
+
+
+def build_skill_index(df):
+    """
+    Builds the SkillIndex from the comma-separated ``skills`` column
+    """
+    return SkillIndex(job_skill_sets(df))
+
+
+# ============================================
+# FILTER INDEX (BUILT ONCE AT LOAD TIME)
+# ============================================
+
+# Filter name -> categorical column
+FILTER_COLUMNS = {
+    "work_type": "Work Type",
+    "location": "location",
+    "experience_level": "Experience Level"
+}
+SALARY_COLUMN = "Salary Range"
+
+_SALARY_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([km]?)", re.IGNORECASE)
+_SALARY_UNITS = {"": 1, "k": 1_000, "m": 1_000_000}
+
+
+def parse_salary_range(text):
+    """'$59K-$99K' -> (59000.0, 99000.0); (nan, nan) if not a salary"""
+    if not isinstance(text, str):
+        return np.nan, np.nan
+
+    values = [
+        float(number) * _SALARY_UNITS[unit.lower()]
+        for number, unit in _SALARY_PATTERN.findall(text)
+    ]
+    if not values:
+        return np.nan, np.nan
+    return min(values), max(values)
+
+
+def _filter_key(value):
+    return str(value).strip().lower()
+
+
+def _category_codes(series, categories):
+    """
+    int32 category code per value of series (-1 = missing). New values
+    are added to ``categories`` ({normalized value: code}).
+    """
+    # Normalize the distinct values only, then remap the raw codes
+    raw_codes, raw_values = pd.factorize(series)
+    remap = np.empty(len(raw_values) + 1, dtype=np.int32)
+    remap[-1] = -1
+    for i, value in enumerate(raw_values):
+        remap[i] = categories.setdefault(_filter_key(value), len(categories))
+    return remap[raw_codes]
+
+
+def _salary_bounds(df):
+    """(salary_min, salary_max) float arrays, Salary Range parsed once per distinct value"""
+    if SALARY_COLUMN not in df.columns:
+        return np.full(len(df), np.nan), np.full(len(df), np.nan)
+
+    row_codes, uniques = pd.factorize(df[SALARY_COLUMN])
+    parsed = np.array([parse_salary_range(v) for v in uniques] + [(np.nan, np.nan)])
+    # code -1 (missing) picks the trailing (nan, nan) row
+    return parsed[row_codes, 0], parsed[row_codes, 1]
+
+
+class JobFilterIndex:
+    """
+    Precomputed categorical indexes for the job filters.
+
+    codes[name]: int32 category code per row (-1 = missing) of the
+        FILTER_COLUMNS[name] column
+    categories[name]: {value (lowercased + stripped): code}
+    postings[name][code]: sorted int64 rows with that category
+    salary_min / salary_max: float arrays parsed from Salary Range
+        (NaN = unknown)
+    deleted: bool array of tombstoned rows (None = no deleted rows);
+        deleted rows never match a filter
+    """
+
+    def __init__(self, n_rows, codes, categories, salary_min, salary_max, postings=None,
+                 deleted=None):
+        self.n_rows = n_rows
+        self.codes = codes
+        self.categories = categories
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.deleted = deleted
+        self.live_rows = None if deleted is None else np.flatnonzero(~deleted)
+
+        if postings is None:
+            postings = {}
+            for name, row_codes in codes.items():
+                order = np.argsort(row_codes, kind="stable")
+                bounds = np.searchsorted(row_codes[order], np.arange(len(categories[name]) + 1))
+                postings[name] = [
+                    order[bounds[code]:bounds[code + 1]].astype(np.int64)
+                    for code in range(len(categories[name]))
+                ]
+        self.postings = postings
+
+    def _wanted_codes(self, name, values):
+        if isinstance(values, str):
+            values = [values]
+        categories = self.categories[name]
+        return sorted({categories[_filter_key(v)] for v in values if _filter_key(v) in categories})
+
+    def rows(self, salary_min=None, salary_max=None, **filters):
+        """
+        Sorted live rows matching every given filter, or None if no
+        filter is set and no row is deleted (= all rows).
+
+        filters: work_type / location / experience_level, a value or a
+            list of values (any of them matches)
+        salary_min / salary_max: keep jobs whose salary range overlaps
+            [salary_min, salary_max]; jobs without a salary are dropped
+        """
+        wanted = {}
+        for name, values in filters.items():
+            if name not in FILTER_COLUMNS:
+                raise ValueError(f"Unknown filter: {name}")
+            if values is None or values == "" or values == []:
+                continue
+            wanted[name] = self._wanted_codes(name, values)
+
+        if wanted:
+            # Start from the smallest category subset, then check the
+            # other filters on the per-row codes of those rows only
+            sizes = {
+                name: sum(len(self.postings[name][code]) for code in codes)
+                for name, codes in wanted.items()
+            }
+            driver = min(sizes, key=sizes.get)
+            lists = [self.postings[driver][code] for code in wanted[driver]]
+            if not lists:
+                return np.zeros(0, dtype=np.int64)
+            rows = lists[0] if len(lists) == 1 else np.sort(np.concatenate(lists))
+
+            for name, codes in wanted.items():
+                if name != driver:
+                    rows = rows[np.isin(self.codes[name][rows], codes)]
+            if self.deleted is not None:
+                rows = rows[~self.deleted[rows]]
+        elif salary_min is None and salary_max is None:
+            return self.live_rows
+        elif self.live_rows is not None:
+            rows = self.live_rows
+        else:
+            rows = np.arange(self.n_rows, dtype=np.int64)
+
+        if salary_min is not None:
+            rows = rows[self.salary_max[rows] >= salary_min]
+        if salary_max is not None:
+            rows = rows[self.salary_min[rows] <= salary_max]
+        return rows
+
+    def mask(self, **filters):
+        """Boolean mask over all rows for the filters, or None if none is set"""
+        rows = self.rows(**filters)
+        if rows is None:
+            return None
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def extended(self, df):
+        """
+        New JobFilterIndex with the jobs of df appended as the next rows.
+        Only the postings of categories that gained rows are copied.
+        """
+        first = self.n_rows
+        codes, categories, postings = {}, {}, {}
+        for name, column in FILTER_COLUMNS.items():
+            categories[name] = dict(self.categories[name])
+            if column in df.columns:
+                new_codes = _category_codes(df[column], categories[name])
+            else:
+                new_codes = np.full(len(df), -1, dtype=np.int32)
+            codes[name] = np.concatenate([self.codes[name], new_codes])
+
+            postings[name] = list(self.postings[name])
+            postings[name] += [np.zeros(0, dtype=np.int64)] * (len(categories[name]) - len(postings[name]))
+            for code in np.unique(new_codes[new_codes >= 0]):
+                rows = first + np.flatnonzero(new_codes == code)
+                postings[name][code] = np.concatenate([postings[name][code], rows])
+
+        salary_min, salary_max = _salary_bounds(df)
+        deleted = None
+        if self.deleted is not None:
+            deleted = np.concatenate([self.deleted, np.zeros(len(df), dtype=bool)])
+
+        return JobFilterIndex(
+            first + len(df),
+            codes,
+            categories,
+            np.concatenate([self.salary_min, salary_min]),
+            np.concatenate([self.salary_max, salary_max]),
+            postings=postings,
+            deleted=deleted
+        )
+
+    def with_deleted(self, deleted):
+        """Same index with a new tombstone mask (None or bool array)"""
+        return JobFilterIndex(
+            self.n_rows, self.codes, self.categories, self.salary_min, self.salary_max,
+            postings=self.postings, deleted=deleted
+        )
+
+
+def build_job_filter_index(df):
+    """
+    Builds the JobFilterIndex: one factorize per filter column; values
+    are normalized and Salary Range parsed once per distinct value.
+    """
+    codes, categories = {}, {}
+    for name, column in FILTER_COLUMNS.items():
+        categories[name] = {}
+        if column in df.columns:
+            codes[name] = _category_codes(df[column], categories[name])
+        else:
+            codes[name] = np.full(len(df), -1, dtype=np.int32)
+
+    salary_min, salary_max = _salary_bounds(df)
+    return JobFilterIndex(len(df), codes, categories, salary_min, salary_max)
+
+
+# ============================================
+# JOB RECORD STORE (BUILT ONCE AT LOAD TIME)
 # ============================================
 
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    return text
+class CategoryColumn:
+    """
+    Record store column of a categorical: int codes into the distinct
+    values. column[row] / column[rows] read like an object array
+    (missing = NaN).
+    """
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        # Trailing NaN: code -1 (missing) reads as NaN
+        self.categories = np.append(np.asarray(categories, dtype=object), np.nan)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, rows):
+        return self.categories[self.codes[rows]]
+
+
+def build_job_records(df):
+    """
+    Column store of the jobs table: {column: array}.
+    Lets recommend_jobs / browse_jobs read single cells without going
+    through pandas iloc. Categorical columns are CategoryColumns and
+    numeric ones numpy arrays, so the strings are never duplicated.
+    """
+    records = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            records[col] = CategoryColumn(series.cat.codes.to_numpy(), series.cat.categories)
+        elif _is_text(series):
+            records[col] = series.to_numpy(dtype=object)
+        else:
+            records[col] = series.to_numpy()
+    return records
+
+
+class JobRecord:
+    """
+    One recommend_jobs result: a row of the record store plus its
+    similarity score. Reads like a dict (get, [], in, keys); cells are
+    looked up when accessed, so no column (long text included) is
+    copied per result.
+    """
+
+    __slots__ = ("job_records", "row_index", "similarity_score")
+
+    def __init__(self, job_records, row_index, similarity_score):
+        self.job_records = job_records
+        self.row_index = row_index
+        self.similarity_score = similarity_score
+
+    def get(self, column, default=None):
+        if column == "row_index":
+            return self.row_index
+        if column == "similarity_score":
+            return self.similarity_score
+        values = self.job_records.get(column)
+        if values is None:
+            return default
+        value = values[self.row_index]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __getitem__(self, column):
+        if column not in self:
+            raise KeyError(column)
+        return self.get(column)
+
+    def __contains__(self, column):
+        return column in ("row_index", "similarity_score") or column in self.job_records
+
+    def keys(self):
+        return list(self.job_records) + ["similarity_score", "row_index"]
+
+    def to_dict(self):
+        return {column: self.get(column) for column in self.keys()}
+
+    def __repr__(self):
+        return f"JobRecord(row_index={self.row_index}, similarity_score={self.similarity_score})"
+
+
+def json_value(value):
+    """A job cell as a JSON value (NaN -> None, numpy scalars -> Python)"""
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def browse_jobs(job_records, filter_index, limit=50, offset=0, after=None, fields=None,
+                **filters):
+    """
+    One page of the jobs matching the filters (see JobFilterIndex.rows),
+    in corpus order.
+
+    after: cursor; only rows after this row_index are returned
+    offset: rows skipped (after the cursor, if any)
+    fields: columns to return (default: all but LONG_TEXT_COLUMNS)
+
+    Returns: (jobs, total matching, next cursor or None)
+    """
+    # Negative positions would wrap around to the end of the table
+    if offset < 0 or (after is not None and after < 0):
+        raise ValueError("offset and cursor must not be negative")
+
+    rows = filter_index.rows(**filters)
+    total = filter_index.n_rows if rows is None else int(rows.shape[0])
+
+    if rows is None:
+        start = (0 if after is None else after + 1) + offset
+        page = np.arange(start, min(start + limit, total), dtype=np.int64)
+    else:
+        start = (0 if after is None else int(np.searchsorted(rows, after, side="right"))) + offset
+        page = rows[start:start + limit]
+
+    columns = fields or [col for col in job_records if col not in LONG_TEXT_COLUMNS]
+    jobs = [
+        {col: json_value(job_records[col][idx]) for col in columns}
+        for idx in page
+    ]
+    next_cursor = int(page[-1]) if len(page) == limit and start + limit < total else None
+    return jobs, total, next_cursor
 
 
 # ============================================
 # JOB RECOMMENDATION LOGIC
 # ============================================
 
-def recommend_jobs(user_skills, tfidf_vectorizer, tfidf_matrix, df, top_n=5):
+def top_k_indices(scores, k):
     """
-    Returns FULL job rows + similarity_score
+    Indices of the k highest scores, best first.
+    Partial selection (argpartition) + sort of the k winners only.
+    """
+    n = scores.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+@timed("recommend_jobs")
+def recommend_jobs(user_skills, tfidf_vectorizer, tfidf_matrix, df, top_n=5, job_records=None,
+                   ann_index=None, n_probe=None, rows=None, filters=None, filter_index=None,
+                   sharded_search=None):
+    """
+    user_skills: list of skills, str or text_analysis.AnalyzedDocument
+
+    Returns one JobRecord per job, best first: the full job row +
+    similarity_score (+ row_index: position of the job in df /
+    tfidf_matrix), read like a dict.
+
+    job_records: column store from build_job_records(df) (built from
+        df if missing)
+    ann_index: optional ann_index.AnnIndex; when given, only the jobs in
+        the n_probe closest clusters are scored (approximate results)
+    rows: optional sorted array of allowed row indexes; only these jobs
+        are scored
+    filters: optional JobFilterIndex.rows() filters, e.g.
+        {"work_type": "Intern"}; applied before top-k selection, so up
+        to top_n matching jobs are returned and excluded jobs are never
+        scored
+    filter_index: JobFilterIndex for filters (built from df if missing);
+        its tombstoned rows are never returned
+    sharded_search: optional sharded_search.ShardedSearch over
+        tfidf_matrix; full scans (no ANN index, rows or filters) are
+        then scored in parallel on its process pool
     """
 
     if isinstance(user_skills, list):
-        user_text = " ".join(user_skills)
+        query = analyze_text(" ".join(user_skills))
+    else:
+        query = as_document(user_skills)
+
+    filters = {
+        name: value for name, value in (filters or {}).items()
+        if value is not None and value != "" and value != []
+    }
+    if filters and filter_index is None:
+        filter_index = build_job_filter_index(df)
+
+    # Tombstoned rows: dropped from the filtered rows, or masked out of
+    # a full scan (cheaper than slicing nearly every row)
+    deleted = None
+    if filters:
+        filter_rows = filter_index.rows(**filters)
+        rows = filter_rows if rows is None else np.intersect1d(
+            filter_rows, rows, assume_unique=True
+        )
+    elif filter_index is not None and filter_index.deleted is not None:
+        deleted = filter_index.deleted
+        if rows is not None:
+            rows = np.asarray(rows)[~deleted[rows]]
+            deleted = None
+
+    # Rows of tfidf_matrix and the user vector are L2-normalized,
+    # so the cosine similarity is a plain sparse matrix-vector product
+    user_vector = query.vector(tfidf_vectorizer)
+    user_dense = user_vector.toarray().ravel()
+
+    candidate_rows = None
+    if ann_index is not None:
+        # Exact cosine, but only over the probed clusters
+        candidate_rows = ann_index.candidates(user_vector, n_probe=n_probe)
+        if rows is not None:
+            allowed = np.zeros(tfidf_matrix.shape[0], dtype=bool)
+            allowed[rows] = True
+            candidate_rows = candidate_rows[allowed[candidate_rows]]
+            # Too few matching jobs in the probed clusters: scan every
+            # allowed row instead
+            if candidate_rows.shape[0] < min(top_n, len(rows)):
+                candidate_rows = None
+        elif deleted is not None:
+            candidate_rows = candidate_rows[~deleted[candidate_rows]]
+
+    if candidate_rows is None and rows is not None:
+        candidate_rows = np.asarray(rows, dtype=np.intp)
+
+    if candidate_rows is not None:
+        candidate_scores = tfidf_matrix[candidate_rows].dot(user_dense)
+        best = top_k_indices(candidate_scores, top_n)
+        top_indices, top_scores = candidate_rows[best], candidate_scores[best]
+    elif sharded_search is not None:
+        [(top_indices, top_scores)] = sharded_search.search(user_vector, top_n, deleted=deleted)
     else:
-        user_text = user_skills
+        similarities = tfidf_matrix.dot(user_dense)
+        if deleted is not None:
+            similarities[deleted] = -np.inf
+        top_indices = top_k_indices(similarities, top_n)
+        top_scores = similarities[top_indices]
+
+        if deleted is not None:
+            live = np.isfinite(top_scores)
+            top_indices, top_scores = top_indices[live], top_scores[live]
 
-    user_text = clean_text(user_text)
+    if job_records is None:
+        job_records = build_job_records(df)
 
-    user_vector = tfidf_vectorizer.transform([user_text])
-    similarities = cosine_similarity(user_vector, tfidf_matrix).flatten()
+    return [
+        JobRecord(job_records, int(idx), round(float(score) * 100, 2))
+        for idx, score in zip(top_indices.tolist(), top_scores.tolist())
+    ]
 
-    top_indices = similarities.argsort()[-top_n:][::-1]
 
-    results = []
-    for idx in top_indices:
-        job = df.iloc[idx].to_dict()
-        job["similarity_score"] = round(float(similarities[idx]) * 100, 2)
-        results.append(job)
+@timed("recommend_jobs_batch")
+def recommend_jobs_batch(queries, tfidf_vectorizer, tfidf_matrix, df, top_n=5, job_records=None,
+                         filter_index=None, sharded_search=None):
+    """
+    recommend_jobs for many queries at once (bulk recommendation runs):
+    one list of JobRecords per query, in order.
+
+    queries: lists of skills, strs or AnalyzedDocuments
+    filter_index: its tombstoned rows are never returned
+    sharded_search: optional ShardedSearch; every shard then scores the
+        whole batch in one task
+    """
+    documents = [
+        analyze_text(" ".join(query)) if isinstance(query, list) else as_document(query)
+        for query in queries
+    ]
+    if not documents:
+        return []
+    query_matrix = sparse.vstack([document.vector(tfidf_vectorizer) for document in documents], format="csr")
+    deleted = filter_index.deleted if filter_index is not None else None
+
+    if sharded_search is not None:
+        results = sharded_search.search(query_matrix, top_n, deleted=deleted)
+    else:
+        # One sparse product for the batch, scored in blocks of queries
+        results = []
+        for first in range(0, len(documents), BATCH_QUERY_BLOCK):
+            scores = tfidf_matrix.dot(query_matrix[first:first + BATCH_QUERY_BLOCK].T.toarray())
+            for column in range(scores.shape[1]):
+                similarities = scores[:, column]
+                if deleted is not None:
+                    similarities[deleted] = -np.inf
+                top_indices = top_k_indices(similarities, top_n)
+                top_indices = top_indices[np.isfinite(similarities[top_indices])]
+                results.append((top_indices, similarities[top_indices]))
+
+    if job_records is None:
+        job_records = build_job_records(df)
 
-    return results
+    return [
+        [
+            JobRecord(job_records, int(idx), round(float(score) * 100, 2))
+            for idx, score in zip(top_indices.tolist(), top_scores.tolist())
+        ]
+        for top_indices, top_scores in results
+    ]
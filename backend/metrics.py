@@ -0,0 +1,184 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# ============================================
+# METRICS (PROMETHEUS TEXT FORMAT)
+# ============================================
+#
+# Hot-path timings go into latency histograms:
+#
+#     with timer("recommend_jobs"): ...        or     @timed("analyze_text")
+#
+# Time whole requests or batches, not helpers called once per job or token:
+# the timer's own overhead would then dominate what it measures.
+#
+# render() writes every metric in the Prometheus text exposition format
+# (served by /api/metrics). While a request profile is active
+# (start_profile), the same timings are also collected per request.
+
+PREFIX = "onlyjobs"
+
+# Histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# name -> (type, help)
+METRIC_INFO = {
+    "stage_seconds": ("histogram", "Time spent in instrumented stages"),
+    "http_request_seconds": ("histogram", "HTTP request latency by route"),
+    "http_requests_total": ("counter", "HTTP requests by route, method and status")
+}
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels_text(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+        for key, value in items
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class Metrics:
+    """Thread-safe histograms, counters and gauges, keyed by (name, labels)"""
+
+    def __init__(self, prefix=PREFIX):
+        self.prefix = prefix
+        self._histograms = {}
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        """Sets a gauge (or a counter kept elsewhere, e.g. cache hits)"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = value
+
+    def describe(self, name, metric_type, help_text):
+        METRIC_INFO[name] = (metric_type, help_text)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = {
+                key: (list(h.counts), h.sum, h.count, h.buckets)
+                for key, h in self._histograms.items()
+            }
+            values = dict(self._values)
+
+        by_name = {}
+        for (name, labels) in list(histograms) + list(values):
+            by_name.setdefault(name, []).append(labels)
+
+        lines = []
+        for name in sorted(by_name):
+            full_name = f"{self.prefix}_{name}"
+            metric_type, help_text = METRIC_INFO.get(name, ("gauge", name))
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+
+            for labels in sorted(set(by_name[name])):
+                key = (name, labels)
+                if key in histograms:
+                    counts, total, count, buckets = histograms[key]
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+                        cumulative += bucket_count
+                        lines.append(
+                            f"{full_name}_bucket{_labels_text(labels, ('le', bound))} {cumulative}"
+                        )
+                    lines.append(f"{full_name}_sum{_labels_text(labels)} {total}")
+                    lines.append(f"{full_name}_count{_labels_text(labels)} {count}")
+                else:
+                    lines.append(f"{full_name}{_labels_text(labels)} {values[key]}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+# ============================================
+# TIMERS + PER-REQUEST PROFILES
+# ============================================
+
+_profile = contextvars.ContextVar("profile", default=None)
+
+
+def start_profile():
+    """Starts collecting stage timings for the current request / context"""
+    return _profile.set([])
+
+
+def stop_profile(token):
+    """
+    Stops the profile; returns {stage: {"calls", "seconds"}} in the
+    order the stages first ran.
+    """
+    timings = _profile.get() or []
+    _profile.reset(token)
+
+    breakdown = {}
+    for stage, seconds in timings:
+        entry = breakdown.setdefault(stage, {"calls": 0, "seconds": 0.0})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+    return breakdown
+
+
+@contextmanager
+def timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("stage_seconds", elapsed, stage=stage)
+        profile = _profile.get()
+        if profile is not None:
+            profile.append((stage, elapsed))
+
+
+def timed(stage):
+    """Decorator version of timer()"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
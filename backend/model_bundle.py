@@ -0,0 +1,282 @@
+import json
+import os
+import shutil
+import sys
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# ============================================
+# MEMORY-MAPPED MODEL BUNDLE
+# ============================================
+#
+# Binary replacement for jobs_cleaned.csv + the two pickles:
+#
+#   meta.json                  shapes, dtypes, vectorizer params, columns
+#   matrix_data.npy            \
+#   matrix_indices.npy          > tfidf_matrix CSR arrays
+#   matrix_indptr.npy          /
+#   vocab.txt                  one term per line, in column order
+#   idf.npy                    vectorizer idf_ weights
+#   col_<i>.npy                numeric job column
+#   col_<i>_codes.npy          \ low-cardinality text column
+#   col_<i>_categories.txt     / (categorical codes + category list)
+#   col_<i>.bin                \  free text column
+#   col_<i>_offsets.npy         > (UTF-8 blob + byte offsets
+#   col_<i>_missing.npy        /   + missing-value mask)
+#
+# The matrix and numeric / categorical columns are opened with mmap, so
+# pages are loaded on demand and shared by every worker process reading
+# the same bundle. Free text columns are decoded into each process.
+
+BUNDLE_VERSION = 1
+
+# Text columns with fewer unique values than this share of rows are
+# stored as categorical codes
+CATEGORICAL_RATIO = 0.5
+
+# TfidfVectorizer params that can't be written to JSON
+_CALLABLE_PARAMS = ("analyzer", "preprocessor", "tokenizer")
+
+
+def bundle_path(bundle_dir, name):
+    """Path of file ``name`` of the bundle in bundle_dir"""
+    return os.path.join(bundle_dir, name)
+
+
+def write_lines(path, values):
+    """Writes one value per line (values must not contain newlines)"""
+    with open(path, "w", encoding="utf-8") as f:
+        for value in values:
+            f.write(value + "\n")
+
+
+def _read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().split("\n")[:-1]
+
+
+# ============================================
+# BUILD
+# ============================================
+
+def vectorizer_params(vectorizer):
+    """get_params() of ``vectorizer`` as JSON-serializable meta.json entries"""
+    params = vectorizer.get_params()
+
+    for name in _CALLABLE_PARAMS:
+        if callable(params.get(name)):
+            raise ValueError(f"Vectorizer with a custom {name} can't be bundled")
+
+    params.pop("vocabulary", None)
+    params["dtype"] = np.dtype(params["dtype"]).name
+    if isinstance(params["stop_words"], (set, frozenset)):
+        params["stop_words"] = sorted(params["stop_words"])
+    params["ngram_range"] = list(params["ngram_range"])
+    return params
+
+
+def _save_column(bundle_dir, i, series):
+    if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        np.save(bundle_path(bundle_dir, f"col_{i}.npy"), series.to_numpy())
+        return {"kind": "numeric"}
+
+    values = series.astype(object).where(series.notna(), None)
+    if series.nunique(dropna=True) < CATEGORICAL_RATIO * max(1, len(series)):
+        categorical = pd.Categorical(values)
+        np.save(bundle_path(bundle_dir, f"col_{i}_codes.npy"), categorical.codes)
+        write_lines(
+            bundle_path(bundle_dir, f"col_{i}_categories.txt"),
+            [json.dumps(str(c)) for c in categorical.categories]
+        )
+        return {"kind": "categorical"}
+
+    # Free text: one UTF-8 blob + offsets
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    missing = np.zeros(len(values), dtype=bool)
+    with open(bundle_path(bundle_dir, f"col_{i}.bin"), "wb") as f:
+        position = 0
+        for j, value in enumerate(values):
+            if value is None:
+                missing[j] = True
+            else:
+                data = str(value).encode("utf-8")
+                f.write(data)
+                position += len(data)
+            offsets[j + 1] = position
+    np.save(bundle_path(bundle_dir, f"col_{i}_offsets.npy"), offsets)
+    np.save(bundle_path(bundle_dir, f"col_{i}_missing.npy"), missing)
+    return {"kind": "text"}
+
+
+def replace_bundle(new_dir, bundle_dir):
+    """
+    Moves a finished bundle into place. The old bundle is renamed
+    first, so processes that have it memory-mapped keep their files.
+    """
+    old_dir = bundle_dir + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(bundle_dir):
+        os.rename(bundle_dir, old_dir)
+    os.rename(new_dir, bundle_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def build_bundle(df, tfidf_vectorizer, tfidf_matrix, bundle_dir):
+    """
+    Writes df / vectorizer / matrix as a memory-mappable bundle.
+    It is written next to bundle_dir and swapped in when complete, so
+    readers never see a half-written bundle.
+    """
+    new_dir = bundle_dir + ".new"
+    shutil.rmtree(new_dir, ignore_errors=True)
+    try:
+        _write_bundle(df, tfidf_vectorizer, tfidf_matrix, new_dir)
+    except BaseException:
+        shutil.rmtree(new_dir, ignore_errors=True)
+        raise
+    replace_bundle(new_dir, bundle_dir)
+
+
+def _write_bundle(df, tfidf_vectorizer, tfidf_matrix, bundle_dir):
+    os.makedirs(bundle_dir)
+
+    matrix = sp.csr_matrix(tfidf_matrix)
+    matrix.sort_indices()
+    # Same dtype for indices / indptr so scipy never re-casts (copies) them
+    index_dtype = np.int64 if matrix.nnz > np.iinfo(np.int32).max else np.int32
+    np.save(bundle_path(bundle_dir, "matrix_data.npy"), matrix.data)
+    np.save(bundle_path(bundle_dir, "matrix_indices.npy"), matrix.indices.astype(index_dtype))
+    np.save(bundle_path(bundle_dir, "matrix_indptr.npy"), matrix.indptr.astype(index_dtype))
+
+    vocabulary = tfidf_vectorizer.vocabulary_
+    terms = [None] * len(vocabulary)
+    for term, column in vocabulary.items():
+        terms[column] = term
+    write_lines(bundle_path(bundle_dir, "vocab.txt"), terms)
+    np.save(bundle_path(bundle_dir, "idf.npy"), tfidf_vectorizer.idf_)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        column = _save_column(bundle_dir, i, df[name])
+        column["name"] = name
+        columns.append(column)
+
+    meta = {
+        "version": BUNDLE_VERSION,
+        "n_jobs": len(df),
+        "matrix_shape": list(matrix.shape),
+        "vectorizer_params": vectorizer_params(tfidf_vectorizer),
+        "columns": columns
+    }
+    # meta.json last: a bundle without it is incomplete and never loaded
+    with open(bundle_path(bundle_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+# ============================================
+# LOAD
+# ============================================
+
+def bundle_exists(bundle_dir):
+    return os.path.exists(bundle_path(bundle_dir, "meta.json"))
+
+
+def _load_npy(bundle_dir, name):
+    return np.load(bundle_path(bundle_dir, name), mmap_mode="r")
+
+
+def _load_column(bundle_dir, i, column, n_jobs):
+    kind = column["kind"]
+
+    if kind == "numeric":
+        return _load_npy(bundle_dir, f"col_{i}.npy")
+
+    if kind == "categorical":
+        categories = [
+            json.loads(line)
+            for line in _read_lines(bundle_path(bundle_dir, f"col_{i}_categories.txt"))
+        ]
+        codes = _load_npy(bundle_dir, f"col_{i}_codes.npy")
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+    if n_jobs == 0:
+        return np.zeros(0, dtype=object)
+
+    bounds = _load_npy(bundle_dir, f"col_{i}_offsets.npy").tolist()
+    missing = _load_npy(bundle_dir, f"col_{i}_missing.npy")
+    with open(bundle_path(bundle_dir, f"col_{i}.bin"), "rb") as f:
+        data = f.read()
+
+    values = np.empty(n_jobs, dtype=object)
+    for j in range(n_jobs):
+        values[j] = data[bounds[j]:bounds[j + 1]].decode("utf-8")
+    values[np.asarray(missing)] = None
+    return values
+
+
+def load_bundle(bundle_dir):
+    """
+    Loads (df, tfidf_vectorizer, tfidf_matrix) from a bundle.
+    Matrix and numeric/categorical columns stay memory-mapped.
+    """
+    with open(bundle_path(bundle_dir, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    if meta.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported model bundle version: {meta.get('version')}")
+
+    tfidf_matrix = sp.csr_matrix(
+        (
+            _load_npy(bundle_dir, "matrix_data.npy"),
+            _load_npy(bundle_dir, "matrix_indices.npy"),
+            _load_npy(bundle_dir, "matrix_indptr.npy")
+        ),
+        shape=tuple(meta["matrix_shape"]),
+        copy=False
+    )
+
+    params = dict(meta["vectorizer_params"])
+    params["dtype"] = np.dtype(params["dtype"]).type
+    params["ngram_range"] = tuple(params["ngram_range"])
+    tfidf_vectorizer = TfidfVectorizer(**params)
+    tfidf_vectorizer.vocabulary_ = {
+        term: column
+        for column, term in enumerate(_read_lines(bundle_path(bundle_dir, "vocab.txt")))
+    }
+    tfidf_vectorizer.idf_ = np.asarray(_load_npy(bundle_dir, "idf.npy"))
+
+    n_jobs = meta["n_jobs"]
+    df = pd.DataFrame({
+        column["name"]: _load_column(bundle_dir, i, column, n_jobs)
+        for i, column in enumerate(meta["columns"])
+    }, copy=False)
+
+    return df, tfidf_vectorizer, tfidf_matrix
+
+
+# ============================================
+# BUILD COMMAND
+# ============================================
+# Usage (from backend/):
+#   python model_bundle.py
+# Converts data/jobs_cleaned.csv + models/*.pkl into models/bundle/
+
+if __name__ == "__main__":
+    from job_matching import BUNDLE_DIR, load_pickled_models_and_data
+
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else BUNDLE_DIR
+
+    start = time.perf_counter()
+    df, tfidf_vectorizer, tfidf_matrix = load_pickled_models_and_data()
+    print(f"⏱️ CSV + pickles loaded in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    build_bundle(df, tfidf_vectorizer, tfidf_matrix, out_dir)
+    print(f"✅ Bundle written to {out_dir} in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    load_bundle(out_dir)
+    print(f"⏱️ Bundle loaded in {time.perf_counter() - start:.2f}s")
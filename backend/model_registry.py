@@ -0,0 +1,142 @@
+import os
+import sys
+import threading
+import time
+
+# ============================================
+# MODEL REGISTRY
+# ============================================
+#
+# Heavy resources (job models, NLP models, ...) are registered with a
+# loader and only loaded on first use. Call preload() before forking
+# workers (e.g. gunicorn --preload) so the loaded state is shared
+# copy-on-write instead of being loaded again in every worker.
+#
+# A failed load is retried by a later get(), after a backoff that
+# doubles with every failure (LOAD_RETRY_SECONDS .. LOAD_RETRY_MAX_SECONDS);
+# until then get() raises the recorded error right away.
+
+LOAD_RETRY_SECONDS = 5
+LOAD_RETRY_MAX_SECONDS = 300
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders = {}
+        self._values = {}
+        self._stats = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name, loader):
+        """Registers ``loader()`` as the way to build resource ``name``."""
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks[name] = threading.Lock()
+            self._stats[name] = {
+                "loaded": False, "load_seconds": None, "error": None, "failures": 0, "retry_at": None
+            }
+
+    def get(self, name):
+        """
+        Returns the resource, loading it on first use.
+        Raises the loader's exception if loading failed; until the retry
+        backoff is over, later calls raise RuntimeError with that error.
+        """
+        if name in self._values:
+            return self._values[name]
+
+        with self._locks[name]:
+            if name in self._values:
+                return self._values[name]
+
+            stats = self._stats[name]
+            if stats["error"] is not None and time.time() < stats["retry_at"]:
+                raise RuntimeError(stats["error"])
+
+            start = time.perf_counter()
+            try:
+                value = self._loaders[name]()
+            except Exception as e:
+                stats["error"] = f"{type(e).__name__}: {e}"
+                stats["failures"] += 1
+                backoff = min(LOAD_RETRY_MAX_SECONDS, LOAD_RETRY_SECONDS * 2 ** (stats["failures"] - 1))
+                stats["retry_at"] = time.time() + backoff
+                raise
+            finally:
+                stats["load_seconds"] = round(time.perf_counter() - start, 4)
+
+            self._values[name] = value
+            stats.update(loaded=True, error=None, failures=0, retry_at=None)
+            return value
+
+    def replace(self, name, value):
+        """Atomically swaps in a new value (readers see old or new, never a mix)."""
+        self._values[name] = value
+        self._stats[name].update(loaded=True, error=None, failures=0, retry_at=None)
+
+    def is_loaded(self, name):
+        return name in self._values
+
+    def is_ready(self, name):
+        """
+        Loaded, or loadable on first use: False only while the last
+        load attempt failed (until its retry succeeds)
+        """
+        return name in self._values or self._stats[name]["error"] is None
+
+    def preload(self, names=None):
+        """
+        Loads resources eagerly (all by default). Failures are recorded
+        in stats() instead of raised.
+        """
+        for name in names or list(self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"⚠️ Warning: Could not preload {name}: {e}")
+
+    def stats(self):
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+registry = ModelRegistry()
+
+
+# ============================================
+# PROCESS MEMORY
+# ============================================
+
+def resident_memory_mb():
+    """Current resident set size of this process in MB (None if unknown)."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # Peak (not current) RSS: KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process so far in MB (None if unknown)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def process_info():
+    return {"pid": os.getpid(), "rss_mb": resident_memory_mb()}
@@ -0,0 +1,44 @@
+from ats_scoring import calculate_ats_score
+from resume_parser import analyze_resume, disable_pdf_pool, parsed_resume
+
+# ============================================
+# RESUME PARSING + SAMPLE ATS SCORE
+# ============================================
+#
+# Parse-only entry point for upload parsing. It imports the parser and
+# ATS scoring but not app, so spawned parse workers (asgi's "parse"
+# StagePool) don't repeat app's module-level setup: no model preload,
+# no shared-memory search shards, no task queue. Pools pass
+# init_worker as their initializer.
+
+
+# Sample job used to give an ATS score right after upload (for demonstration)
+SAMPLE_JOB = {
+    "skills": "Python, Flask, SQL, Git, Docker, REST API, PostgreSQL",
+    "combined_text": "Backend developer working with Flask and APIs. Strong experience in Python, database management, and cloud deployment.",
+    "Experience Level": "Mid"
+}
+
+
+def init_worker():
+    """Process-pool initializer: PDFs are read in the worker itself, no nested PDF pool"""
+    disable_pdf_pool()
+
+
+def parse_and_score_resume(source, filename=None):
+    """
+    Returns (parsed_data, ats_result) for a resume
+    (path, or bytes / stream + original filename)
+    """
+    # Tokenized once; parsing and scoring read the same document
+    document = analyze_resume(source, filename)
+    parsed_data = parsed_resume(document)
+
+    ats_result = calculate_ats_score(
+        document,
+        parsed_data["skills"],
+        parsed_data["experience_level"],
+        SAMPLE_JOB
+    )
+
+    return parsed_data, ats_result
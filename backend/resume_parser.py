@@ -1,119 +1,280 @@
 import pdfplumber
 import docx
+import io
+import multiprocessing
 import os
-import re
-import spacy
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from metrics import timed
+from model_registry import registry
+from text_analysis import analyze_text, as_document
 
 # ===============================
-# LOAD NLP MODEL
+# LOAD NLP MODEL (LAZY)
 # ===============================
-nlp = spacy.load("en_core_web_sm")
+def _load_nlp():
+    import spacy
+    return spacy.load("en_core_web_sm")
+
+
+registry.register("spacy_nlp", _load_nlp)
+
+
+def get_nlp():
+    """spaCy pipeline, loaded on first use"""
+    return registry.get("spacy_nlp")
 
 # ===============================
-# SKILLS DATABASE (BASIC + EXTENDABLE)
+# PARSER VERSION
 # ===============================
-SKILLS_DB = [
-    "python", "java", "c++", "c#", "javascript", "typescript",
-    "sql", "mysql", "postgresql", "mongodb",
-    "machine learning", "deep learning", "data science",
-    "flask", "django", "fastapi",
-    "react", "angular", "node.js",
-    "html", "css", "bootstrap",
-    "git", "github", "docker", "kubernetes",
-    "aws", "azure", "gcp",
-    "linux", "api", "rest", "json"
-]
+# Bump when a change alters what parse_resume returns for the same file:
+# stored parses (app.load_stored_upload) are keyed on parser_version()
+PARSER_VERSION = 2
+
+
+def parser_version():
+    """PARSER_VERSION + skills taxonomy version"""
+    return f"{PARSER_VERSION}.{registry.get('skill_extractor').version}"
 
 # ===============================
-# TEXT EXTRACTION FUNCTIONS
+# PDF EXTRACTION LIMITS
 # ===============================
-def extract_text_from_pdf(file_path):
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + " "
-    return text
+PDF_MAX_PAGES = 30              # pages read at most
+PDF_MAX_CHARS = 50_000          # stop once this much text is extracted
+PDF_TIME_BUDGET = 8.0           # seconds per file
+PDF_PARALLEL_MIN_PAGES = 4      # smaller PDFs are read in-process
+PDF_MIN_PAGES_PER_TASK = 2      # pages per process-pool task, at least
+PDF_WORKERS = min(4, os.cpu_count() or 1)
+PDF_PROCESS_POOL = True         # False: every PDF is read in-process
+PDF_SLOW_SECONDS = 2.0          # extractions slower than this are logged
 
+# Recent per-file extraction timings (see recent_pdf_extractions)
+_pdf_timings = deque(maxlen=200)
 
-def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    return " ".join([para.text for para in doc.paragraphs])
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # spawn: forking a threaded web server is unsafe
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pdf_pool
+
+
+def disable_pdf_pool():
+    """
+    Initializer for workers of other process pools: they read PDFs
+    in-process rather than each starting a nested pool
+    """
+    global PDF_PROCESS_POOL
+    PDF_PROCESS_POOL = False
+
+
+def _reset_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
 
 
-def extract_text_from_txt(file_path):
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        return f.read()
+def _extract_pdf_pages(source, page_numbers):
+    """Process-pool task: text of the given pages"""
+    with pdfplumber.open(_open_source(source)) as pdf:
+        return [pdf.pages[n].extract_text() or "" for n in page_numbers]
 
 
 # ===============================
-# CLEAN TEXT
+# RESUME SOURCES
 # ===============================
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r"[^\w\s]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+# Every extractor accepts a file path, the file's bytes, or a binary
+# file-like object (e.g. request.files["resume"].stream).
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def _open_source(source):
+    """Path or binary stream that pdfplumber / python-docx can open"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def _read_bytes(source):
+    if _is_path(source):
+        with open(source, "rb") as f:
+            return f.read()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    return source.read()
+
+
+# ===============================
+# TEXT EXTRACTION FUNCTIONS
+# ===============================
+def iter_pdf_pages(source, max_pages=PDF_MAX_PAGES, time_budget=PDF_TIME_BUDGET):
+    """
+    Yields the text of each page, in order.
+
+    PDFs with PDF_PARALLEL_MIN_PAGES+ pages are extracted in parallel on
+    a process pool (unless PDF_PROCESS_POOL is off). Stops after max_pages pages or time_budget seconds;
+    closing the generator early cancels pages not started yet.
+    """
+    start = time.perf_counter()
+
+    # Streams can't be shared with the pool's processes, bytes can
+    if not _is_path(source) and not isinstance(source, bytes):
+        source = _read_bytes(source)
+
+    with pdfplumber.open(_open_source(source)) as pdf:
+        n_pages = min(len(pdf.pages), max_pages)
+
+        if n_pages < PDF_PARALLEL_MIN_PAGES or not PDF_PROCESS_POOL:
+            for page in pdf.pages[:n_pages]:
+                if time.perf_counter() - start > time_budget:
+                    return
+                yield page.extract_text() or ""
+            return
+
+    # Every task pickles the PDF bytes (a path is cheap) and parses the
+    # file again: one contiguous page range per worker, so that happens
+    # at most PDF_WORKERS times per file
+    per_task = max(PDF_MIN_PAGES_PER_TASK, -(-n_pages // PDF_WORKERS))
+    ranges = [range(first, min(first + per_task, n_pages)) for first in range(0, n_pages, per_task)]
+
+    pool = _get_pdf_pool()
+    futures = [pool.submit(_extract_pdf_pages, source, list(pages)) for pages in ranges]
+
+    try:
+        for page_numbers, future in zip(ranges, futures):
+            remaining = time_budget - (time.perf_counter() - start)
+            if remaining <= 0:
+                return
+            try:
+                pages = future.result(timeout=remaining)
+            except FutureTimeout:
+                return
+            except BrokenProcessPool:
+                # A worker died: drop the pool, finish in-process
+                _reset_pdf_pool()
+                pages = _extract_pdf_pages(source, page_numbers)
+            yield from pages
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+@timed("extract_text_from_pdf")
+def extract_text_from_pdf(source, max_chars=PDF_MAX_CHARS, name=None):
+    start = time.perf_counter()
+    pieces = []
+    n_chars = 0
+    n_pages = 0
+
+    pages = iter_pdf_pages(source)
+    try:
+        for page_text in pages:
+            n_pages += 1
+            if page_text:
+                pieces.append(page_text)
+                n_chars += len(page_text)
+            if n_chars >= max_chars:
+                break
+    finally:
+        pages.close()
+
+    if name is None:
+        name = os.path.basename(source) if _is_path(source) else "<upload>"
+
+    _record_pdf_timing(name, n_pages, n_chars, time.perf_counter() - start)
+    return " ".join(pieces)
+
+
+def _record_pdf_timing(name, n_pages, n_chars, seconds):
+    timing = {
+        "file": name,
+        "pages": n_pages,
+        "chars": n_chars,
+        "seconds": round(seconds, 4)
+    }
+    _pdf_timings.append(timing)
+
+    if seconds > PDF_SLOW_SECONDS:
+        print(f"🐢 Slow PDF extraction: {timing}")
+
+
+def recent_pdf_extractions(slowest=None):
+    """
+    Recent PDF extraction timings, newest first
+    (or the ``slowest`` N by time)
+    """
+    timings = list(reversed(_pdf_timings))
+    if slowest is not None:
+        timings = sorted(timings, key=lambda t: t["seconds"], reverse=True)[:slowest]
+    return timings
+
+
+@timed("extract_text_from_docx")
+def extract_text_from_docx(source):
+    doc = docx.Document(_open_source(source))
+    return " ".join([para.text for para in doc.paragraphs])
+
+
+@timed("extract_text_from_txt")
+def extract_text_from_txt(source):
+    if _is_path(source):
+        with open(source, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    return _read_bytes(source).decode("utf-8", errors="ignore")
 
 
 # ===============================
 # SKILL EXTRACTION
 # ===============================
+@timed("extract_skills")
 def extract_skills(text):
-    found_skills = set()
-    for skill in SKILLS_DB:
-        pattern = r"\b" + re.escape(skill) + r"\b"
-        if re.search(pattern, text):
-            found_skills.add(skill)
-    return sorted(found_skills)
+    """
+    Canonical skills (incl. aliases like "k8s") found in one pass.
+    Pass the raw text: cleaning strips "+", "#" and "." from skills
+    such as "c++", "c#" and "node.js".
+    """
+    return registry.get("skill_extractor").extract(text)
 
 
 # ===============================
 # EXPERIENCE LEVEL EXTRACTION
 # ===============================
+@timed("extract_experience_level")
 def extract_experience_level(text):
     """
     Infer experience level from resume text
     Returns: Entry | Mid | Senior
     """
-
-    text = text.lower()
-
-    # Senior-level signals
-    if re.search(r"\b(senior|lead|principal|architect|manager)\b", text):
-        return "Senior"
-
-    # Entry-level signals
-    if re.search(r"\b(entry[-\s]?level|fresher|graduate|junior)\b", text):
-        return "Entry"
-
-    # Years of experience signals
-    year_matches = re.findall(r"(\d+)\+?\s+years?", text)
-
-    if year_matches:
-        years = max(map(int, year_matches))
-
-        if years <= 1:
-            return "Entry"
-        elif 2 <= years <= 4:
-            return "Mid"
-        else:
-            return "Senior"
-
-    # Safe default
-    return "Mid"
+    return as_document(text).experience_level
 
 
 # ===============================
 # MAIN PARSE FUNCTION
 # ===============================
-def parse_resume(file_path):
+def parse_resume(source, filename=None):
     """
     Parse resume and extract text + skills + experience level
 
     Args:
-        file_path (str): Path to uploaded resume
+        source: path to the resume, its bytes, or a binary file-like object
+        filename (str): original file name, used for the file type when
+            ``source`` is not a path
 
     Returns:
         dict: {
@@ -123,28 +284,41 @@ def parse_resume(file_path):
             'experience_level': str
         }
     """
+    return parsed_resume(analyze_resume(source, filename))
 
-    if not os.path.exists(file_path):
-        raise FileNotFoundError("Resume file not found")
 
-    extension = os.path.splitext(file_path)[1].lower()
+def analyze_resume(source, filename=None):
+    """
+    Extracts the resume text and analyzes it once (AnalyzedDocument);
+    same arguments as parse_resume. Pass the document on to
+    calculate_ats_score / recommend_jobs to reuse its tokens and vectors.
+    """
+    if _is_path(source):
+        if not os.path.exists(source):
+            raise FileNotFoundError("Resume file not found")
+        filename = filename or os.fspath(source)
+    elif not filename:
+        raise ValueError("filename is required to parse an in-memory resume")
+
+    extension = os.path.splitext(filename)[1].lower()
 
     if extension == ".pdf":
-        raw_text = extract_text_from_pdf(file_path)
+        raw_text = extract_text_from_pdf(source, name=os.path.basename(filename))
     elif extension == ".docx":
-        raw_text = extract_text_from_docx(file_path)
+        raw_text = extract_text_from_docx(source)
     elif extension == ".txt":
-        raw_text = extract_text_from_txt(file_path)
+        raw_text = extract_text_from_txt(source)
     else:
         raise ValueError("Unsupported file format")
 
-    cleaned_text = clean_text(raw_text)
-    skills = extract_skills(cleaned_text)
-    experience_level = extract_experience_level(cleaned_text)
+    return analyze_text(raw_text)
+
 
+def parsed_resume(document):
+    """parse_resume result dict of an analyzed resume"""
     return {
-        "resume_text": cleaned_text,
-        "cleaned_text": cleaned_text,
-        "skills": skills,
-        "experience_level": experience_level
+        "resume_text": document.text,
+        "cleaned_text": document.text,
+        "skills": document.skills,
+        "experience_level": document.experience_level
     }
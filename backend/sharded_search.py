@@ -0,0 +1,414 @@
+import multiprocessing
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import sparse
+
+from job_matching import top_k_indices
+
+# ============================================
+# SHARDED MULTI-CORE SIMILARITY SEARCH
+# ============================================
+#
+# The TF-IDF job matrix is copied once into shared memory (one segment
+# per CSR array) and split by rows into shards of about equal nnz.
+# A query is scored on every shard in parallel on a process pool; each
+# worker maps the segments by name (no copy of the matrix per worker or
+# per query), computes its shard's similarities and returns its top-k.
+# The per-shard top-k lists are merged into the global top-k.
+#
+#     search = ShardedSearch(tfidf_matrix, n_shards=8)
+#     [(rows, scores)] = search.search(user_vector, k=20)
+#     results = search.search(query_matrix, k=20)        # batch of queries
+#
+# Appended jobs (job_corpus) become an extra shard of their own
+# (extended()); compaction builds a new ShardedSearch on the same pool.
+# shared_matrix() is the indexed matrix as views of the segments (a
+# StackedCSR once jobs were appended), so the snapshot keeps no private
+# copy. If a worker dies the pool is replaced and that query is scored
+# in-process.
+
+DEFAULT_SHARDS = os.cpu_count() or 1
+
+# Dense score block per shard task, in bytes (shard rows x queries)
+MAX_BLOCK_BYTES = 64 * 1024 * 1024
+
+# Segments kept mapped in each worker
+WORKER_ATTACHED_MATRICES = 8
+
+
+# ============================================
+# SHARED CSR MATRIX
+# ============================================
+
+class SharedCSR:
+    """
+    CSR matrix whose data / indices / indptr live in shared memory
+    segments. The segments are unlinked once the object is garbage
+    collected (or close() is called).
+    """
+
+    def __init__(self, matrix):
+        matrix = matrix.tocsr() if isinstance(matrix, StackedCSR) else sparse.csr_matrix(matrix)
+        self.shape = matrix.shape
+        self._segments = []
+        self.arrays = {}
+        for name in ("data", "indices", "indptr"):
+            source = getattr(matrix, name)
+            segment = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+            array = np.ndarray(source.shape, dtype=source.dtype, buffer=segment.buf)
+            array[:] = source
+            self._segments.append(segment)
+            self.arrays[name] = array
+        # What a worker needs to map the matrix: shape + (segment, dtype, shape) per array
+        self.descriptor = (self.shape, tuple(
+            (segment.name, array.dtype.str, array.shape)
+            for segment, array in zip(self._segments, self.arrays.values())
+        ))
+        self._finalizer = weakref.finalize(self, _release, self._segments)
+
+    def matrix(self):
+        """CSR view of the shared arrays (no copy)"""
+        return _csr_view(self.arrays["data"], self.arrays["indices"], self.arrays["indptr"], self.shape)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def close(self):
+        self.arrays = {}
+        self._finalizer()
+
+
+def _release(segments):
+    for segment in segments:
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+        # Arrays still viewing the segment (e.g. a matrix() a request
+        # holds) keep the memory mapped until they are gone
+        try:
+            segment.close()
+        except BufferError:
+            pass
+
+
+def _csr_view(data, indices, indptr, shape):
+    """
+    CSR matrix over existing arrays. The csr_matrix constructor copies
+    arrays that are views (even with copy=False), which would give
+    every worker a private copy of the shared matrix.
+    """
+    matrix = sparse.csr_matrix(shape, dtype=data.dtype)
+    matrix.data, matrix.indices, matrix.indptr = data, indices, indptr
+    return matrix
+
+
+class StackedCSR:
+    """
+    CSR matrices stacked by rows, without copying them into one matrix.
+    Supports what the job snapshot's matrix is used for: shape / dtype,
+    row selection with an index array (-> csr_matrix) and dot().
+    """
+
+    def __init__(self, parts):
+        self.parts = parts
+        self.offsets = np.cumsum([0] + [part.shape[0] for part in parts])
+        self.shape = (int(self.offsets[-1]), parts[0].shape[1])
+        self.dtype = parts[0].dtype
+
+    @property
+    def nnz(self):
+        return sum(part.nnz for part in self.parts)
+
+    def __getitem__(self, rows):
+        rows = np.atleast_1d(np.asarray(rows))
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        rows = np.where(rows < 0, rows + self.shape[0], rows)
+
+        part_of = np.searchsorted(self.offsets, rows, side="right") - 1
+        selected, positions = [], []
+        for i, part in enumerate(self.parts):
+            in_part = np.flatnonzero(part_of == i)
+            if in_part.size:
+                selected.append(part[rows[in_part] - self.offsets[i]])
+                positions.append(in_part)
+        if not selected:
+            return sparse.csr_matrix((0, self.shape[1]), dtype=self.dtype)
+        if len(selected) == 1:
+            return selected[0]
+
+        # Back to the order of ``rows``
+        stacked = sparse.vstack(selected, format="csr")
+        return stacked[np.argsort(np.concatenate(positions), kind="stable")]
+
+    def dot(self, other):
+        return np.concatenate([part.dot(other) for part in self.parts])
+
+    def tocsr(self):
+        return sparse.vstack(self.parts, format="csr")
+
+
+# ============================================
+# WORKER SIDE
+# ============================================
+
+# descriptor -> (segments, csr matrix); per worker process
+_attached = OrderedDict()
+
+
+def _attach(descriptor):
+    """The shared matrix of a descriptor, mapped once per worker"""
+    entry = _attached.get(descriptor)
+    if entry is not None:
+        _attached.move_to_end(descriptor)
+        return entry[1]
+
+    shape, arrays = descriptor
+    segments, views = [], []
+    for name, dtype, array_shape in arrays:
+        # Spawned workers share the parent's resource tracker, so the
+        # segments are only unlinked by the parent
+        segment = shared_memory.SharedMemory(name=name)
+        segments.append(segment)
+        views.append(np.ndarray(array_shape, dtype=np.dtype(dtype), buffer=segment.buf))
+    matrix = _csr_view(*views, shape)
+
+    _attached[descriptor] = (segments, matrix)
+    while len(_attached) > WORKER_ATTACHED_MATRICES:
+        old_segments, _ = _attached.popitem(last=False)[1]
+        for segment in old_segments:
+            segment.close()
+    return matrix
+
+
+def _shard_view(matrix, start, stop):
+    """matrix[start:stop] sharing data / indices with matrix (slicing would copy them)"""
+    indptr = matrix.indptr[start:stop + 1]
+    first, last = indptr[0], indptr[-1]
+    return _csr_view(
+        matrix.data[first:last], matrix.indices[first:last], indptr - first, (stop - start, matrix.shape[1])
+    )
+
+
+def _score_shard(descriptor, start, stop, queries, k_per_query):
+    """
+    Top rows of matrix[start:stop] for each query (rows of the CSR
+    ``queries``); k_per_query[i] results for query i.
+
+    Returns: [(global rows, scores), ...] per query, best first
+    """
+    return _score_rows(_attach(descriptor), start, stop, queries, k_per_query)
+
+
+def _score_rows(matrix, start, stop, queries, k_per_query):
+    shard = _shard_view(matrix, start, stop)
+    n_queries = queries.shape[0]
+
+    results = []
+    # Queries in blocks, so the dense score block stays bounded
+    block = max(1, MAX_BLOCK_BYTES // max(1, 8 * (stop - start)))
+    for first in range(0, n_queries, block):
+        scores = shard.dot(queries[first:first + block].T.toarray())
+        for column in range(scores.shape[1]):
+            column_scores = scores[:, column]
+            best = top_k_indices(column_scores, k_per_query[first + column])
+            results.append((best + start, column_scores[best]))
+    return results
+
+
+# ============================================
+# SHARDED SEARCH
+# ============================================
+
+def _shard_bounds(indptr, n_shards):
+    """[(start, stop), ...] row ranges with about equal nnz"""
+    n_rows = len(indptr) - 1
+    n_shards = max(1, min(n_shards, n_rows))
+    targets = np.linspace(0, indptr[-1], n_shards + 1)[1:-1]
+    cuts = np.searchsorted(indptr, targets)
+    bounds = np.unique(np.concatenate([[0], cuts, [n_rows]]))
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+class SearchPool:
+    """
+    Process pool for ShardedSearch, created on first use and replaced
+    after a worker died. Workers are spawned rather than forked from a
+    (threaded) server process; they only import this module and map the
+    shared segments.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or DEFAULT_SHARDS
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def reset(self, broken):
+        """Drops ``broken`` (unless another caller already replaced it)"""
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+class ShardedSearch:
+    """
+    Parallel exact top-k cosine search over a TF-IDF matrix whose rows
+    are L2-normalized.
+
+    parts: [(SharedCSR, first row of it in the full matrix)]
+    shards: [(part index, start row, stop row)] (rows local to the part)
+    """
+
+    def __init__(self, matrix, n_shards=DEFAULT_SHARDS, pool=None):
+        self.pool = pool or SearchPool(n_shards)
+        self.n_shards = n_shards
+        self.n_rows = 0
+        self.parts = []
+        self.shards = []
+        self._deleted = None
+        self._add_part(matrix, n_shards)
+
+    def _add_part(self, matrix, n_shards):
+        shared = SharedCSR(matrix)
+        part = len(self.parts)
+        self.parts.append((shared, self.n_rows))
+        self.shards.extend(
+            (part, start, stop) for start, stop in _shard_bounds(shared.arrays["indptr"], n_shards)
+        )
+        self.n_rows += shared.shape[0]
+
+    def __len__(self):
+        return self.n_rows
+
+    def shared_matrix(self):
+        """
+        The indexed matrix as views of the shared memory, so callers can
+        drop their private copy: a csr_matrix, or a StackedCSR of the
+        base and appended parts
+        """
+        if len(self.parts) == 1:
+            return self.parts[0][0].matrix()
+        return StackedCSR([shared.matrix() for shared, _ in self.parts])
+
+    def extended(self, vectors):
+        """
+        New ShardedSearch with ``vectors`` appended. The original matrix
+        stays shared; all appended rows are kept as one more part, so
+        repeated small appends don't multiply the shards.
+        """
+        extended = object.__new__(ShardedSearch)
+        extended.pool = self.pool
+        extended.n_shards = self.n_shards
+        extended._deleted = None
+
+        base, _ = self.parts[0]
+        extended.parts = [self.parts[0]]
+        extended.shards = [shard for shard in self.shards if shard[0] == 0]
+        extended.n_rows = base.shape[0]
+        if len(self.parts) > 1:
+            vectors = sparse.vstack([self.parts[1][0].matrix(), vectors], format="csr")
+        extended._add_part(vectors, 1)
+        return extended
+
+    def rebuilt(self, matrix):
+        """New ShardedSearch over ``matrix`` (e.g. after compaction) on the same pool"""
+        return ShardedSearch(matrix, n_shards=self.n_shards, pool=self.pool)
+
+    def _deleted_per_shard(self, deleted):
+        """Tombstoned rows per shard (cached for the last mask seen)"""
+        cached = self._deleted
+        if cached is not None and cached[0] is deleted:
+            return cached[1]
+        counts = [
+            int(deleted[offset + start:offset + stop].sum())
+            for (part, start, stop) in self.shards
+            for offset in [self.parts[part][1]]
+        ]
+        self._deleted = (deleted, counts)
+        return counts
+
+    def search(self, queries, k, deleted=None):
+        """
+        Top-k rows for each query.
+
+        queries: sparse (n_queries x n_features) TF-IDF rows (or one row)
+        deleted: optional bool mask of tombstoned rows (never returned)
+
+        Returns: [(rows, scores), ...] per query, best first
+        """
+        queries = sparse.csr_matrix(queries, dtype=np.float64)
+        n_queries = queries.shape[0]
+        deleted_counts = self._deleted_per_shard(deleted) if deleted is not None else None
+
+        tasks = []
+        for i, (part, start, stop) in enumerate(self.shards):
+            shared, offset = self.parts[part]
+            # A shard's top k + its tombstone count holds its live top k
+            shard_k = min(stop - start, k + (deleted_counts[i] if deleted_counts else 0))
+            tasks.append((shared, offset, start, stop, [shard_k] * n_queries))
+
+        pool = self.pool.get()
+        try:
+            futures = [
+                pool.submit(_score_shard, shared.descriptor, start, stop, queries, ks)
+                for shared, _, start, stop, ks in tasks
+            ]
+            shard_results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A worker died: the next query gets a new pool, this one is
+            # scored here
+            print("⚠️ Warning: sharded search worker died, restarting the pool")
+            self.pool.reset(pool)
+            shard_results = [
+                _score_rows(shared.matrix(), start, stop, queries, ks)
+                for shared, _, start, stop, ks in tasks
+            ]
+
+        per_query = [([], []) for _ in range(n_queries)]
+        for (_, offset, _, _, _), results in zip(tasks, shard_results):
+            for (rows, scores), (all_rows, all_scores) in zip(results, per_query):
+                all_rows.append(rows + offset)
+                all_scores.append(scores)
+
+        results = []
+        for all_rows, all_scores in per_query:
+            rows, scores = np.concatenate(all_rows), np.concatenate(all_scores)
+            if deleted is not None:
+                live = ~deleted[rows]
+                rows, scores = rows[live], scores[live]
+            best = top_k_indices(scores, k)
+            results.append((rows[best], scores[best]))
+        return results
+
+    def stats(self):
+        return {
+            "rows": self.n_rows,
+            "shards": len(self.shards),
+            "shared_mb": round(sum(shared.nbytes for shared, _ in self.parts) / 1024 / 1024, 1)
+        }
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import re
+
+# ============================================
+# CONFIG
+# ============================================
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SKILLS_TAXONOMY_PATH = os.path.join(BASE_DIR, "data", "skills_taxonomy.json")
+
+# A skill must not be glued to other word characters, so "java" doesn't
+# match inside "javascript". "+", "#" and "." count as part of a skill
+# token so "c++", "c#" and "node.js" stay whole.
+_BEFORE = r"(?<![\w+#.])"
+_AFTER = r"(?![\w+#]|\.\w)"
+_STARTS_TERM = re.compile(_BEFORE)
+_ENDS_TERM = re.compile(_AFTER)
+
+
+# ============================================
+# TRIE -> REGEX
+# ============================================
+
+def _trie_pattern(terms):
+    """
+    One regex matching any of ``terms``, factored as a prefix trie so
+    the engine walks the alternatives character by character instead
+    of trying every term at every position. Longer terms win.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def to_pattern(node):
+        terminal = "" in node
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + to_pattern(child)
+            for char, child in sorted(node.items())
+            if char != ""
+        ]
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return to_pattern(trie)
+
+
+# ============================================
+# SKILL EXTRACTOR
+# ============================================
+
+class SkillExtractor:
+    """
+    Finds every taxonomy skill (or alias) in a text in one regex pass.
+
+    Like Aho-Corasick, every term is reported, also when it overlaps or
+    is nested in another one: "ruby on rails" gives rails and ruby,
+    "rest api" rest and api. The regex finds the longest term at every
+    start; the terms nested in it are precomputed (``implied``).
+
+    taxonomy: {canonical skill: [aliases]}
+    version: short hash of the taxonomy; changes whenever it does
+    """
+
+    def __init__(self, taxonomy):
+        canonical = json.dumps(taxonomy, sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+        self.aliases = {}
+        for skill, aliases in taxonomy.items():
+            skill = skill.strip().lower()
+            for term in [skill] + list(aliases):
+                term = " ".join(term.lower().split())
+                if term:
+                    self.aliases[term] = skill
+
+        self.skills = sorted(set(self.aliases.values()))
+        self.implied = {term: self._nested_skills(term) for term in self.aliases}
+        # Zero-width lookahead: a match at every start, so overlapping
+        # terms are all found
+        self.pattern = re.compile(
+            "(?=" + _BEFORE + "(" + _trie_pattern(self.aliases) + ")" + _AFTER + ")"
+        )
+
+    def _nested_skills(self, term):
+        """Canonical skills of every term found inside ``term`` (itself included)"""
+        found = set()
+        for start in range(len(term)):
+            if not _STARTS_TERM.match(term, start):
+                continue
+            for end in range(start + 1, len(term) + 1):
+                if term[start:end] in self.aliases and _ENDS_TERM.match(term, end):
+                    found.add(self.aliases[term[start:end]])
+        return frozenset(found)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def extract(self, text):
+        """Sorted canonical skills found in ``text`` (raw, uncleaned text)."""
+        return self.extract_lower(text.lower())
+
+    def extract_lower(self, text):
+        """extract() for text that is already lower-cased"""
+        found = set()
+        for match in self.pattern.finditer(text):
+            term = " ".join(match.group(1).split())
+            found.update(self.implied[term])
+        return sorted(found)
+
+
+def load_skill_extractor(path=SKILLS_TAXONOMY_PATH):
+    """
+    Builds a SkillExtractor from a taxonomy JSON file:
+    {"skills": {"kubernetes": ["k8s", "kube"], ...}}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    return SkillExtractor(data["skills"])
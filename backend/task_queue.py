@@ -0,0 +1,167 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# ============================================
+# IN-PROCESS TASK QUEUE
+# ============================================
+#
+# Bounded queue + fixed pool of worker threads for slow request work
+# (resume parsing / scoring). submit() returns a task id straight away;
+# the result is fetched later with get().
+
+
+class QueueFull(Exception):
+    """Raised by submit() when max_pending tasks (or max_pending_bytes) are already waiting"""
+
+
+class TaskQueue:
+    def __init__(self, workers=2, max_pending=100, max_finished=1000, result_ttl=3600,
+                 max_pending_bytes=None):
+        """
+        workers: worker threads
+        max_pending: queued (not yet running) tasks before submit() is refused
+        max_finished / result_ttl: finished results kept for polling
+        max_pending_bytes: total ``size`` of the queued tasks before
+            submit() is refused (None = no limit)
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_pending_bytes = max_pending_bytes
+        self.pending_bytes = 0
+        self.max_finished = max_finished
+        self.result_ttl = result_ttl
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._tasks = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._started = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _start(self):
+        # Threads are started lazily, so they are created in the worker
+        # process and not in a pre-fork master
+        with self._lock:
+            if self._started:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"task-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._started = True
+
+    def submit(self, fn, *args, size=0, **kwargs):
+        """
+        Queues fn(*args, **kwargs); returns the task id or raises QueueFull.
+        size: bytes the task holds while queued (e.g. an upload), counted
+            against max_pending_bytes; not passed to fn
+        """
+        self._start()
+
+        task_id = uuid.uuid4().hex
+        task = {
+            "status": "queued",
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+
+        with self._lock:
+            # An oversized task is still accepted into an empty queue
+            if (self.max_pending_bytes is not None and self.pending_bytes
+                    and self.pending_bytes + size > self.max_pending_bytes):
+                self.rejected += 1
+                raise QueueFull(f"Task queue is full ({self.pending_bytes} bytes pending)")
+            try:
+                self._queue.put_nowait((task_id, fn, args, kwargs, size))
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFull(f"Task queue is full ({self.max_pending} pending)")
+            self.pending_bytes += size
+            self._tasks[task_id] = task
+            self.submitted += 1
+
+        return task_id
+
+    def get(self, task_id):
+        """Task dict (status, result, error, timestamps) or None if unknown/expired"""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return dict(task) if task is not None else None
+
+    def _work(self):
+        while True:
+            task_id, fn, args, kwargs, size = self._queue.get()
+            with self._lock:
+                self.pending_bytes -= size
+                task = self._tasks[task_id]
+                task["status"] = "running"
+                task["started_at"] = time.time()
+
+            try:
+                result, error = fn(*args, **kwargs), None
+            except Exception as e:
+                result, error = None, f"{type(e).__name__}: {e}"
+
+            with self._lock:
+                task["finished_at"] = time.time()
+                task["result"] = result
+                task["error"] = error
+                task["status"] = "failed" if error else "done"
+                if error:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                self._wait_seconds += task["started_at"] - task["submitted_at"]
+                self._run_seconds += task["finished_at"] - task["started_at"]
+                self._prune()
+
+            # Don't hold the last task's arguments (e.g. upload bytes) while idle
+            del fn, args, kwargs
+            self._queue.task_done()
+
+    def _prune(self):
+        """Drops the oldest finished tasks (caller holds the lock)"""
+        now = time.time()
+        finished = [
+            task_id for task_id, task in self._tasks.items()
+            if task["finished_at"] is not None
+        ]
+        expired = {
+            task_id for task_id in finished
+            if now - self._tasks[task_id]["finished_at"] > self.result_ttl
+        }
+        kept = [task_id for task_id in finished if task_id not in expired]
+        overflow = max(0, len(kept) - self.max_finished)
+        for task_id in list(expired) + kept[:overflow]:
+            del self._tasks[task_id]
+
+    def stats(self):
+        with self._lock:
+            running = sum(1 for task in self._tasks.values() if task["status"] == "running")
+            finished = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "depth": self._queue.qsize(),
+                "max_pending": self.max_pending,
+                "pending_bytes": self.pending_bytes,
+                "max_pending_bytes": self.max_pending_bytes,
+                "running": running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_seconds": round(self._wait_seconds / finished, 4) if finished else None,
+                "avg_run_seconds": round(self._run_seconds / finished, 4) if finished else None
+            }
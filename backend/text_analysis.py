@@ -0,0 +1,265 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from metrics import timed, timer
+from model_registry import registry
+from skill_extractor import load_skill_extractor
+
+# ============================================
+# TEXT ANALYSIS (ONE PASS PER DOCUMENT)
+# ============================================
+#
+# A resume or job text is lower-cased and tokenized once into an
+# AnalyzedDocument. The parser, the matcher and the ATS scorer read
+# what they need from it instead of cleaning and re-scanning the text:
+#
+#     document = analyze_text(raw_text)
+#     document.skills, document.experience_level      (parse_resume)
+#     recommend_jobs(document, ...)                   (TF-IDF query)
+#     calculate_ats_score(document, ...)              (text similarity)
+#
+# Tokens are the runs of a-z / 0-9 in the lower-cased text: exactly
+# what a default TfidfVectorizer finds in clean_text(text), so TF-IDF
+# vectors are built from the tokens without tokenizing again.
+
+registry.register("skill_extractor", load_skill_extractor)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_NON_TOKEN = re.compile(r"[^a-z0-9\s]")
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+_TRAILING_DIGITS = re.compile(r"\d+$")
+
+# TfidfVectorizer default token pattern (see tfidf_vector)
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+# Experience level signals (whole tokens)
+SENIOR_WORDS = frozenset({"senior", "lead", "principal", "architect", "manager"})
+ENTRY_WORDS = frozenset({"entrylevel", "fresher", "graduate", "junior"})
+
+
+def clean_text(text):
+    """Lower-cased text with everything but a-z, 0-9 and whitespace blanked (TF-IDF input)"""
+    return _NON_TOKEN.sub(" ", text.lower())
+
+
+# ============================================
+# ANALYZED DOCUMENT
+# ============================================
+
+class AnalyzedDocument:
+    """
+    One tokenized resume / job text.
+
+    lower: the lower-cased raw text
+    tokens: a-z / 0-9 tokens, in order
+    text: normalized text (punctuation -> spaces, single spaces)
+    clean_text: the tokens joined by spaces
+    skills, years, experience_level, term_counts: computed on first use
+    vector(vectorizer): TF-IDF row, built once per vectorizer
+    """
+
+    __slots__ = ("lower", "tokens", "_text", "_skills", "_years", "_term_counts", "_vectors")
+
+    def __init__(self, text):
+        self.lower = text.lower()
+        self.tokens = _TOKEN.findall(self.lower)
+        self._text = None
+        self._skills = None
+        self._years = None
+        self._term_counts = None
+        self._vectors = []
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = _SPACES.sub(" ", _NON_WORD.sub(" ", self.lower)).strip()
+        return self._text
+
+    @property
+    def clean_text(self):
+        return " ".join(self.tokens)
+
+    @property
+    def skills(self):
+        """
+        Sorted canonical skills (incl. aliases like "k8s"). Matched on
+        the raw text, where "c++", "c#" and "node.js" are still whole.
+        """
+        if self._skills is None:
+            with timer("extract_skills"):
+                self._skills = registry.get("skill_extractor").extract_lower(self.lower)
+        return self._skills
+
+    @property
+    def years(self):
+        """Numbers followed by "year(s)", e.g. "5+ years" -> [5]"""
+        if self._years is None:
+            tokens = self.tokens
+            self._years = [
+                int(match.group())
+                for token, following in zip(tokens, tokens[1:])
+                if following.startswith("year")
+                for match in [_TRAILING_DIGITS.search(token)] if match
+            ]
+        return self._years
+
+    @property
+    def experience_level(self):
+        """Entry | Mid | Senior"""
+        tokens = self.tokens
+
+        # Senior-level signals
+        if not SENIOR_WORDS.isdisjoint(tokens):
+            return "Senior"
+
+        # Entry-level signals
+        if not ENTRY_WORDS.isdisjoint(tokens) or any(
+            token == "entry" and following == "level"
+            for token, following in zip(tokens, tokens[1:])
+        ):
+            return "Entry"
+
+        # Years of experience signals
+        if self.years:
+            years = max(self.years)
+            if years <= 1:
+                return "Entry"
+            elif years <= 4:
+                return "Mid"
+            return "Senior"
+
+        # Safe default
+        return "Mid"
+
+    @property
+    def term_counts(self):
+        """Token counts without English stop words / 1-char tokens"""
+        if self._term_counts is None:
+            self._term_counts = Counter(
+                token for token in self.tokens
+                if len(token) > 1 and token not in ENGLISH_STOP_WORDS
+            )
+        return self._term_counts
+
+    def vector(self, vectorizer):
+        """1 x vocabulary TF-IDF row of the document (cached per vectorizer)"""
+        for fitted, vector in self._vectors:
+            if fitted is vectorizer:
+                return vector
+        vector = tfidf_vector(self, vectorizer)
+        self._vectors.append((vectorizer, vector))
+        return vector
+
+
+@timed("analyze_text")
+def analyze_text(text):
+    return AnalyzedDocument(text or "")
+
+
+def as_document(text):
+    """AnalyzedDocument for a str (analyzed now) or an AnalyzedDocument"""
+    return text if isinstance(text, AnalyzedDocument) else analyze_text(text)
+
+
+# ============================================
+# TF-IDF FROM TOKENS
+# ============================================
+
+def _tokenizes_like_documents(vectorizer):
+    """True if the vectorizer's analyzer finds AnalyzedDocument.tokens in clean_text"""
+    return (
+        vectorizer.analyzer == "word"
+        and vectorizer.tokenizer is None
+        and vectorizer.preprocessor is None
+        and vectorizer.token_pattern == DEFAULT_TOKEN_PATTERN
+        and tuple(vectorizer.ngram_range) == (1, 1)
+    )
+
+
+def tfidf_vector(document, vectorizer):
+    """
+    Same row as vectorizer.transform([clean_text(text)]), built from
+    the document tokens (other vectorizer setups fall back to transform).
+    """
+    if not _tokenizes_like_documents(vectorizer):
+        return vectorizer.transform([document.clean_text])
+
+    # Stop words and 1-char tokens are never in the vocabulary
+    vocabulary = vectorizer.vocabulary_
+    counts = Counter(vocabulary[token] for token in document.tokens if token in vocabulary)
+
+    columns = np.array(sorted(counts), dtype=np.int32)
+    values = np.array([counts[column] for column in columns.tolist()], dtype=np.float64)
+    if vectorizer.binary:
+        values[:] = 1.0
+    if vectorizer.sublinear_tf:
+        values = np.log(values) + 1.0
+    if vectorizer.use_idf and values.size:
+        values *= vectorizer.idf_[columns]
+    if vectorizer.norm == "l2" and values.size:
+        values /= np.sqrt(np.dot(values, values))
+    elif vectorizer.norm == "l1" and values.size:
+        values /= np.abs(values).sum()
+
+    return csr_matrix(
+        (values.astype(vectorizer.dtype), columns, np.array([0, values.size], dtype=np.int32)),
+        shape=(1, len(vocabulary))
+    )
+
+
+def pair_similarity(document, other):
+    """
+    Cosine similarity (0-1) of two documents under a TF-IDF fitted on
+    just the two of them (TfidfVectorizer(stop_words="english")), from
+    their term counts.
+    """
+    counts, other_counts = document.term_counts, other.term_counts
+    shared = counts.keys() & other_counts.keys()
+    if not shared:
+        return 0.0
+
+    # Smoothed idf over 2 documents: ln(3 / (1 + df)) + 1, i.e. 1 for
+    # shared terms
+    idf_single = math.log(1.5) + 1.0
+
+    def norm(term_counts, others):
+        return math.sqrt(sum(
+            (count * (1.0 if term in others else idf_single)) ** 2
+            for term, count in term_counts.items()
+        ))
+
+    dot = sum(counts[term] * other_counts[term] for term in shared)
+    return dot / (norm(counts, other_counts) * norm(other_counts, counts))
+
+
+def pair_similarity_matrix(counts, other_counts):
+    """
+    pair_similarity of every row of ``counts`` with every row of
+    ``other_counts`` (sparse term-count matrices over one vocabulary,
+    e.g. from a CountVectorizer(stop_words="english")), as an
+    (n, m) array computed with sparse matrix products.
+    """
+    idf_single = math.log(1.5) + 1.0
+    counts = csr_matrix(counts, dtype=np.float64)
+    other_counts = csr_matrix(other_counts, dtype=np.float64)
+    present, other_present = (counts > 0).astype(np.float64), (other_counts > 0).astype(np.float64)
+    squares, other_squares = counts.multiply(counts), other_counts.multiply(other_counts)
+
+    dot = (counts @ other_counts.T).toarray()
+
+    # Squared norms: every term weighs idf_single, except the terms
+    # shared with the other document, which weigh 1
+    extra = idf_single ** 2 - 1.0
+    norms = (idf_single ** 2 * np.asarray(squares.sum(axis=1))
+             - extra * (squares @ other_present.T).toarray())
+    other_norms = (idf_single ** 2 * np.asarray(other_squares.sum(axis=1)).T
+                   - extra * (present @ other_squares.T).toarray())
+
+    # No shared term -> 0, as in pair_similarity
+    return np.divide(dot, np.sqrt(norms * other_norms), out=np.zeros_like(dot), where=dot > 0)
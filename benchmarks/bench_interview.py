@@ -0,0 +1,126 @@
+"""
+Job title -> interview role resolution at thousands of roles.
+
+Builds an InterviewBank from a synthetic bank (domain x role noun, e.g.
+"Payments Backend Engineer", with aliases) and times free-text lookups:
+uncached (index walk), cached (memoized per normalized title) and one
+batch call for the titles of a /job_recommendations result.
+
+Usage (from the project root):
+    python benchmarks/bench_interview.py                 # 5000 roles
+    python benchmarks/bench_interview.py --roles 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "backend"))
+
+from interview_module import InterviewBank, normalize_title  # noqa: E402
+
+DOMAINS = [
+    "payments", "cloud", "mobile", "frontend", "backend", "data", "security", "network",
+    "retail", "healthcare", "clinical", "marketing", "sales", "finance", "tax", "audit",
+    "supply chain", "logistics", "warehouse", "manufacturing", "quality", "product",
+    "platform", "infrastructure", "database", "analytics", "research", "legal", "compliance",
+    "customer", "support", "content", "social media", "brand", "design", "game", "embedded",
+    "hardware", "electrical", "mechanical", "civil", "environmental", "energy", "banking",
+    "insurance", "real estate", "hospitality", "education", "training", "recruiting"
+]
+NOUNS = [
+    "engineer", "developer", "manager", "analyst", "specialist", "coordinator", "consultant",
+    "architect", "administrator", "designer", "scientist", "director", "officer", "technician",
+    "associate", "assistant", "lead", "planner", "strategist", "representative", "advisor",
+    "auditor", "writer", "researcher", "supervisor", "operator", "inspector", "tester",
+    "programmer", "executive", "agent", "instructor", "controller", "buyer", "trainer",
+    "accountant", "editor", "producer", "recruiter", "nurse", "therapist", "estimator",
+    "surveyor", "dispatcher", "scheduler", "clerk", "investigator", "partner", "owner", "expert"
+]
+QUALIFIERS = ["", "global", "regional", "enterprise", "digital", "field", "corporate", "public sector"]
+SHORT = {"engineer": "eng", "developer": "dev", "manager": "mgr", "administrator": "admin"}
+QUESTIONS = {category: ["q1", "q2", "q3"] for category in ("technical", "behavioral", "situational")}
+
+
+def synthetic_bank(n_roles, seed=0):
+    """{role: questions + aliases}; 2500 domain x noun roles per qualifier"""
+    rng = random.Random(seed)
+    names = [
+        " ".join(filter(None, (qualifier, domain, noun))).title()
+        for qualifier in QUALIFIERS for domain in DOMAINS for noun in NOUNS
+    ][:n_roles]
+    return {
+        name: dict(QUESTIONS, aliases=[
+            name.rsplit(" ", 1)[0] + " " + rng.choice(NOUNS).title(), name + " Specialist"
+        ])
+        for name in names
+    }
+
+
+def queries(roles, n, seed=0):
+    """Free-text titles: seniority words, abbreviations and typos on role names"""
+    rng = random.Random(seed)
+    names = list(roles)
+    titles = []
+    for _ in range(n):
+        words = rng.choice(names).lower().split()
+        words = [SHORT.get(word, word) if rng.random() < 0.5 else word for word in words]
+        if rng.random() < 0.3:
+            i = rng.randrange(len(words))
+            if len(words[i]) > 4:
+                j = rng.randrange(1, len(words[i]) - 1)
+                words[i] = words[i][:j] + words[i][j + 1:]
+        titles.append(" ".join([rng.choice(["Senior", "Sr.", "Junior", ""])] + words + [rng.choice(["II", "(Remote)", ""])]))
+    return titles
+
+
+def timed_ms(fn, inputs):
+    latencies = []
+    for x in inputs:
+        start = time.perf_counter()
+        fn(x)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def report(name, ms):
+    print(
+        f"{name:<34} {np.percentile(ms, 50):>8.3f} {np.percentile(ms, 95):>8.3f} "
+        f"{np.percentile(ms, 99):>8.3f} {ms.max():>8.3f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--roles", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    roles = synthetic_bank(args.roles)
+    start = time.perf_counter()
+    bank = InterviewBank(roles, QUESTIONS, cache_size=args.queries * 2)
+    print(f"Index: {len(bank)} roles, {len(bank.index)} titles, built in {time.perf_counter() - start:.2f} s")
+
+    titles = queries(roles, args.queries)
+    normalized = [normalize_title(title) for title in titles]
+
+    print(f"\n{'':<34} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    report("index lookup (normalized)", timed_ms(bank.index.lookup, normalized))
+    report("resolve, uncached", timed_ms(bank.resolve, titles))
+    report("resolve, cached", timed_ms(bank.resolve, titles))
+
+    batches = [titles[i:i + 20] for i in range(0, len(titles), 20)]
+    bank.cache.clear()
+    report("20 titles, uncached", timed_ms(lambda batch: [bank.resolve(t) for t in batch], batches))
+
+    resolved = sum(bank.resolve(title) is not None for title in titles)
+    print(f"\nResolved to a role: {resolved / len(titles) * 100:.1f}% of {len(titles)} titles")
+
+
+if __name__ == "__main__":
+    main()
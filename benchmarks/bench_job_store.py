@@ -0,0 +1,104 @@
+"""
+Memory of the job table: plain read_csv DataFrame + object record
+store (before) vs the compact one (categoricals, shared strings, record
+store views) used by load_models_and_data.
+
+Also compares one recommend_jobs result: a dict copy of the row vs a
+JobRecord view.
+
+Usage (from the project root):
+    python benchmarks/bench_job_store.py                 # 1M jobs
+    python benchmarks/bench_job_store.py --jobs 100000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "backend"))
+
+from ats_scoring import normalize_skills  # noqa: E402
+from job_matching import (  # noqa: E402
+    CATEGORY_COLUMNS, JobRecord, SkillIndex, build_job_records, build_skill_index, compact_job_frame
+)
+from synthetic import synthetic_job_postings  # noqa: E402
+
+
+def load_plain(path):
+    """The job table as it was: object strings, one per cell"""
+    df = pd.read_csv(path)
+    return df, {col: df[col].to_numpy(dtype=object) for col in df.columns}
+
+
+def plain_skill_index(df):
+    """SkillIndex as it was: one frozenset (and skill strings) per row"""
+    return SkillIndex([
+        normalize_skills(skills) if isinstance(skills, str) and skills.strip() else frozenset()
+        for skills in df["skills"]
+    ])
+
+
+def load_compact(path):
+    df = compact_job_frame(pd.read_csv(path, dtype={col: "category" for col in CATEGORY_COLUMNS}))
+    return df, build_job_records(df)
+
+
+def traced(fn, *args):
+    """(result, MB still allocated, peak MB, seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024, peak / 1024 / 1024, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="onlyjobs-store-"), "jobs_cleaned.csv")
+    print(f"Writing {args.jobs} synthetic jobs to {path}")
+    synthetic_job_postings(args.jobs).to_csv(path, index=False)
+
+    print(f"\n{'':<24} {'resident MB':>12} {'peak MB':>9} {'load s':>8}")
+    sizes = {}
+    variants = (
+        ("plain", load_plain, plain_skill_index),
+        ("compact", load_compact, build_skill_index)
+    )
+    for name, load, skill_index in variants:
+        (df, records), current, peak, seconds = traced(load, path)
+        _, skills_mb, _, skills_seconds = traced(skill_index, df)
+        sizes[name] = (current, skills_mb)
+        print(f"{name + ' table + records':<24} {current:>12.1f} {peak:>9.1f} {seconds:>8.2f}")
+        print(f"{name + ' skill index':<24} {skills_mb:>12.1f} {'':>9} {skills_seconds:>8.2f}")
+        del df, records
+
+    for i, part in enumerate(("job table + records", "skill index")):
+        saved = sizes["plain"][i] - sizes["compact"][i]
+        print(f"\n{part}: {saved:.1f} MB less ({saved / sizes['plain'][i] * 100:.0f}%)", end="")
+    total_plain, total_compact = sum(sizes["plain"]), sum(sizes["compact"])
+    print(f"\ntotal: {total_plain:.1f} MB -> {total_compact:.1f} MB")
+
+    # One result of recommend_jobs
+    df, records = load_compact(path)
+    row = df.iloc[0].to_dict()
+    _, dict_mb, _, _ = traced(lambda: [dict(row, similarity_score=1.0, row_index=0) for _ in range(1000)])
+    _, record_mb, _, _ = traced(lambda: [JobRecord(records, 0, 1.0) for _ in range(1000)])
+    # MB per 1000 results -> bytes per result
+    print(f"Per result: dict {dict_mb * 1024 * 1024 / 1000:.0f} B, JobRecord {record_mb * 1024 * 1024 / 1000:.0f} B")
+
+
+if __name__ == "__main__":
+    main()
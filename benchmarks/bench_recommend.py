@@ -0,0 +1,69 @@
+"""
+Per-request latency of recommend_jobs on synthetic job corpora.
+
+Compares the original full-sort path (cosine_similarity + argsort +
+df.iloc) with the top-k path (sparse dot + argpartition + record store).
+
+Usage (from the project root):
+    python benchmarks/bench_recommend.py
+    python benchmarks/bench_recommend.py --sizes 10000 100000 --queries 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from job_matching import build_job_records, recommend_jobs  # noqa: E402
+from text_analysis import clean_text  # noqa: E402
+from synthetic import synthetic_jobs, synthetic_matrix, synthetic_queries, synthetic_vectorizer  # noqa: E402
+
+
+def baseline_recommend(user_skills, tfidf_vectorizer, tfidf_matrix, df, top_n=5):
+    """recommend_jobs as it was before the top-k path."""
+    user_vector = tfidf_vectorizer.transform([clean_text(" ".join(user_skills))])
+    similarities = cosine_similarity(user_vector, tfidf_matrix).flatten()
+    top_indices = similarities.argsort()[-top_n:][::-1]
+    return [df.iloc[idx].to_dict() for idx in top_indices]
+
+
+def time_per_request(fn, queries):
+    fn(queries[0])  # warm-up
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-n", type=int, default=20)
+    args = parser.parse_args()
+
+    vectorizer = synthetic_vectorizer()
+    n_features = len(vectorizer.vocabulary_)
+    queries = synthetic_queries(args.queries, vectorizer)
+
+    print(f"{'jobs':>10} {'baseline ms':>12} {'top-k ms':>10} {'speedup':>8}")
+    for n_jobs in args.sizes:
+        matrix = synthetic_matrix(n_jobs, n_features)
+        df = synthetic_jobs(n_jobs)
+        records = build_job_records(df)
+
+        base = time_per_request(
+            lambda q: baseline_recommend(q, vectorizer, matrix, df, top_n=args.top_n), queries
+        )
+        fast = time_per_request(
+            lambda q: recommend_jobs(q, vectorizer, matrix, df, top_n=args.top_n, job_records=records), queries
+        )
+        print(f"{n_jobs:>10} {base:>12.2f} {fast:>10.2f} {base / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Sharded (multi-process, shared memory) job search vs the in-process scan.
+
+Times one query at a time through recommend_jobs with and without a
+ShardedSearch, and a batch of queries through recommend_jobs_batch.
+The speedup depends on the number of cores; on one core the sharded
+path only adds the process round trip.
+
+Usage (from the project root):
+    python benchmarks/bench_sharded.py                       # 1M jobs, one shard per core
+    python benchmarks/bench_sharded.py --jobs 200000 --shards 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from job_matching import build_job_records, recommend_jobs, recommend_jobs_batch  # noqa: E402
+from sharded_search import DEFAULT_SHARDS, ShardedSearch  # noqa: E402
+from synthetic import synthetic_jobs, synthetic_matrix, synthetic_queries, synthetic_vectorizer  # noqa: E402
+
+
+def time_per_request(fn, queries):
+    fn(queries[0])  # warm-up
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARDS)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--top-n", type=int, default=20)
+    args = parser.parse_args()
+
+    vectorizer = synthetic_vectorizer()
+    matrix = synthetic_matrix(args.jobs, len(vectorizer.vocabulary_))
+    df = synthetic_jobs(args.jobs)
+    records = build_job_records(df)
+
+    start = time.perf_counter()
+    search = ShardedSearch(matrix, n_shards=args.shards)
+    stats = search.stats()
+    print(
+        f"{args.jobs} jobs, {stats['shards']} shards, {stats['shared_mb']} MB shared "
+        f"(set up in {time.perf_counter() - start:.2f} s, {os.cpu_count()} cores)\n"
+    )
+
+    queries = synthetic_queries(args.queries, vectorizer)
+    single = time_per_request(
+        lambda q: recommend_jobs(q, vectorizer, matrix, df, top_n=args.top_n, job_records=records), queries
+    )
+    sharded = time_per_request(
+        lambda q: recommend_jobs(
+            q, vectorizer, matrix, df, top_n=args.top_n, job_records=records, sharded_search=search
+        ), queries
+    )
+    print(f"{'one query, in-process':<28} {single:>10.2f} ms")
+    print(f"{'one query, sharded':<28} {sharded:>10.2f} ms  ({single / sharded:.1f}x)")
+
+    batch = synthetic_queries(args.batch, vectorizer)
+    for name, sharded_search in (("in-process", None), ("sharded", search)):
+        start = time.perf_counter()
+        recommend_jobs_batch(
+            batch, vectorizer, matrix, df, top_n=args.top_n, job_records=records, sharded_search=sharded_search
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{f'{args.batch} queries, {name}':<28} {elapsed:>10.2f} ms  ({elapsed / args.batch:.2f} ms/query)")
+
+    search.pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Benchmark suite: resume parsing, skill extraction, job matching, ATS
+scoring and the Flask routes, on synthetic data.
+
+Every case reports throughput, p50 / p95 / p99 latency and the peak
+Python memory allocated while it runs. Results are saved as JSON, so
+runs on two commits can be compared with --compare.
+
+Usage (from the project root):
+    python benchmarks/bench_suite.py                      # -> benchmarks/results/<commit>.json
+    python benchmarks/bench_suite.py --jobs 100000 --repeat 50
+    python benchmarks/bench_suite.py --only parse_resume recommend_jobs
+    python benchmarks/bench_suite.py --compare benchmarks/results/<other commit>.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "backend"))
+
+from ats_scoring import calculate_ats_score, calculate_ats_scores  # noqa: E402
+from job_corpus import build_job_snapshot  # noqa: E402
+from job_matching import load_pickled_models_and_data, recommend_jobs  # noqa: E402
+from model_registry import peak_memory_mb  # noqa: E402
+from resume_parser import extract_skills, parse_resume  # noqa: E402
+from synthetic import resume_file, save_job_corpus, synthetic_job_postings, synthetic_resume_text  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+# Resume sizes, in words
+RESUME_SIZES = {"small": 200, "medium": 1000, "large": 5000}
+RESUME_FORMATS = ["txt", "docx", "pdf"]
+
+# Calls traced with tracemalloc for the peak memory figure (tracing
+# slows calls down, so it runs apart from the timed calls)
+PEAK_SAMPLES = 3
+
+
+# ============================================
+# MEASUREMENT
+# ============================================
+
+def measure(name, fn, inputs, warmup=1):
+    """Times fn(x) for every x in inputs; returns the result dict of one case"""
+    for x in inputs[:warmup]:
+        fn(x)
+
+    latencies = []
+    start = time.perf_counter()
+    for x in inputs:
+        call_start = time.perf_counter()
+        fn(x)
+        latencies.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for x in inputs[:PEAK_SAMPLES]:
+        fn(x)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = np.array(latencies) * 1000
+    result = {
+        "name": name,
+        "calls": len(latencies),
+        "throughput_per_s": round(len(latencies) / total, 2),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+        "peak_memory_mb": round(peak / 1024 / 1024, 2)
+    }
+    print(
+        f"{name:<44} {result['throughput_per_s']:>10.1f}/s {result['p50_ms']:>9.3f} "
+        f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['peak_memory_mb']:>8.2f}"
+    )
+    return result
+
+
+# ============================================
+# DATA
+# ============================================
+
+def make_resumes(repeat, seed):
+    """{(format, size): [file bytes, ...]} plus the raw texts per size"""
+    texts = {
+        size: [synthetic_resume_text(n_words, seed=seed + i) for i in range(repeat)]
+        for size, n_words in RESUME_SIZES.items()
+    }
+    files = {
+        (fmt, size): [resume_file(text, fmt) for text in texts[size]]
+        for fmt in RESUME_FORMATS
+        for size in RESUME_SIZES
+    }
+    return texts, files
+
+
+def make_job_corpus(n_jobs, data_dir, seed):
+    """Saves a synthetic corpus (CSV + TF-IDF pickles) and loads it back as a job snapshot"""
+    import job_matching
+
+    df = synthetic_job_postings(n_jobs, seed=seed)
+    save_job_corpus(df, data_dir)
+
+    job_matching.DATA_PATH = os.path.join(data_dir, "jobs_cleaned.csv")
+    job_matching.VECTORIZER_PATH = os.path.join(data_dir, "tfidf_vectorizer.pkl")
+    job_matching.MATRIX_PATH = os.path.join(data_dir, "tfidf_matrix.pkl")
+    return build_job_snapshot(*load_pickled_models_and_data())
+
+
+# ============================================
+# CASES
+# ============================================
+
+def bench_parsing(texts, files):
+    results = []
+    for (fmt, size), blobs in files.items():
+        results.append(measure(
+            f"parse_resume/{fmt}/{size}", lambda blob: parse_resume(blob, f"resume.{fmt}"), blobs
+        ))
+    return results
+
+
+def bench_skills(texts, files):
+    return [
+        measure(f"extract_skills/{size}", extract_skills, texts[size])
+        for size in RESUME_SIZES
+    ]
+
+
+def _queries(texts):
+    parsed = [parse_resume(text.encode("utf-8"), "resume.txt") for text in texts["medium"]]
+    return [(p["skills"][:10], p["resume_text"], p["experience_level"]) for p in parsed]
+
+
+def bench_matching(snapshot, queries, n_jobs):
+    def recommend(query, filters=None):
+        return recommend_jobs(
+            query[0], snapshot["vectorizer"], snapshot["matrix"], snapshot["df"],
+            top_n=20, job_records=snapshot["job_records"],
+            filters=filters, filter_index=snapshot["filter_index"]
+        )
+
+    return [
+        measure(f"recommend_jobs/{n_jobs}", recommend, queries),
+        measure(
+            f"recommend_jobs/{n_jobs}/work_type",
+            lambda query: recommend(query, {"work_type": "Intern"}),
+            queries
+        )
+    ]
+
+
+def bench_scoring(snapshot, queries):
+    jobs = [snapshot["df"].iloc[i].to_dict() for i in range(20)]
+    rows = list(range(20))
+
+    return [
+        measure(
+            "calculate_ats_score",
+            lambda q: calculate_ats_score(q[1], q[0], q[2], jobs[0]),
+            queries
+        ),
+        measure(
+            "calculate_ats_scores/20",
+            lambda q: calculate_ats_scores(
+                q[1], q[0], q[2], jobs,
+                vectorizer=snapshot["vectorizer"],
+                job_vectors=snapshot["matrix"][rows],
+                job_skill_sets=snapshot["skill_index"].skill_sets(rows)
+            ),
+            queries
+        )
+    ]
+
+
+def bench_routes(snapshot, texts, queries):
+    import app as server
+
+    # No disk side effects; the synthetic corpus replaces the real one
+    server.SAVE_UPLOADS = False
+    server.USE_DATABASE = False
+    server.registry.replace("jobs", snapshot)
+    client = server.app.test_client()
+
+    uploads = [text.encode("utf-8") for text in texts["medium"]]
+    counter = iter(range(10 ** 9))
+
+    def upload(data):
+        # Unique bytes per call, so the resume cache never answers
+        body = data + f"\nref {next(counter)}".encode("utf-8")
+        response = client.post(
+            "/upload_resume",
+            data={"resume": (io.BytesIO(body), "resume.txt")},
+            content_type="multipart/form-data"
+        )
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    def recommend(query, cold=True):
+        if cold:
+            server.recommendation_cache.clear()
+        response = client.post("/job_recommendations", json={
+            "skills": query[0], "resume_text": query[1], "experience_level": query[2]
+        })
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    def browse(page):
+        server.jobs_page_cache.clear()
+        response = client.get(f"/api/jobs/all?work_type=Intern&limit=50&offset={page * 50}")
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    return [
+        measure("route/upload_resume/txt/medium", upload, uploads),
+        measure("route/job_recommendations/cold", recommend, queries),
+        # Warm-up over every query first, so each timed call is a hit
+        measure(
+            "route/job_recommendations/cached", lambda q: recommend(q, cold=False),
+            queries, warmup=len(queries)
+        ),
+        measure("route/api_jobs_all/work_type", browse, list(range(len(queries))))
+    ]
+
+
+# ============================================
+# OUTPUT
+# ============================================
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    print(f"\nvs {baseline_path}")
+    print(f"{'case':<44} {'p50 before':>11} {'p50 now':>9} {'change':>8}")
+    for result in results:
+        before = baseline.get(result["name"])
+        if before is None:
+            continue
+        change = (result["p50_ms"] - before["p50_ms"]) / max(before["p50_ms"], 1e-9) * 100
+        print(f"{result['name']:<44} {before['p50_ms']:>11.3f} {result['p50_ms']:>9.3f} {change:>+7.1f}%")
+
+
+SUITES = ["parse_resume", "extract_skills", "recommend_jobs", "ats", "routes"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20_000, help="synthetic job corpus size")
+    parser.add_argument("--repeat", type=int, default=30, help="calls per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", choices=SUITES, help="run only these suites")
+    parser.add_argument("--data-dir", help="where the synthetic corpus is written (default: temp dir)")
+    parser.add_argument("-o", "--output", help="results JSON (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="results JSON of an earlier run to compare against")
+    args = parser.parse_args()
+
+    suites = args.only or SUITES
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="onlyjobs-bench-")
+
+    print(f"Generating {args.repeat} resumes per format / size and {args.jobs} jobs ({data_dir})")
+    texts, files = make_resumes(args.repeat, args.seed)
+    snapshot = make_job_corpus(args.jobs, data_dir, args.seed)
+    queries = _queries(texts)
+
+    print(f"\n{'case':<44} {'throughput':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak MB':>8}")
+    results = []
+    if "parse_resume" in suites:
+        results += bench_parsing(texts, files)
+    if "extract_skills" in suites:
+        results += bench_skills(texts, files)
+    if "recommend_jobs" in suites:
+        results += bench_matching(snapshot, queries, args.jobs)
+    if "ats" in suites:
+        results += bench_scoring(snapshot, queries)
+    if "routes" in suites:
+        results += bench_routes(snapshot, texts, queries)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "jobs": args.jobs,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "max_rss_mb": peak_memory_mb()
+        },
+        "results": results
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
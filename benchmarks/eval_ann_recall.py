@@ -0,0 +1,87 @@
+"""
+Recall@10 and latency of the ANN index against exact recommend_jobs.
+
+Uses a synthetic corpus by default; pass --real to evaluate the
+project's own models (data/jobs_cleaned.csv + models/*.pkl).
+
+Usage (from the project root):
+    python benchmarks/eval_ann_recall.py --jobs 100000
+    python benchmarks/eval_ann_recall.py --real --probes 1 4 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from ann_index import build_ann_index  # noqa: E402
+from job_matching import build_job_records, load_models_and_data, recommend_jobs  # noqa: E402
+from synthetic import synthetic_jobs, synthetic_matrix, synthetic_queries, synthetic_vectorizer  # noqa: E402
+
+K = 10
+
+
+def real_queries(df, n_queries, seed=1):
+    rng = np.random.default_rng(seed)
+    skills = df["skills"].dropna().astype(str)
+    picks = rng.choice(len(skills), size=n_queries)
+    return [[s.strip() for s in skills.iloc[i].split(",")] for i in picks]
+
+
+def run(queries, fn):
+    start = time.perf_counter()
+    results = [[job["row_index"] for job in fn(query)] for query in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--components", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=None)
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--real", action="store_true")
+    args = parser.parse_args()
+
+    if args.real:
+        df, vectorizer, matrix = load_models_and_data()
+        queries = real_queries(df, args.queries)
+    else:
+        vectorizer = synthetic_vectorizer()
+        matrix = synthetic_matrix(args.jobs, len(vectorizer.vocabulary_))
+        df = synthetic_jobs(args.jobs)
+        queries = synthetic_queries(args.queries, vectorizer)
+    records = build_job_records(df)
+
+    start = time.perf_counter()
+    index = build_ann_index(matrix, n_components=args.components, n_clusters=args.clusters)
+    print(f"{matrix.shape[0]} jobs, {index.n_clusters} clusters, "
+          f"index built in {time.perf_counter() - start:.1f}s\n")
+
+    exact, exact_ms = run(
+        queries, lambda q: recommend_jobs(q, vectorizer, matrix, df, top_n=K, job_records=records)
+    )
+    print(f"{'mode':>12} {'recall@10':>10} {'ms/query':>9}")
+    print(f"{'exact':>12} {1.0:>10.3f} {exact_ms:>9.2f}")
+
+    for n_probe in args.probes:
+        approx, approx_ms = run(
+            queries,
+            lambda q: recommend_jobs(
+                q, vectorizer, matrix, df, top_n=K, job_records=records,
+                ann_index=index, n_probe=n_probe
+            )
+        )
+        recall = np.mean([
+            len(set(a) & set(e)) / max(1, len(e)) for a, e in zip(approx, exact)
+        ])
+        print(f"{'n_probe=' + str(n_probe):>12} {recall:>10.3f} {approx_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
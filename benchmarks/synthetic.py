@@ -0,0 +1,225 @@
+"""
+Synthetic job corpora and resumes for the benchmark scripts.
+
+Matrix corpora: jobs draw most of their terms from one "topic" (a block
+of the vocabulary), so the matrix has the cluster structure of a real
+TF-IDF job matrix while still being cheap to generate at 1M rows.
+
+Text corpora: job postings and resumes (TXT / DOCX / PDF) built from
+the skills taxonomy, for benchmarks that need real text end to end.
+"""
+
+import io
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILLS_TAXONOMY_PATH = os.path.join(ROOT_DIR, "data", "skills_taxonomy.json")
+
+VOCAB_SIZE = 20000
+TERMS_PER_JOB = 30
+N_TOPICS = 200
+SKILLS = [
+    "python", "java", "sql", "flask", "django", "react", "docker",
+    "kubernetes", "aws", "azure", "git", "linux", "html", "css"
+]
+
+
+def synthetic_vectorizer(vocab_size=VOCAB_SIZE):
+    """TfidfVectorizer whose vocabulary is SKILLS + term0..termN."""
+    vocab = SKILLS + [f"term{i}" for i in range(vocab_size - len(SKILLS))]
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit([" ".join(vocab)])
+    return vectorizer
+
+
+def synthetic_matrix(n_jobs, n_features, terms_per_job=TERMS_PER_JOB,
+                     n_topics=N_TOPICS, topic_share=0.8, seed=0):
+    """Random L2-normalized CSR matrix shaped like a TF-IDF job matrix."""
+    rng = np.random.default_rng(seed)
+    n_terms = n_jobs * terms_per_job
+    topic_width = n_features // n_topics
+
+    topics = np.repeat(rng.integers(0, n_topics, size=n_jobs), terms_per_job)
+    in_topic = rng.random(n_terms) < topic_share
+    indices = np.where(
+        in_topic,
+        topics * topic_width + rng.integers(0, topic_width, size=n_terms),
+        rng.integers(0, n_features, size=n_terms)
+    ).astype(np.int32)
+    data = rng.random(n_terms, dtype=np.float32) + 0.1
+    indptr = np.arange(0, n_terms + 1, terms_per_job, dtype=np.int64)
+
+    matrix = sp.csr_matrix((data, indices, indptr), shape=(n_jobs, n_features))
+    matrix.sum_duplicates()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    return sp.diags(1.0 / np.maximum(norms, 1e-12)).dot(matrix).tocsr().astype(np.float64)
+
+
+def synthetic_jobs(n_jobs, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Job Id": np.arange(n_jobs),
+        "Job Title": rng.choice(["Web Developer", "Network Engineer", "Data Scientist"], n_jobs),
+        "Company": rng.choice([f"Company {i}" for i in range(500)], n_jobs),
+        "location": rng.choice(["London", "Paris", "Berlin", "New York"], n_jobs),
+        "Work Type": rng.choice(["Full-Time", "Part-Time", "Intern", "Contract"], n_jobs),
+        "Experience Level": rng.choice(["Entry", "Mid", "Senior"], n_jobs),
+        "skills": rng.choice(["Python, SQL", "Java, AWS", "React, CSS"], n_jobs),
+    })
+
+
+def synthetic_queries(n_queries, vectorizer, n_topics=N_TOPICS, seed=1):
+    """Skill lists made of terms from one topic of synthetic_matrix."""
+    rng = np.random.default_rng(seed)
+    features = vectorizer.get_feature_names_out()
+    topic_width = len(features) // n_topics
+    queries = []
+    for _ in range(n_queries):
+        topic = rng.integers(0, n_topics)
+        columns = topic * topic_width + rng.integers(0, topic_width, 8)
+        queries.append([str(features[c]) for c in columns])
+    return queries
+
+
+# ============================================
+# TEXT CORPORA (JOB POSTINGS + RESUMES)
+# ============================================
+
+TITLES = [
+    "Backend Developer", "Frontend Web Developer", "Data Scientist", "Network Engineer",
+    "DevOps Engineer", "Mobile Developer", "Data Analyst", "QA Engineer"
+]
+WORK_TYPES = ["Full-Time", "Part-Time", "Intern", "Contract", "Temporary"]
+LOCATIONS = ["London", "Paris", "Berlin", "New York", "Toronto", "Sydney"]
+LEVELS = ["Entry", "Mid", "Senior"]
+FILLER = (
+    "designed built maintained delivered improved team project customers production "
+    "services platform reliable scalable features testing review mentoring performance "
+    "deployment pipeline data users reporting agile stakeholders documentation"
+).split()
+
+
+def taxonomy_skills():
+    """Canonical skill names of data/skills_taxonomy.json"""
+    with open(SKILLS_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        return sorted(json.load(f)["skills"])
+
+
+def synthetic_resume_text(n_words, seed=0):
+    """Resume-like text of about n_words words: skills, filler and a years-of-experience line."""
+    rng = np.random.default_rng(seed)
+    skills = taxonomy_skills()
+    words = np.where(
+        rng.random(n_words) < 0.2,
+        rng.choice(skills, n_words),
+        rng.choice(FILLER, n_words)
+    )
+    lines = [" ".join(words[i:i + 12]) for i in range(0, n_words, 12)]
+    lines.insert(0, f"{rng.choice(TITLES)} with {rng.integers(1, 12)} years of experience")
+    return "\n".join(lines)
+
+
+def _minimal_pdf(pages):
+    """Text-only PDF (Helvetica), one list of lines per page"""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)
+        ),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    for i, lines in enumerate(pages):
+        stream = "\n".join(
+            "BT /F1 10 Tf 40 %d Td (%s) Tj ET" % (
+                760 - 14 * n,
+                line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            )
+            for n, line in enumerate(lines)
+        )
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out.encode("latin-1")))
+        out += f"{i + 1} 0 obj\n{obj}\nendobj\n"
+    xref = len(out.encode("latin-1"))
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def resume_file(text, fmt):
+    """Resume text as the bytes of a .txt, .docx or .pdf file"""
+    if fmt == "txt":
+        return text.encode("utf-8")
+
+    lines = text.splitlines()
+    if fmt == "docx":
+        import docx
+
+        document = docx.Document()
+        for line in lines:
+            document.add_paragraph(line)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
+
+    if fmt == "pdf":
+        return _minimal_pdf([lines[i:i + 50] for i in range(0, len(lines), 50)] or [[]])
+
+    raise ValueError(f"Unknown resume format: {fmt}")
+
+
+def synthetic_job_postings(n_jobs, seed=0):
+    """Jobs DataFrame with the jobs_cleaned.csv columns and real text"""
+    rng = np.random.default_rng(seed)
+    skills = np.array(taxonomy_skills())
+
+    job_skills = [rng.choice(skills, 6, replace=False) for _ in range(n_jobs)]
+    titles = rng.choice(TITLES, n_jobs)
+    low = rng.integers(40, 120, n_jobs)
+    return pd.DataFrame({
+        "Job Id": np.arange(1, n_jobs + 1),
+        "Job Title": titles,
+        "Company": rng.choice([f"Company {i}" for i in range(500)], n_jobs),
+        "location": rng.choice(LOCATIONS, n_jobs),
+        "Work Type": rng.choice(WORK_TYPES, n_jobs),
+        "Experience Level": rng.choice(LEVELS, n_jobs),
+        "Salary Range": [f"${a}K-${a + b}K" for a, b in zip(low, rng.integers(10, 60, n_jobs))],
+        "skills": [", ".join(s) for s in job_skills],
+        "combined_text": [
+            f"{title} " + " ".join(s) + " " + " ".join(rng.choice(FILLER, 20))
+            for title, s in zip(titles, job_skills)
+        ]
+    })
+
+
+def save_job_corpus(df, out_dir):
+    """
+    Writes jobs_cleaned.csv, tfidf_vectorizer.pkl and tfidf_matrix.pkl
+    (the layout of data/ + models/) to out_dir.
+    Returns (vectorizer, matrix).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    vectorizer = TfidfVectorizer(stop_words="english")
+    matrix = vectorizer.fit_transform(df["combined_text"].str.lower())
+
+    df.to_csv(os.path.join(out_dir, "jobs_cleaned.csv"), index=False)
+    with open(os.path.join(out_dir, "tfidf_vectorizer.pkl"), "wb") as f:
+        pickle.dump(vectorizer, f)
+    with open(os.path.join(out_dir, "tfidf_matrix.pkl"), "wb") as f:
+        pickle.dump(matrix, f)
+    return vectorizer, matrix
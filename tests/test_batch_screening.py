@@ -0,0 +1,76 @@
+"""
+Bulk screening scores every pair like calculate_ats_score and writes valid JSONL.
+
+Usage (from the project root):
+    python -m pytest tests
+"""
+
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from ats_scoring import calculate_ats_matrix, calculate_ats_score  # noqa: E402
+from batch_screening import format_rows  # noqa: E402
+from text_analysis import analyze_text, pair_similarity, pair_similarity_matrix  # noqa: E402
+
+RESUMES = [
+    ("Python developer: Flask, REST APIs, PostgreSQL and Docker. 5 years.", ["python", "flask", "sql"], "Mid"),
+    ("Data scientist, machine learning and SQL; Python, pandas.", ["python", "sql", "machine learning"], "Senior"),
+    ("Barista and café shift lead", [], "Entry"),
+    ("the and of", [], "Mid"),
+]
+
+JOBS = [
+    {"Job Id": 1, "Job Title": "Backend Developer", "skills": "Python, Flask, SQL",
+     "combined_text": "Backend developer with Python, Flask and PostgreSQL", "Experience Level": "Mid"},
+    {"Job Id": 2, "Job Title": "Data Scientist", "skills": "python, machine learning",
+     "combined_text": "Machine learning data scientist, Python and SQL", "Experience Level": "Senior"},
+    {"Job Id": 3, "Job Title": float("nan"), "skills": float("nan"),
+     "combined_text": float("nan"), "Experience Level": "Entry"},
+]
+
+
+def test_matrix_matches_per_pair_scores():
+    scores = calculate_ats_matrix(*zip(*RESUMES), JOBS)
+    for i, (text, skills, experience) in enumerate(RESUMES):
+        for j, job in enumerate(JOBS):
+            if not isinstance(job["combined_text"], str):
+                job = dict(job, skills="", combined_text="")
+            expected = calculate_ats_score(text, skills, experience, job)
+            for key, value in expected.items():
+                assert scores[key][i, j] == pytest.approx(value, abs=0.01), (i, j, key)
+
+
+def test_pair_similarity_matrix_matches_pair_similarity():
+    documents = [analyze_text(text) for text, _, _ in RESUMES] + [analyze_text(job["combined_text"]) for job in JOBS[:2]]
+    terms = sorted({term for document in documents for term in document.term_counts})
+    columns = {term: column for column, term in enumerate(terms)}
+    counts = csr_matrix([
+        [document.term_counts.get(term, 0) for term in columns] for document in documents
+    ])
+
+    actual = pair_similarity_matrix(counts, counts)
+    for i, document in enumerate(documents):
+        for j, other in enumerate(documents):
+            assert actual[i, j] == pytest.approx(pair_similarity(document, other), abs=1e-9)
+
+
+def test_jsonl_rows_with_nan_job_cells_are_valid_json():
+    rows = [
+        {"resume": "a.pdf", "job_id": np.int64(3), "job_title": float("nan"), "ats_score": np.float64(12.5)},
+        {"resume": "b.pdf", "error": "ValueError: bad file"},
+    ]
+    lines = list(format_rows(rows, "jsonl", stats={"pairs": 1}))
+
+    parsed = [json.loads(line, parse_constant=lambda name: pytest.fail(f"{name} in JSONL")) for line in lines]
+    assert parsed[0] == {"resume": "a.pdf", "job_id": 3, "job_title": None, "ats_score": 12.5}
+    assert parsed[1]["error"] == "ValueError: bad file"
+    assert parsed[2] == {"summary": {"pairs": 1}}
+    assert not any(isinstance(value, float) and math.isnan(value) for value in parsed[0].values())
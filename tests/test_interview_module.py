@@ -0,0 +1,52 @@
+"""
+Job titles resolve to question-bank roles; generic titles get the generic questions.
+
+Usage (from the project root):
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from interview_module import InterviewBank, load_interview_bank  # noqa: E402
+
+QUESTIONS = {"technical": ["t"], "behavioral": ["b"], "situational": ["s"]}
+
+
+@pytest.fixture(scope="module")
+def bank():
+    return load_interview_bank()
+
+
+@pytest.mark.parametrize("title", [
+    "Manager", "Engineer", "Developer", "Senior Engineer", "Sr. Dev", "Lead Developer", "Director",
+])
+def test_generic_titles_get_generic_questions(bank, title):
+    assert bank.resolve(title) is None
+    assert bank.questions(bank.resolve(title)) is bank.generic
+
+
+@pytest.mark.parametrize("title, role", [
+    ("Sr. Front-End Dev", "Frontend Web Developer"),
+    ("Web Dev", "Web Developer"),
+    ("Data Enginer", "Data Engineer"),
+    ("Sofware Engineer (Remote)", "Software Engineer"),
+    ("Marketing Mgr", "Marketing Manager"),
+])
+def test_distinctive_titles_resolve(bank, title, role):
+    assert bank.resolve(title) == role
+
+
+def test_generic_word_role_matches_exactly_only():
+    bank = InterviewBank(
+        {"Manager": dict(QUESTIONS, aliases=["General Manager"]), "Event Planner": dict(QUESTIONS, aliases=["Event Manager"])},
+        QUESTIONS
+    )
+    assert bank.resolve("Manager") == "Manager"
+    assert bank.resolve("Senior Manager") == "Manager"
+    assert bank.resolve("Lead Manager") is None
+    assert bank.resolve("Event Managr") == "Event Planner"
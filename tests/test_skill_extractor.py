@@ -0,0 +1,72 @@
+"""
+SkillExtractor reports every taxonomy term, also nested / overlapping ones.
+
+Usage (from the project root):
+    python -m pytest tests
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from skill_extractor import SkillExtractor, load_skill_extractor  # noqa: E402
+
+# The skill list and word-boundary search parse_resume used before the taxonomy
+BASELINE_SKILLS = [
+    "python", "java", "c++", "c#", "javascript", "typescript",
+    "sql", "mysql", "postgresql", "mongodb",
+    "machine learning", "deep learning", "data science",
+    "flask", "django", "fastapi",
+    "react", "angular", "node.js",
+    "html", "css", "bootstrap",
+    "git", "github", "docker", "kubernetes",
+    "aws", "azure", "gcp",
+    "linux", "api", "rest", "json"
+]
+
+
+def baseline_skills(text):
+    text = text.lower()
+    return {skill for skill in BASELINE_SKILLS if re.search(r"\b" + re.escape(skill) + r"\b", text)}
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return load_skill_extractor()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("REST API", {"rest", "api"}),
+    ("AWS Lambda", {"aws", "lambda"}),
+    ("Ruby on Rails", {"ruby", "rails"}),
+    ("Tailwind CSS", {"tailwind", "css"}),
+    ("React Native", {"react", "react native"}),
+    ("Microsoft SQL Server", {"sql server", "sql"}),
+])
+def test_nested_terms_are_reported(extractor, text, expected):
+    assert expected <= set(extractor.extract(text))
+
+
+@pytest.mark.parametrize("text", [
+    "Built REST APIs on AWS Lambda with Python and SQL Server.",
+    "Ruby on Rails, React Native and Tailwind CSS front ends; Docker + Kubernetes.",
+    "Senior engineer: machine learning, deep learning, data science (PyTorch), GitHub, Linux, JSON.",
+    "Node.js / TypeScript / Angular developer with MongoDB and PostgreSQL",
+])
+def test_finds_every_baseline_skill(extractor, text):
+    assert baseline_skills(text) <= set(extractor.extract(text))
+
+
+def test_overlapping_terms_are_reported():
+    extractor = SkillExtractor({"machine learning": [], "learning python": [], "python": []})
+    assert extractor.extract("Machine Learning Python") == ["learning python", "machine learning", "python"]
+
+
+def test_terms_inside_words_are_not_reported(extractor):
+    assert "java" not in extractor.extract("JavaScript")
+    assert "sql" not in extractor.extract("MySQL")
+    assert extractor.extract("c++ and c#") == ["c#", "c++"]
@@ -0,0 +1,81 @@
+"""
+SkillIndex.candidates: jobs sharing at least k skills, over the whole corpus.
+
+Usage (from the project root):
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from job_matching import build_skill_index, job_skill_sets  # noqa: E402
+
+JOBS = pd.DataFrame({"skills": [
+    "Python, SQL, AWS",        # 0
+    "java, spring",            # 1
+    "python, sql",             # 2
+    " PYTHON ,docker",         # 3
+    "",                        # 4
+    None,                      # 5
+    "sql, aws, python, go",    # 6
+]})
+
+
+def brute_force(skills, k):
+    """(row, shared) pairs of every job sharing >= k skills, by set intersection"""
+    wanted = {skill.strip().lower() for skill in skills}
+    shared = [(row, len(wanted & job)) for row, job in enumerate(job_skill_sets(JOBS))]
+    return sorted((row, count) for row, count in shared if count >= k)
+
+
+def as_pairs(rows, counts):
+    return sorted(zip(rows.tolist(), counts.tolist()))
+
+
+def test_candidates_match_brute_force():
+    index = build_skill_index(JOBS)
+    for skills in (["python"], ["Python", "sql"], ["sql", "aws", "python"], ["go", "java"]):
+        for k in (1, 2, 3):
+            assert as_pairs(*index.candidates(skills, k)) == brute_force(skills, k)
+
+
+def test_candidates_most_shared_first():
+    rows, counts = build_skill_index(JOBS).candidates(["python", "sql", "aws"], k=1)
+    assert rows.tolist() == [0, 6, 2, 3]
+    assert counts.tolist() == [3, 3, 2, 1]
+
+
+def test_candidates_accepts_comma_separated_str():
+    index = build_skill_index(JOBS)
+    assert as_pairs(*index.candidates("python, sql", 2)) == [(0, 2), (2, 2), (6, 2)]
+
+
+def test_candidates_unknown_or_empty_skills():
+    index = build_skill_index(JOBS)
+    for skills in ([], ["cobol"], ""):
+        rows, counts = index.candidates(skills)
+        assert rows.size == 0 and counts.size == 0
+
+
+def test_candidates_skip_deleted_rows():
+    deleted = np.zeros(len(JOBS), dtype=bool)
+    deleted[[0, 3]] = True
+    rows, _ = build_skill_index(JOBS).candidates(["python"], deleted=deleted)
+    assert sorted(rows.tolist()) == [2, 6]
+
+
+def test_extended_index_finds_appended_jobs():
+    index = build_skill_index(JOBS)
+    new_jobs = pd.DataFrame({"skills": ["python, rust", "rust"]})
+    extended = index.extended(job_skill_sets(new_jobs))
+
+    assert as_pairs(*extended.candidates(["rust"])) == [(7, 1), (8, 1)]
+    assert as_pairs(*extended.candidates(["python", "rust"], 2)) == [(7, 2)]
+    # The original index is unchanged
+    assert index.candidates(["rust"])[0].size == 0
+    assert len(index.candidates(["python"])[0]) == 4
@@ -0,0 +1,78 @@
+"""
+The TF-IDF shortcuts in text_analysis must give what scikit-learn gives.
+
+Usage (from the project root):
+    python -m pytest tests
+"""
+
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from text_analysis import analyze_text, clean_text, pair_similarity, tfidf_vector  # noqa: E402
+
+TEXTS = [
+    "Senior Python developer: Django, REST APIs & PostgreSQL (5+ years).",
+    "C++/C#, Node.js and SQL!!! -- data-driven; e-mail: jobs@example.com",
+    "Développeur Python — données, naïve café, 東京 office, Zürich",
+    "machine learning machine learning MACHINE learning",
+    "the and of to a I",
+    "x y z 1 2 3",
+    "",
+    "   \n\t  ",
+]
+
+CORPUS = [
+    "python developer django rest postgresql",
+    "data scientist python machine learning sql",
+    "c++ c# embedded engineer",
+    "node.js javascript frontend developer",
+    "café barista zurich tokyo office",
+    "devops engineer kubernetes aws",
+]
+
+VECTORIZERS = {
+    "default": {"stop_words": "english"},
+    "sublinear": {"stop_words": "english", "sublinear_tf": True},
+    "binary_l1": {"stop_words": "english", "binary": True, "norm": "l1"},
+    "no_idf": {"use_idf": False},
+    "bigrams": {"stop_words": "english", "ngram_range": (1, 2)},  # falls back to transform
+}
+
+
+@pytest.fixture(scope="module", params=sorted(VECTORIZERS))
+def vectorizer(request):
+    return TfidfVectorizer(**VECTORIZERS[request.param]).fit([clean_text(text) for text in CORPUS])
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_tfidf_vector_matches_transform(vectorizer, text):
+    expected = vectorizer.transform([clean_text(text)])
+    actual = tfidf_vector(analyze_text(text), vectorizer)
+
+    assert actual.shape == expected.shape
+    assert actual.dtype == expected.dtype
+    np.testing.assert_allclose(actual.toarray(), expected.toarray(), rtol=1e-6, atol=1e-9)
+
+
+def _pairwise_tfidf_similarity(text, other):
+    """Cosine of the two texts under a TfidfVectorizer fitted on just them"""
+    try:
+        vectors = TfidfVectorizer(stop_words="english").fit_transform([clean_text(text), clean_text(other)])
+    except ValueError:
+        return 0.0  # no terms left (empty or stop words only)
+    return float(vectors[0].dot(vectors[1].T).toarray()[0, 0])
+
+
+@pytest.mark.parametrize("text, other", list(itertools.combinations_with_replacement(TEXTS, 2)))
+def test_pair_similarity_matches_per_pair_vectorizer(text, other):
+    expected = _pairwise_tfidf_similarity(text, other)
+    actual = pair_similarity(analyze_text(text), analyze_text(other))
+
+    assert actual == pytest.approx(expected, abs=1e-9)